@@ -70,6 +70,8 @@ analyzeBtn.addEventListener("click", async () => {
     }
 
     const data = await response.json();
+    // Per-stage backend timings (tweet, profile, url_N, image_*, serialize, total)
+    console.debug("Server-Timing:", response.headers.get("Server-Timing"));
     renderResult(data);
     statusDiv.textContent = "Analysis complete.";
   } catch (err) {
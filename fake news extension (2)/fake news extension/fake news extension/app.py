@@ -9,7 +9,7 @@ if not hasattr(_pkgutil, 'get_loader'):
         return spec.loader if spec is not None else None
     _pkgutil.get_loader = _get_loader
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import numpy as np
 import pickle
@@ -19,7 +19,11 @@ import requests
 from PIL import Image
 from io import BytesIO
 import base64
+import copy
 import os
+import sys
+import threading
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env if present
@@ -28,86 +32,168 @@ load_dotenv()
 from flask import send_from_directory
 
 app = Flask('fake_news_api', root_path=os.path.dirname(__file__))
-CORS(app)  # Enable CORS for browser extension
+CORS(app, expose_headers=['Server-Timing'])  # Enable CORS for browser extension
 
 # Load ML models
-MODEL_DIR = 'models'
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# Scorer modules in ml-model/ import each other by module name
+ML_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml-model')
+if ML_MODEL_DIR not in sys.path:
+    sys.path.insert(0, ML_MODEL_DIR)
+
+from model_registry import ModelRegistry
+from reloader import ScorerState, ReloadWatcher
+from metrics import (
+    HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, stage_timer, render_metrics,
+    start_request_timing, end_request_timing, request_timings, request_stage, server_timing_header,
+)
+from serializers import encode_response
+from document import AnalyzedDocument
+import text_features
+from cache_warmer import warm_caches
+
+# Legacy pickled models run arbitrary code when loaded; only read them on opt-in
+ALLOW_PICKLE_MODELS = os.environ.get('ALLOW_PICKLE_MODELS', '0').lower() in ('1', 'true', 'yes', 'on')
+
+# ========== RESPONSE DETAIL ==========
+# Explanation groups a request can ask for with ?fields=...; scores and labels
+# are always returned. Lean (no groups) is the default, ?detail=full returns everything.
+DETAIL_FIELDS = {
+    'features': ('features', 'url_features'),
+    'flags': ('flags', 'red_flags', 'behavioral_flags'),
+    'reasons': ('reason', 'verdict', 'detected_issues', 'confidence', 'threat_type'),
+    'tags': ('matched_tags',),
+}
+SCORE_KEYS = ('score', 'label', 'classification', 'probability', 'fake_probability', 'malicious_probability',
+              'fake_percent', 'is_safe', 'is_credible', 'url')
+
+
+def parse_fields(detail=None, fields=None):
+    """
+    Explanation groups requested by ?detail= / ?fields=
+
+    Returns:
+        frozenset | None: requested groups (empty = lean); None means everything
+    """
+    detail = (detail or 'lean').lower()
+    if detail not in ('lean', 'full'):
+        raise ValueError(f"detail must be 'lean' or 'full', got '{detail}'")
+    if detail == 'full':
+        return None
+    groups = frozenset(f.strip().lower() for f in (fields or '').split(',') if f.strip())
+    unknown = groups - set(DETAIL_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown fields {sorted(unknown)}; expected any of {sorted(DETAIL_FIELDS)}")
+    return groups
+
+
+def wants(fields, group):
+    return fields is None or group in fields
+
+
+def prune_result(result, fields):
+    """Drop explanation keys that weren't requested from a scorer result dict"""
+    if fields is None or not isinstance(result, dict):
+        return result
+    keep = set(SCORE_KEYS)
+    for group in fields:
+        keep.update(DETAIL_FIELDS[group])
+    return {k: v for k, v in result.items() if k in keep}
+
 
 class FakeNewsDetector:
     def __init__(self):
-        self.text_model = None
-        self.url_model = None
-        self.profile_model = None
-        self.image_model = None
-        self.load_models()
-        
+        # Models are opened lazily from models/manifest.json on first use
+        self.registry = ModelRegistry(MODEL_DIR)
+        self._legacy_models = {}
+
+    @property
+    def text_model(self):
+        return self._get_model('text_classifier')
+
+    @property
+    def url_model(self):
+        return self._get_model('url_classifier')
+
+    @property
+    def profile_model(self):
+        return self._get_model('profile_classifier')
+
+    @property
+    def image_model(self):
+        return self._get_model('image_classifier')
+
+    def _get_model(self, name):
+        model = self.registry.get(name)
+        if model is None and ALLOW_PICKLE_MODELS:
+            model = self._load_legacy_pickle(name)
+        return model
+
+    def _load_legacy_pickle(self, name):
+        if name not in self._legacy_models:
+            path = f'{MODEL_DIR}/{name}.pkl'
+            model = None
+            if os.path.exists(path):
+                try:
+                    with open(path, 'rb') as f:
+                        model = pickle.load(f)
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+            self._legacy_models[name] = model
+        return self._legacy_models[name]
+
+    def pinned(self):
+        """View bound to the current registry; a concurrent reload doesn't affect it"""
+        return copy.copy(self)
+
+    def reload_models(self):
+        """Open the registry from disk, check every model scores, then swap it in"""
+        registry = ModelRegistry(MODEL_DIR)
+        self.probe_models(registry)
+        self.registry = registry
+        return registry.version
+
+    @staticmethod
+    def probe_models(registry):
+        """Score one probe item with every model of registry under the live rules; raises on failure"""
+        for name in ('text_classifier', 'url_classifier', 'profile_classifier'):
+            if registry.available(name):
+                model = registry.get(name)
+                probe = {
+                    'text_classifier': 'model reload check',
+                    'url_classifier': 'https://example.com/',
+                    'profile_classifier': {'username': 'reload_check'},
+                }[name]
+                p = model.predict_proba(probe)
+                if not 0.0 <= p <= 1.0:
+                    raise ValueError(f"{name} returned {p} on the reload probe")
+
+    def has_model(self, name):
+        """True if a model is available, without loading it"""
+        if self.registry.available(name):
+            return True
+        return ALLOW_PICKLE_MODELS and os.path.exists(f'{MODEL_DIR}/{name}.pkl')
+
     def load_models(self):
-        """Load all trained ML models"""
+        """Eagerly load every available model (e.g. before forking workers)"""
         try:
-            # Load text classifier (for tweet content)
-            if os.path.exists(f'{MODEL_DIR}/text_classifier.pkl'):
-                with open(f'{MODEL_DIR}/text_classifier.pkl', 'rb') as f:
-                    self.text_model = pickle.load(f)
-            
-            # Load URL classifier
-            if os.path.exists(f'{MODEL_DIR}/url_classifier.pkl'):
-                with open(f'{MODEL_DIR}/url_classifier.pkl', 'rb') as f:
-                    self.url_model = pickle.load(f)
-            
-            # Load profile classifier
-            if os.path.exists(f'{MODEL_DIR}/profile_classifier.pkl'):
-                with open(f'{MODEL_DIR}/profile_classifier.pkl', 'rb') as f:
-                    self.profile_model = pickle.load(f)
-            
-            # Load image classifier
-            if os.path.exists(f'{MODEL_DIR}/image_classifier.pkl'):
-                with open(f'{MODEL_DIR}/image_classifier.pkl', 'rb') as f:
-                    self.image_model = pickle.load(f)
-                    
+            for name in ('text_classifier', 'url_classifier', 'profile_classifier', 'image_classifier'):
+                self._get_model(name)
             print("✓ Models loaded successfully")
         except Exception as e:
             print(f"Error loading models: {e}")
     
     def extract_text_features(self, text):
-        """Extract features from tweet text using regex patterns"""
-        features = {}
-        
-        # Pattern matching scores
-        patterns = {
-            'urgency': r'\b(URGENT|BREAKING|ALERT|NOW|MUST SEE|SHOCKING)\b',
-            'all_caps': r'\b[A-Z]{5,}\b',
-            'clickbait': r'\b(you won\'t believe|doctors hate|one weird trick|what happens next)\b',
-            'conspiracy': r'\b(wake up|sheeple|they don\'t want you to know|cover-?up|deep state)\b',
-            'unverified': r'\b(reportedly|allegedly|rumored|unconfirmed|sources say)\b',
-            'emotional': r'\b(outrageous|disgusting|terrifying|devastating|horrifying)\b',
-            'missing_context': r'\b(study shows|research proves|scientists say|experts claim)\b'
-        }
-        
-        text_lower = text.lower()
-        
-        for pattern_name, pattern in patterns.items():
-            matches = len(re.findall(pattern, text, re.IGNORECASE))
-            features[f'{pattern_name}_count'] = matches
-        
-        # Additional features
-        features['text_length'] = len(text)
-        features['caps_ratio'] = sum(1 for c in text if c.isupper()) / max(len(text), 1)
-        features['exclamation_count'] = text.count('!')
-        features['question_count'] = text.count('?')
-        features['hashtag_count'] = text.count('#')
-        features['mention_count'] = text.count('@')
-        features['url_count'] = len(re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text))
-        features['word_count'] = len(text.split())
-        features['avg_word_length'] = np.mean([len(word) for word in text.split()]) if text.split() else 0
-        
-        return features
+        """Extract features from tweet text using regex patterns (single pass, see ml-model/text_features.py)"""
+        return text_features.extract_text_features(text)
     
-    def extract_url_features(self, url):
-        """Extract features from URL"""
+    def extract_url_features(self, url, doc=None):
+        """Extract features from URL (parsed through doc, the request's AnalyzedDocument, when given)"""
         features = {}
         
         try:
-            parsed = urlparse(url)
+            parsed = doc.parsed_url(url) if doc is not None else urlparse(url)
             domain = parsed.netloc.lower()
             
             # Domain features
@@ -160,43 +246,74 @@ class FakeNewsDetector:
         
         return features
     
-    def analyze_text(self, text):
-        """Analyze tweet text and return credibility score"""
-        features = self.extract_text_features(text)
+    def analyze_text(self, text, fields=None, doc=None):
+        """Analyze tweet text and return credibility score
+
+        fields: explanation groups to return ('features', 'flags'; None = all).
+        With a local model, features are only extracted when they are returned.
+        doc: the request's AnalyzedDocument for text, shared with the other analyzers.
+        """
+        if doc is None:
+            doc = AnalyzedDocument(text)
+        model = self.text_model
+        has_model = model is not None and hasattr(model, 'predict_proba')
+        features = None
+        if not has_model or wants(fields, 'features') or wants(fields, 'flags'):
+            with stage_timer('tweet', 'features'):
+                features = doc.text_features
+
+        # Trained local model: credibility is the complement of P(fake)
+        if has_model:
+            with stage_timer('tweet', 'model'):
+                if getattr(model, 'uses_document', False):
+                    p = model.predict_proba(doc.text, doc=doc)
+                else:
+                    p = model.predict_proba(text)
+                score = round((1 - p) * 100)
+            return self._text_result(score, features, fields)
         
         # Calculate score based on features
-        score = 70  # Start neutral-positive
-        
-        # Deduct for suspicious patterns
-        score -= features['urgency_count'] * 5
-        score -= features['clickbait_count'] * 8
-        score -= features['conspiracy_count'] * 10
-        score -= features['unverified_count'] * 3
-        score -= features['emotional_count'] * 4
-        
-        # Deduct for formatting issues
-        if features['caps_ratio'] > 0.5:
-            score -= 10
-        if features['exclamation_count'] > 2:
-            score -= features['exclamation_count'] * 2
-        
-        # Add for quality indicators
-        if features['text_length'] > 100:
-            score += 5
-        if features['url_count'] > 0:
-            score += 3
-        
-        score = max(0, min(100, score))
-        
-        return {
-            'score': score,
-            'features': features,
-            'flags': self._get_flags_from_features(features)
-        }
+        return self._text_result(text_features.rule_score(features), features, fields)
+
+    def analyze_texts(self, texts, fields=None):
+        """Analyze many texts; one batch model call, or vectorized rule scoring on a feature matrix"""
+        has_model = self.text_model is not None and hasattr(self.text_model, 'predict_proba_batch')
+        features = [None] * len(texts)
+        if has_model:
+            with stage_timer('tweet', 'model'):
+                scores = [round((1 - float(p)) * 100) for p in self.text_model.predict_proba_batch(texts)]
+            if wants(fields, 'features') or wants(fields, 'flags'):
+                with stage_timer('tweet', 'features'):
+                    features = [self.extract_text_features(t) for t in texts]
+        else:
+            with stage_timer('tweet', 'features'):
+                matrix = text_features.text_feature_matrix(texts)
+            scores = text_features.rule_scores(matrix).tolist()
+            if wants(fields, 'features') or wants(fields, 'flags'):
+                features = [text_features.matrix_row_features(row) for row in matrix]
+        return [self._text_result(score, f, fields) for score, f in zip(scores, features)]
+
+    def _text_result(self, score, features, fields):
+        result = {'score': score}
+        if wants(fields, 'features'):
+            result['features'] = features
+        if wants(fields, 'flags'):
+            result['flags'] = self._get_flags_from_features(features)
+        return result
     
-    def analyze_url(self, url):
-        """Analyze URL credibility"""
-        features = self.extract_url_features(url)
+    def analyze_url(self, url, fields=None, doc=None):
+        """Analyze URL credibility (features returned unless fields excludes them)"""
+        has_model = self.url_model is not None and hasattr(self.url_model, 'predict_proba')
+        features = None
+        if not has_model or wants(fields, 'features'):
+            with stage_timer('url', 'features'):
+                features = self.extract_url_features(url, doc)
+
+        # Trained local model: credibility is the complement of P(malicious)
+        if has_model:
+            with stage_timer('url', 'model'):
+                score = round((1 - self.url_model.predict_proba(url)) * 100)
+            return self._scored_result(score, features, fields, 'is_safe')
         
         score = 60  # Start neutral
         
@@ -218,15 +335,42 @@ class FakeNewsDetector:
         
         score = max(0, min(100, score))
         
-        return {
-            'score': score,
-            'features': features,
-            'is_safe': score >= 50
-        }
+        return self._scored_result(score, features, fields, 'is_safe')
+
+    def _scored_result(self, score, features, fields, verdict_key):
+        result = {'score': score}
+        if wants(fields, 'features'):
+            result['features'] = features
+        result[verdict_key] = score >= 50
+        return result
     
-    def analyze_profile(self, profile_data):
-        """Analyze user profile credibility"""
-        features = self.extract_profile_features(profile_data)
+    def analyze_urls(self, urls, fields=None, doc=None):
+        """Analyze many URLs; uses one vectorized batch when the local URL model is loaded"""
+        if self.url_model is None or not hasattr(self.url_model, 'predict_proba_batch'):
+            return [self.analyze_url(u, fields, doc) for u in urls]
+
+        with stage_timer('url', 'model'):
+            probs = self.url_model.predict_proba_batch(urls)
+        features = [None] * len(urls)
+        if wants(fields, 'features'):
+            with stage_timer('url', 'features'):
+                features = [self.extract_url_features(u, doc) for u in urls]
+        return [self._scored_result(round((1 - float(p)) * 100), f, fields, 'is_safe')
+                for p, f in zip(probs, features)]
+
+    def analyze_profile(self, profile_data, fields=None):
+        """Analyze user profile credibility (features returned unless fields excludes them)"""
+        has_model = self.profile_model is not None and hasattr(self.profile_model, 'predict_proba')
+        features = None
+        if not has_model or wants(fields, 'features'):
+            with stage_timer('profile', 'features'):
+                features = self.extract_profile_features(profile_data)
+
+        # Trained local model: credibility is the complement of P(fake)
+        if has_model:
+            with stage_timer('profile', 'model'):
+                score = round((1 - self.profile_model.predict_proba(profile_data)) * 100)
+            return self._scored_result(score, features, fields, 'is_credible')
         
         score = 50  # Start neutral
         
@@ -252,11 +396,7 @@ class FakeNewsDetector:
         
         score = max(0, min(100, score))
         
-        return {
-            'score': score,
-            'features': features,
-            'is_credible': score >= 50
-        }
+        return self._scored_result(score, features, fields, 'is_credible')
     
     def _get_flags_from_features(self, features):
         """Extract warning flags from features"""
@@ -282,6 +422,141 @@ class FakeNewsDetector:
 # Initialize detector
 detector = FakeNewsDetector()
 
+# Active scorer modules (rule packs + LLM wrappers); swapped as a whole on reload
+SCORERS = ScorerState()
+
+# Poll models/manifest.json and scorer sources for changes (0 disables)
+RELOAD_POLL_SECONDS = float(os.environ.get('RELOAD_POLL_SECONDS', '0') or 0)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+# Token-less admin requests from 127.0.0.1/::1 (opt-in: behind a local reverse proxy every client is localhost)
+ADMIN_ALLOW_LOCALHOST = os.environ.get('ADMIN_ALLOW_LOCALHOST', '0') == '1'
+# The only directory /admin/warm-cache reads CSVs from (unset: the endpoint reads nothing)
+WARM_CACHE_DIR = os.environ.get('WARM_CACHE_DIR', '')
+_reload_lock = threading.Lock()
+_last_reload = {'at': None, 'ok': None, 'error': None}
+
+
+def reload_all():
+    """Reload models and rule packs; whatever fails to validate keeps the old version"""
+    with _reload_lock:
+        errors = []
+        try:
+            registry = ModelRegistry(MODEL_DIR)
+        except Exception as e:
+            registry = None
+            errors.append(f"models: {e}")
+
+        # New rules are probed with the models that will serve them: a model that
+        # doesn't score under the new rules keeps the old rules active
+        ok, message = SCORERS.reload(
+            check=lambda: detector.probe_models(registry if registry is not None else detector.registry))
+        if ok:
+            if registry is not None:
+                detector.registry = registry
+        else:
+            errors.append(f"rules: {message}")
+            # The new models may still work with the rules that stayed active
+            if registry is not None:
+                try:
+                    detector.probe_models(registry)
+                    detector.registry = registry
+                except Exception as e:
+                    errors.append(f"models: {e}")
+
+        _last_reload.update({
+            'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ok': not errors,
+            'error': '; '.join(errors) or None
+        })
+        return not errors, active_versions()
+
+
+def active_versions():
+    return {
+        'models': detector.registry.version,
+        'model_versions': detector.registry.describe()['models'],
+        'rules': (SCORERS.current or {}).get('rules_version'),
+        'rules_loaded_at': (SCORERS.current or {}).get('loaded_at'),
+        'last_reload': dict(_last_reload)
+    }
+
+
+_reload_watcher = None
+
+
+def start_reload_watcher():
+    """Start polling for model/rule changes in this process (threads don't survive fork, so once per worker)"""
+    global _reload_watcher
+    if RELOAD_POLL_SECONDS > 0 and _reload_watcher is None:
+        _reload_watcher = ReloadWatcher(os.path.join(MODEL_DIR, 'manifest.json'), reload_all, RELOAD_POLL_SECONDS)
+        _reload_watcher.start()
+    return _reload_watcher
+
+# Prior LLM verdicts (scored CSVs, comma-separated) loaded into the verdict caches
+# at startup; with gunicorn's preload_app this happens once, in the master
+WARM_CACHE_FILES = [p.strip() for p in os.environ.get('WARM_CACHE_FILES', '').split(',') if p.strip()]
+if WARM_CACHE_FILES:
+    warm_caches(WARM_CACHE_FILES)
+
+# ========== REQUEST METRICS ==========
+
+def _endpoint_label():
+    # Route pattern, not the raw path, so label cardinality stays bounded
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+@app.before_request
+def _start_request_metrics():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = _endpoint_label()
+    HTTP_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+    start_request_timing()
+
+
+@app.after_request
+def _record_status(response):
+    g.metrics_status = response.status_code
+    start = g.get('metrics_start')
+    if start is not None:
+        total = time.perf_counter() - start
+        response.headers['Server-Timing'] = server_timing_header(request_timings(), total)
+        response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
+
+@app.teardown_request
+def _finish_request_metrics(exc):
+    end_request_timing()
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    endpoint = g.pop('metrics_endpoint')
+    HTTP_IN_FLIGHT.dec(endpoint=endpoint)
+    HTTP_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+    HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=g.pop('metrics_status', 500))
+
+
+def _timing_requested():
+    return request.args.get('timing', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+def respond(payload, status=200):
+    """Serialize a response body for the Accept header (JSON by default, MessagePack on request);
+    with ?timing=1 the stage breakdown is added to successful bodies"""
+    if status == 200 and _timing_requested():
+        stages = request_timings()
+        payload['timing'] = {
+            'stages': [{'name': name, 'ms': round(seconds * 1000, 3)} for name, seconds in stages],
+            'elapsed_ms': round((time.perf_counter() - g.metrics_start) * 1000, 3)
+        }
+    # Serialization shows up in the Server-Timing header (the body is already built)
+    with request_stage('serialize'):
+        mimetype, body = encode_response(payload, request.headers.get('Accept'))
+    response = Response(body, status=status, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
 @app.route('/')
 def home():
     return jsonify({
@@ -296,87 +571,100 @@ def home():
         }
     })
 
-@app.route('/analyze', methods=['POST'])
-def analyze_tweet():
-    """Analyze tweet text for fake news indicators"""
-    try:
-        data = request.json
-        text = data.get('text', '')
-        
-        if not text:
-            return jsonify({'error': 'No text provided'}), 400
-        
-        result = detector.analyze_text(text)
-        
-        return jsonify({
+# ========== ANALYSIS PAYLOADS ==========
+# Endpoint bodies as plain functions of (detector, request JSON, fields) -> (payload, status),
+# so the Flask app below and the ASGI app (asgi_app.py) return the same responses.
+# fields comes from parse_fields(); None returns every explanation field.
+
+def _trust_level(score):
+    return 'high' if score >= 70 else 'medium' if score >= 40 else 'low'
+
+
+def analyze_tweet_payload(det, data, fields=None):
+    text = data.get('text', '')
+    texts = data.get('texts') or []
+
+    if texts:
+        if not all(isinstance(t, str) for t in texts):
+            return {'error': "'texts' must be a list of strings"}, 400
+        with request_stage('tweets'):
+            analyses = det.analyze_texts(texts, fields)
+        return {
             'success': True,
-            'analysis': result,
-            'trust_level': 'high' if result['score'] >= 70 else 'medium' if result['score'] >= 40 else 'low'
-        })
+            'analyses': [{'analysis': a, 'trust_level': _trust_level(a['score'])} for a in analyses]
+        }, 200
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if not text:
+        return {'error': 'No text provided'}, 400
+    
+    with request_stage('tweet'):
+        result = det.analyze_text(text, fields)
+    
+    return {
+        'success': True,
+        'analysis': result,
+        'trust_level': _trust_level(result['score'])
+    }, 200
 
-@app.route('/analyze-url', methods=['POST'])
-def analyze_url():
-    """Analyze URL credibility"""
-    try:
-        data = request.json
-        url = data.get('url', '')
-        
-        if not url:
-            return jsonify({'error': 'No URL provided'}), 400
-        
-        result = detector.analyze_url(url)
-        
-        return jsonify({
+
+def analyze_url_payload(det, data, fields=None):
+    url = data.get('url', '')
+    urls = data.get('urls') or []
+
+    if urls:
+        with request_stage('urls'):
+            analyses = det.analyze_urls(urls, fields)
+        return {
             'success': True,
-            'analysis': result
-        })
+            'analyses': analyses
+        }, 200
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if not url:
+        return {'error': 'No URL provided'}, 400
+    
+    with request_stage('url_0'):
+        result = det.analyze_url(url, fields)
+    
+    return {
+        'success': True,
+        'analysis': result
+    }, 200
 
-@app.route('/analyze-profile', methods=['POST'])
-def analyze_profile():
-    """Analyze user profile credibility"""
-    try:
-        data = request.json
-        profile_data = data.get('profile', {})
-        
-        if not profile_data:
-            return jsonify({'error': 'No profile data provided'}), 400
-        
-        result = detector.analyze_profile(profile_data)
-        
-        return jsonify({
-            'success': True,
-            'analysis': result
-        })
+
+def analyze_profile_payload(det, data, fields=None):
+    profile_data = data.get('profile', {})
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    if not profile_data:
+        return {'error': 'No profile data provided'}, 400
+    
+    with request_stage('profile'):
+        result = det.analyze_profile(profile_data, fields)
+    
+    return {
+        'success': True,
+        'analysis': result
+    }, 200
 
-@app.route('/analyze-complete', methods=['POST'])
-def analyze_complete():
-    """Complete analysis combining text, URLs, and profile"""
-    try:
-        data = request.json
-        text = data.get('text', '')
-        urls = data.get('urls', [])
-        profile = data.get('profile', {})
-        
-        # Analyze each component
-        text_result = detector.analyze_text(text) if text else {'score': 50, 'flags': []}
-        
-        url_scores = []
-        for url in urls:
-            url_result = detector.analyze_url(url)
-            url_scores.append(url_result['score'])
-        
-        profile_result = detector.analyze_profile(profile) if profile else {'score': 50}
-        
-        # Calculate weighted combined score
+
+def analyze_complete_payload(det, data, fields=None):
+    text = data.get('text', '')
+    urls = data.get('urls', [])
+    profile = data.get('profile', {})
+    doc = AnalyzedDocument(text, urls)
+    
+    # Analyze each component
+    with request_stage('tweet'):
+        text_result = det.analyze_text(text, fields, doc) if text else prune_result({'score': 50, 'flags': []}, fields)
+    
+    # Only the URL scores are returned, so URL features are never extracted here
+    with request_stage('urls'):
+        url_scores = [r['score'] for r in det.analyze_urls(urls, frozenset(), doc)]
+    
+    with request_stage('profile'):
+        profile_result = det.analyze_profile(profile, fields) if profile else {'score': 50}
+    
+    # Calculate weighted combined score
+    with request_stage('aggregation'):
         weights = {'text': 0.5, 'url': 0.3, 'profile': 0.2}
         
         combined_score = (
@@ -386,24 +674,29 @@ def analyze_complete():
         )
         
         combined_score = max(0, min(100, combined_score))
-        
-        return jsonify({
-            'success': True,
-            'combined_score': round(combined_score, 2),
-            'trust_level': 'high' if combined_score >= 70 else 'medium' if combined_score >= 40 else 'low',
-            'components': {
-                'text': text_result,
-                'urls': url_scores,
-                'profile': profile_result
-            },
-            'flags': text_result['flags'],
-            'recommendation': 'safe_to_share' if combined_score >= 70 else 
-                            'verify_before_sharing' if combined_score >= 40 else 
-                            'do_not_share'
-        })
     
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    payload = {
+        'success': True,
+        'combined_score': round(combined_score, 2),
+        'trust_level': _trust_level(combined_score),
+        'components': {
+            'text': text_result,
+            'urls': url_scores,
+            'profile': profile_result
+        },
+        'recommendation': 'safe_to_share' if combined_score >= 70 else 
+                        'verify_before_sharing' if combined_score >= 40 else 
+                        'do_not_share'
+    }
+    if wants(fields, 'flags'):
+        payload['flags'] = text_result['flags']
+    return payload, 200
+
+
+# With a local URL model loaded, /api/classify-all only calls the URL LLM when asked to
+URL_USE_LLM = os.environ.get('URL_USE_LLM', '0').lower() in ('1', 'true', 'yes', 'on')
+# Same for profiles with a local profile model
+PROFILE_USE_LLM = os.environ.get('PROFILE_USE_LLM', '0').lower() in ('1', 'true', 'yes', 'on')
 
 
 def score_to_label(score):
@@ -414,99 +707,71 @@ def score_to_label(score):
     return 'REAL'
 
 
-@app.route('/api/classify-all', methods=['POST'])
-def classify_all_api():
-    """Compatibility endpoint for extension: accepts tweet_text, profile, urls, image_base64"""
-    try:
-        data = request.json or {}
+def classify_all_inputs(data):
+    """(tweet_text, profile, urls, image_b64) from a /api/classify-all body, accepting the old key names"""
+    tweet_text = data.get('tweet_text') or data.get('text') or ''
+    profile = data.get('profile') or {}
+    urls = data.get('urls') or data.get('url') or []
+    image_b64 = data.get('image_base64') or data.get('image') or None
+    return tweet_text, profile, urls, image_b64
 
-        tweet_text = data.get('tweet_text') or data.get('text') or ''
-        profile = data.get('profile') or {}
-        urls = data.get('urls') or data.get('url') or []
-        image_b64 = data.get('image_base64') or data.get('image') or None
 
-        # Analyze components — prefer LLM wrappers when available
-        tweet_res = {'score': 50, 'flags': []}
-        profile_res = {'score': 50}
+# classify-all only reads the score from these, so they skip explanation fields
 
-        classify_tweet = classify_profile = classify_url = classify_image_base64 = None
-        try:
-            import importlib.util
-            wrappers_path = os.path.join(os.path.dirname(__file__), 'ml-model', 'llm_wrappers.py')
-            if os.path.exists(wrappers_path):
-                spec = importlib.util.spec_from_file_location("llm_wrappers", wrappers_path)
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                classify_tweet = getattr(mod, 'classify_tweet', None)
-                classify_profile = getattr(mod, 'classify_profile', None)
-                classify_url = getattr(mod, 'classify_url', None)
-                classify_image_base64 = getattr(mod, 'classify_image_base64', None)
-        except Exception:
-            classify_tweet = classify_profile = classify_url = classify_image_base64 = None
-
-        if classify_tweet:
-            try:
-                t = classify_tweet(tweet_text)
-                # wrapper returns fake_percent
-                tweet_res = {'score': t.get('fake_percent', 50), 'flags': []}
-            except Exception:
-                tweet_res = detector.analyze_text(tweet_text) if tweet_text else {'score': 50, 'flags': []}
-        else:
-            tweet_res = detector.analyze_text(tweet_text) if tweet_text else {'score': 50, 'flags': []}
+def tweet_fallback(det, tweet_text, doc=None):
+    return det.analyze_text(tweet_text, frozenset(), doc) if tweet_text else {'score': 50, 'flags': []}
 
-        if classify_profile:
-            try:
-                p = classify_profile(profile)
-                profile_res = {'score': p.get('fake_probability', p.get('fake_percent', 50))}
-            except Exception:
-                profile_res = detector.analyze_profile(profile) if profile else {'score': 50}
-        else:
-            profile_res = detector.analyze_profile(profile) if profile else {'score': 50}
 
-        url_results = []
-        for u in (urls or []):
-            try:
-                if classify_url:
-                    ur = classify_url(u)
-                    # url_classify returns 'malicious_probability'
-                    url_results.append({'score': ur.get('malicious_probability', 50), 'meta': ur})
-                else:
-                    ur = detector.analyze_url(u)
-                    url_results.append({'score': ur.get('score', 50), 'meta': ur})
-            except Exception:
-                url_results.append({'score': 50, 'meta': {}})
+def profile_fallback(det, profile):
+    return det.analyze_profile(profile, frozenset()) if profile else {'score': 50}
 
-        url_scores = [r.get('score', 50) for r in url_results] if url_results else [50]
 
-        # Image handling: prefer LLM VLM wrapper
-        image_result = None
-        if image_b64:
+def profile_with_local_model(det, profile):
+    try:
+        with stage_timer('profile', 'model'):
+            return {'score': det.profile_model.predict_proba(profile) * 100}
+    except Exception:
+        return det.analyze_profile(profile, frozenset())
+
+
+def urls_with_local_model(det, urls):
+    """Local URL model: one vectorized batch, no LLM round-trips ([] if it fails)"""
+    try:
+        with request_stage('urls'), stage_timer('url', 'model'):
+            probs = det.url_model.predict_proba_batch(urls)
+        return [{'score': float(p) * 100, 'meta': {'source': 'url_model'}} for p in probs]
+    except Exception:
+        return []
+
+
+def image_fallback(det, image_b64):
+    """detector.image_model heuristic, used when the VLM wrapper isn't available"""
+    try:
+        with stage_timer('image', 'decode'):
+            image_data = base64.b64decode(image_b64.split(',')[-1])
+            img = Image.open(BytesIO(image_data)).convert('RGB')
+        if det.image_model is not None and hasattr(det.image_model, 'predict'):
+            img_resized = img.resize((224, 224))
+            arr = np.array(img_resized) / 255.0
             try:
-                if classify_image_base64:
-                    image_result = classify_image_base64(image_b64, tweet_text)
+                pred = det.image_model.predict([arr])
+                if isinstance(pred, (list, tuple)) and len(pred) > 0:
+                    score = float(pred[0]) if not isinstance(pred[0], dict) else 50
                 else:
-                    # fallback to detector.image_model heuristic if present
-                    image_data = base64.b64decode(image_b64.split(',')[-1])
-                    img = Image.open(BytesIO(image_data)).convert('RGB')
-                    if detector.image_model is not None and hasattr(detector.image_model, 'predict'):
-                        img_resized = img.resize((224, 224))
-                        import numpy as _np
-                        arr = _np.array(img_resized) / 255.0
-                        try:
-                            pred = detector.image_model.predict([arr])
-                            if isinstance(pred, (list, tuple)) and len(pred) > 0:
-                                score = float(pred[0]) if not isinstance(pred[0], dict) else 50
-                            else:
-                                score = float(pred)
-                            image_result = {'score': max(0, min(100, score)), 'label': score_to_label(score)}
-                        except Exception:
-                            image_result = {'score': 50, 'label': 'UNKNOWN'}
-                    else:
-                        image_result = {'score': 50, 'label': 'UNKNOWN'}
+                    score = float(pred)
+                return {'score': max(0, min(100, score)), 'label': score_to_label(score)}
             except Exception:
-                image_result = {'score': 50, 'label': 'UNKNOWN'}
+                return {'score': 50, 'label': 'UNKNOWN'}
+        return {'score': 50, 'label': 'UNKNOWN'}
+    except Exception:
+        return {'score': 50, 'label': 'UNKNOWN'}
 
-        # Aggregate overall
+
+def classify_all_response(urls, tweet_res, profile_res, url_results, image_result, fields=None):
+    """Weighted overall verdict plus per-component labels (the /api/classify-all body)"""
+    url_scores = [r.get('score', 50) for r in url_results] if url_results else [50]
+
+    with request_stage('aggregation'):
         weights = {'text': 0.5, 'url': 0.3, 'profile': 0.2}
         overall_score = (
             tweet_res.get('score', 50) * weights['text'] +
@@ -516,7 +781,7 @@ def classify_all_api():
 
         overall_score = max(0, min(100, overall_score))
 
-        response = {
+        return {
             'overall': {
                 'classification': score_to_label(overall_score),
                 'confidence': round(overall_score)
@@ -536,26 +801,241 @@ def classify_all_api():
                     'probability': round(r.get('score', 50))
                 } for u, r in zip(urls if urls else [], url_results if url_results else [{'score':50}])
             ],
-            'image': image_result
+            'image': prune_result(image_result, fields)
         }
 
-        return jsonify(response)
 
+def health_payload():
+    try:
+        from cascade import CASCADE_ENABLED, cascade_stats
+        cascade_info = {'enabled': CASCADE_ENABLED, 'stats': cascade_stats()}
+    except Exception:
+        cascade_info = {'enabled': False, 'stats': {}}
+
+    try:
+        from verdict_cache import VERDICT_CACHE_ENABLED, cache_stats
+        cache_info = {'enabled': VERDICT_CACHE_ENABLED, 'stats': cache_stats()}
+    except Exception:
+        cache_info = {'enabled': False, 'stats': {}}
+
+    return {
+        'status': 'healthy',
+        'models_loaded': {
+            'text_model': detector.has_model('text_classifier'),
+            'url_model': detector.has_model('url_classifier'),
+            'profile_model': detector.has_model('profile_classifier'),
+            'image_model': detector.has_model('image_classifier')
+        },
+        'model_registry': detector.registry.describe(),
+        'active_version': active_versions(),
+        'cascade': cascade_info,
+        'verdict_cache': cache_info
+    }
+
+
+def requested_fields():
+    return parse_fields(request.args.get('detail'), request.args.get('fields'))
+
+
+def _run_payload(build):
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return respond({'error': str(e)}, 400)
+    return respond(*build(detector.pinned(), request.json, fields))
+
+
+@app.route('/analyze', methods=['POST'])
+def analyze_tweet():
+    """Analyze tweet text for fake news indicators"""
+    try:
+        return _run_payload(analyze_tweet_payload)
+    except Exception as e:
+        return respond({'error': str(e)}, 500)
+
+@app.route('/analyze-url', methods=['POST'])
+def analyze_url():
+    """Analyze URL credibility (single 'url' or a batch of 'urls')"""
+    try:
+        return _run_payload(analyze_url_payload)
+    except Exception as e:
+        return respond({'error': str(e)}, 500)
+
+@app.route('/analyze-profile', methods=['POST'])
+def analyze_profile():
+    """Analyze user profile credibility"""
+    try:
+        return _run_payload(analyze_profile_payload)
+    except Exception as e:
+        return respond({'error': str(e)}, 500)
+
+@app.route('/analyze-complete', methods=['POST'])
+def analyze_complete():
+    """Complete analysis combining text, URLs, and profile"""
+    try:
+        return _run_payload(analyze_complete_payload)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return respond({'error': str(e)}, 500)
+
+
+@app.route('/api/classify-all', methods=['POST'])
+def classify_all_api():
+    """Compatibility endpoint for extension: accepts tweet_text, profile, urls, image_base64"""
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return respond({'error': str(e)}, 400)
+    try:
+        det = detector.pinned()
+        tweet_text, profile, urls, image_b64 = classify_all_inputs(request.json or {})
+        # Shared by every component below, so the text and URLs are processed once
+        doc = AnalyzedDocument(tweet_text, urls)
+
+        # Analyze components — prefer LLM wrappers when available
+        tweet_res = {'score': 50, 'flags': []}
+        profile_res = {'score': 50}
+
+        # Scorer set taken once, so a reload mid-request doesn't mix versions
+        with request_stage('module_load'):
+            wrappers = SCORERS.module('llm_wrappers')
+            classify_tweet = getattr(wrappers, 'classify_tweet', None)
+            classify_profile = getattr(wrappers, 'classify_profile', None)
+            classify_url = getattr(wrappers, 'classify_url', None)
+            classify_image_base64 = getattr(wrappers, 'classify_image_base64', None)
+
+        with request_stage('tweet'):
+            if classify_tweet:
+                try:
+                    t = classify_tweet(tweet_text, verified=bool(profile.get('verified')), doc=doc)
+                    # wrapper returns fake_percent
+                    tweet_res = {'score': t.get('fake_percent', 50), 'flags': []}
+                except Exception:
+                    tweet_res = tweet_fallback(det, tweet_text, doc)
+            else:
+                tweet_res = tweet_fallback(det, tweet_text, doc)
+
+        with request_stage('profile'):
+            if profile and det.profile_model is not None and not PROFILE_USE_LLM:
+                profile_res = profile_with_local_model(det, profile)
+            elif classify_profile:
+                try:
+                    p = classify_profile(profile)
+                    profile_res = {'score': p.get('fake_probability', p.get('fake_percent', 50))}
+                except Exception:
+                    profile_res = profile_fallback(det, profile)
+            else:
+                profile_res = profile_fallback(det, profile)
+
+        url_results = []
+        if urls and det.url_model is not None and not URL_USE_LLM:
+            url_results = urls_with_local_model(det, urls)
+
+        for i, u in enumerate(urls if not url_results else []):
+            with request_stage(f'url_{i}'):
+                try:
+                    if classify_url:
+                        ur = classify_url(u, doc=doc)
+                        # url_classify returns 'malicious_probability'
+                        url_results.append({'score': ur.get('malicious_probability', 50), 'meta': ur})
+                    else:
+                        ur = det.analyze_url(u, frozenset(), doc)
+                        url_results.append({'score': ur.get('score', 50), 'meta': ur})
+                except Exception:
+                    url_results.append({'score': 50, 'meta': {}})
+
+        # Image handling: prefer LLM VLM wrapper
+        image_result = None
+        if image_b64:
+            with request_stage('image'):
+                try:
+                    if classify_image_base64:
+                        image_result = classify_image_base64(image_b64, tweet_text)
+                    else:
+                        image_result = image_fallback(det, image_b64)
+                except Exception:
+                    image_result = {'score': 50, 'label': 'UNKNOWN'}
+
+        # Aggregate overall
+        return respond(classify_all_response(urls, tweet_res, profile_res, url_results, image_result, fields))
+
+    except Exception as e:
+        return respond({'error': str(e)}, 500)
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'models_loaded': {
-            'text_model': detector.text_model is not None,
-            'url_model': detector.url_model is not None,
-            'profile_model': detector.profile_model is not None,
-            'image_model': detector.image_model is not None
-        }
-    })
+    return respond(health_payload())
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text exposition: request counts/latency, stage timings, Groq outcomes, caches"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+def _admin_denied():
+    """403 response for a request not allowed to use /admin endpoints, else None"""
+    if ADMIN_TOKEN:
+        if request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+            return respond({'error': 'Forbidden'}, 403)
+    elif not ADMIN_ALLOW_LOCALHOST or request.remote_addr not in ('127.0.0.1', '::1'):
+        # Without a token, admin is off unless localhost was explicitly allowed
+        return respond({'error': 'Forbidden'}, 403)
+    return None
+
+
+def warm_files_from(data):
+    """
+    CSV paths from a /admin/warm-cache body, resolved inside WARM_CACHE_DIR (relative paths
+    are taken from there); raises ValueError when invalid or outside the directory
+    """
+    files = (data or {}).get('files') if isinstance(data, dict) else None
+    if not files or not isinstance(files, list) or not all(isinstance(f, str) for f in files):
+        raise ValueError('files must be a non-empty list of CSV paths')
+    if not WARM_CACHE_DIR:
+        raise ValueError('WARM_CACHE_DIR is not set on the server')
+
+    root = os.path.realpath(WARM_CACHE_DIR)
+    paths = []
+    for f in files:
+        # realpath follows symlinks and '..', so the prefix check sees where the file really is
+        path = os.path.realpath(os.path.join(root, f))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f'{f}: not inside WARM_CACHE_DIR')
+        paths.append(path)
+    return paths
+
+
+def client_warm_reports(reports):
+    """warm_caches reports for an HTTP response: a failure is only its exception type (details are logged)"""
+    return [{'file': r['file'], 'error': r['error']} if 'error' in r else r for r in reports]
+
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload models and rule packs without restarting; in-flight requests finish on the old ones"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+
+    ok, versions = reload_all()
+    return respond({'success': ok, 'active_version': versions}, 200 if ok else 500)
+
+
+@app.route('/admin/warm-cache', methods=['POST'])
+def admin_warm_cache():
+    """Load prior LLM verdicts from scored CSVs (under WARM_CACHE_DIR on the server) into this process's verdict caches"""
+    denied = _admin_denied()
+    if denied:
+        return denied
+    try:
+        files = warm_files_from(request.get_json(silent=True))
+    except ValueError as e:
+        return respond({'error': str(e)}, 400)
+
+    reports = warm_caches(files)
+    ok = not any('error' in r for r in reports)
+    return respond({'success': ok, 'files': client_warm_reports(reports)}, 200 if ok else 500)
 
 
 @app.route('/debug', methods=['GET'])
@@ -565,7 +1045,7 @@ def debug_ui():
         base = os.path.join(os.path.dirname(__file__), 'web_debug')
         return send_from_directory(base, 'index.html')
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return respond({'error': str(e)}, 500)
 
 if __name__ == '__main__':
     # Create models directory if it doesn't exist
@@ -581,6 +1061,11 @@ if __name__ == '__main__':
     print("  • POST /analyze-profile - Analyze profile")
     print("  • POST /analyze-complete - Complete analysis")
     print("  • GET /health - Health check")
+    print("  • GET /metrics - Prometheus metrics")
+    print("  • POST /admin/reload - Reload models and rule packs")
+    print("  • POST /admin/warm-cache - Load prior LLM verdicts into the caches")
     print("\n" + "=" * 50)
+    print("Development server; for production use: gunicorn -c gunicorn.conf.py wsgi:app")
     
+    start_reload_watcher()
     app.run(debug=False, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,355 @@
+"""
+ASGI variant of the API: uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+Same endpoints and response bodies as the Flask app (app.py), built from the
+same payload functions and serializers. The difference is how a request
+waits: Groq calls are awaited on shared AsyncGroq clients instead of holding
+a thread, and the components of /api/classify-all run concurrently, so a
+single process can keep thousands of requests in flight while the LLM
+answers. Regex, feature and local-model work is CPU-bound and runs in the
+event loop's default executor (a small thread pool), keeping the loop free
+to accept and finish other requests.
+"""
+import os
+import time
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+from starlette.routing import Match
+
+from app import (
+    detector, SCORERS, ADMIN_TOKEN, ADMIN_ALLOW_LOCALHOST, PROFILE_USE_LLM, URL_USE_LLM,
+    parse_fields, analyze_tweet_payload, analyze_url_payload, analyze_profile_payload, analyze_complete_payload,
+    classify_all_inputs, classify_all_response, health_payload, reload_all, start_reload_watcher, warm_files_from,
+    client_warm_reports,
+    tweet_fallback, profile_fallback, profile_with_local_model, urls_with_local_model, image_fallback,
+)
+from metrics import (
+    HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, render_metrics,
+    start_request_timing, end_request_timing, request_timings, request_stage, server_timing_header,
+)
+from serializers import encode_response
+from document import AnalyzedDocument
+from cache_warmer import warm_caches
+
+# ============ CONFIG ============
+
+# Threads for CPU-bound scoring. They share the GIL with the event loop, so
+# more threads don't add throughput; scale with uvicorn --workers instead.
+ASGI_CPU_THREADS = int(os.environ.get('ASGI_CPU_THREADS', '4'))
+# Upper bound on concurrent connections to the Groq API from this process;
+# LLM calls beyond it wait for a free connection
+GROQ_MAX_CONNECTIONS = int(os.environ.get('GROQ_MAX_CONNECTIONS', '1000'))
+# httpx checks every pooled connection each time a request starts or ends, so
+# one pool with hundreds of connections costs more CPU than the calls
+# themselves; split them over several clients (round-robin)
+GROQ_CLIENT_SHARDS = int(os.environ.get('GROQ_CLIENT_SHARDS', '16'))
+
+_groq_clients = []
+_next_client = itertools.count()
+
+
+def _make_groq_clients():
+    """AsyncGroq clients for this process ([] without GROQ_API_KEY, like the sync wrappers)"""
+    api_key = os.environ.get('GROQ_API_KEY')
+    if not api_key:
+        return []
+    from groq import AsyncGroq
+
+    per_shard = max(1, GROQ_MAX_CONNECTIONS // GROQ_CLIENT_SHARDS)
+    limits = httpx.Limits(max_connections=per_shard, max_keepalive_connections=per_shard)
+    return [AsyncGroq(api_key=api_key, http_client=httpx.AsyncClient(limits=limits))
+            for _ in range(GROQ_CLIENT_SHARDS)]
+
+
+def groq_client():
+    """Next shared AsyncGroq client, or None when no API key is configured"""
+    if not _groq_clients:
+        return None
+    return _groq_clients[next(_next_client) % len(_groq_clients)]
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    global _groq_clients
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=ASGI_CPU_THREADS, thread_name_prefix='asgi-cpu'))
+    detector.load_models()
+    _groq_clients = _make_groq_clients()
+    start_reload_watcher()
+    try:
+        yield
+    finally:
+        for client in _groq_clients:
+            await client.close()
+        _groq_clients = []
+
+
+app = FastAPI(title='Fake News Detection API (ASGI)', lifespan=lifespan,
+              docs_url=None, redoc_url=None, openapi_url=None)
+
+
+def encoded(request, payload, status=200):
+    """Response in the format the Accept header asks for (same serializers as the Flask app)"""
+    media_type, body = encode_response(payload, request.headers.get('accept'))
+    return Response(body, status_code=status, media_type=media_type, headers={'Vary': 'Accept'})
+
+
+# ========== REQUEST METRICS ==========
+
+def _endpoint_label(request):
+    # Routing happens after middleware, so match the route pattern here (bounded label cardinality)
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return 'unmatched'
+
+
+@app.middleware('http')
+async def request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    endpoint = _endpoint_label(request)
+    request.state.metrics_start = start
+    HTTP_IN_FLIGHT.inc(endpoint=endpoint)
+    # The endpoint runs in a copy of this context, so it appends to the same stage list
+    start_request_timing()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers['Server-Timing'] = server_timing_header(request_timings(), time.perf_counter() - start)
+        response.headers['Timing-Allow-Origin'] = '*'
+        return response
+    finally:
+        end_request_timing()
+        HTTP_IN_FLIGHT.dec(endpoint=endpoint)
+        HTTP_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint)
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=status)
+
+
+# Enable CORS for browser extension (added last: outermost, so preflights skip the metrics)
+app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'],
+                   expose_headers=['Server-Timing'])
+
+
+def _timing_requested(request):
+    return request.query_params.get('timing', '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+def respond(request, payload, status=200):
+    """JSON response; with ?timing=1 the stage breakdown is added to successful bodies"""
+    if status == 200 and _timing_requested(request):
+        stages = request_timings()
+        payload['timing'] = {
+            'stages': [{'name': name, 'ms': round(seconds * 1000, 3)} for name, seconds in stages],
+            'elapsed_ms': round((time.perf_counter() - request.state.metrics_start) * 1000, 3)
+        }
+    with request_stage('serialize'):
+        return encoded(request, payload, status)
+
+
+def requested_fields(request):
+    return parse_fields(request.query_params.get('detail'), request.query_params.get('fields'))
+
+
+async def _run_payload(request, build):
+    """Run a CPU-only payload function in the executor (detector pinned for the whole request)"""
+    try:
+        fields = requested_fields(request)
+    except ValueError as e:
+        return respond(request, {'error': str(e)}, 400)
+    try:
+        data = await request.json()
+        payload, status = await asyncio.to_thread(build, detector.pinned(), data, fields)
+        return respond(request, payload, status)
+    except Exception as e:
+        return encoded(request, {'error': str(e)}, 500)
+
+
+# ========== ENDPOINTS ==========
+
+@app.post('/analyze')
+async def analyze_tweet(request: Request):
+    """Analyze tweet text for fake news indicators"""
+    return await _run_payload(request, analyze_tweet_payload)
+
+
+@app.post('/analyze-url')
+async def analyze_url(request: Request):
+    """Analyze URL credibility (single 'url' or a batch of 'urls')"""
+    return await _run_payload(request, analyze_url_payload)
+
+
+@app.post('/analyze-profile')
+async def analyze_profile(request: Request):
+    """Analyze user profile credibility"""
+    return await _run_payload(request, analyze_profile_payload)
+
+
+@app.post('/analyze-complete')
+async def analyze_complete(request: Request):
+    """Complete analysis combining text, URLs, and profile"""
+    return await _run_payload(request, analyze_complete_payload)
+
+
+# ========== CLASSIFY-ALL COMPONENTS ==========
+# Same choices and fallbacks as classify_all_api() in app.py, but the
+# components run concurrently and each LLM call is awaited.
+
+async def _classify_tweet(det, wrappers, doc, profile):
+    with request_stage('tweet'):
+        classify_tweet = getattr(wrappers, 'classify_tweet_async', None)
+        if classify_tweet:
+            try:
+                t = await classify_tweet(doc.text, groq_client(), verified=bool(profile.get('verified')), doc=doc)
+                return {'score': t.get('fake_percent', 50), 'flags': []}
+            except Exception:
+                pass
+        return await asyncio.to_thread(tweet_fallback, det, doc.text, doc)
+
+
+async def _classify_profile(det, wrappers, profile):
+    with request_stage('profile'):
+        if profile and det.profile_model is not None and not PROFILE_USE_LLM:
+            return await asyncio.to_thread(profile_with_local_model, det, profile)
+        classify_profile = getattr(wrappers, 'classify_profile_async', None)
+        if classify_profile:
+            try:
+                p = await classify_profile(profile, groq_client())
+                return {'score': p.get('fake_probability', p.get('fake_percent', 50))}
+            except Exception:
+                pass
+        return await asyncio.to_thread(profile_fallback, det, profile)
+
+
+async def _classify_one_url(det, wrappers, doc, i, u):
+    with request_stage(f'url_{i}'):
+        try:
+            classify_url = getattr(wrappers, 'classify_url_async', None)
+            if classify_url:
+                ur = await classify_url(u, groq_client(), doc=doc)
+                return {'score': ur.get('malicious_probability', 50), 'meta': ur}
+            ur = await asyncio.to_thread(det.analyze_url, u, frozenset(), doc)
+            return {'score': ur.get('score', 50), 'meta': ur}
+        except Exception:
+            return {'score': 50, 'meta': {}}
+
+
+async def _classify_urls(det, wrappers, doc, urls):
+    if urls and det.url_model is not None and not URL_USE_LLM:
+        url_results = await asyncio.to_thread(urls_with_local_model, det, urls)
+        if url_results:
+            return url_results
+    return list(await asyncio.gather(*(_classify_one_url(det, wrappers, doc, i, u) for i, u in enumerate(urls))))
+
+
+async def _classify_image(det, wrappers, image_b64, tweet_text):
+    if not image_b64:
+        return None
+    with request_stage('image'):
+        try:
+            classify_image = getattr(wrappers, 'classify_image_base64_async', None)
+            if classify_image:
+                return await classify_image(image_b64, groq_client(), tweet_text)
+            return await asyncio.to_thread(image_fallback, det, image_b64)
+        except Exception:
+            return {'score': 50, 'label': 'UNKNOWN'}
+
+
+@app.post('/api/classify-all')
+async def classify_all_api(request: Request):
+    """Compatibility endpoint for extension: accepts tweet_text, profile, urls, image_base64"""
+    try:
+        fields = requested_fields(request)
+    except ValueError as e:
+        return respond(request, {'error': str(e)}, 400)
+    try:
+        det = detector.pinned()
+        tweet_text, profile, urls, image_b64 = classify_all_inputs(await request.json() or {})
+        # Shared by the concurrent components, so the text and URLs are processed once
+        doc = AnalyzedDocument(tweet_text, urls)
+
+        # Scorer set taken once, so a reload mid-request doesn't mix versions
+        with request_stage('module_load'):
+            wrappers = SCORERS.module('llm_wrappers')
+
+        tweet_res, profile_res, url_results, image_result = await asyncio.gather(
+            _classify_tweet(det, wrappers, doc, profile),
+            _classify_profile(det, wrappers, profile),
+            _classify_urls(det, wrappers, doc, urls),
+            _classify_image(det, wrappers, image_b64, tweet_text),
+        )
+
+        return respond(request, classify_all_response(urls, tweet_res, profile_res, url_results, image_result, fields))
+
+    except Exception as e:
+        return encoded(request, {'error': str(e)}, 500)
+
+
+@app.get('/health')
+async def health_check(request: Request):
+    """Health check endpoint"""
+    return respond(request, health_payload())
+
+
+@app.get('/metrics')
+async def metrics():
+    """Prometheus text exposition (this process only)"""
+    return PlainTextResponse(render_metrics(), media_type='text/plain; version=0.0.4')
+
+
+def _admin_denied(request):
+    """403 response for a request not allowed to use /admin endpoints, else None"""
+    if ADMIN_TOKEN:
+        if request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+            return encoded(request, {'error': 'Forbidden'}, 403)
+    elif not ADMIN_ALLOW_LOCALHOST or request.client is None or request.client.host not in ('127.0.0.1', '::1'):
+        # Without a token, admin is off unless localhost was explicitly allowed
+        return encoded(request, {'error': 'Forbidden'}, 403)
+    return None
+
+
+@app.post('/admin/reload')
+async def admin_reload(request: Request):
+    """Reload models and rule packs without restarting; in-flight requests finish on the old ones"""
+    denied = _admin_denied(request)
+    if denied:
+        return denied
+
+    ok, versions = await asyncio.to_thread(reload_all)
+    return encoded(request, {'success': ok, 'active_version': versions}, 200 if ok else 500)
+
+
+@app.post('/admin/warm-cache')
+async def admin_warm_cache(request: Request):
+    """Load prior LLM verdicts from scored CSVs (under WARM_CACHE_DIR on the server) into this process's verdict caches"""
+    denied = _admin_denied(request)
+    if denied:
+        return denied
+    try:
+        files = warm_files_from(await request.json())
+    except ValueError as e:
+        return encoded(request, {'error': str(e)}, 400)
+
+    reports = await asyncio.to_thread(warm_caches, files)
+    ok = not any('error' in r for r in reports)
+    return encoded(request, {'success': ok, 'files': client_warm_reports(reports)}, 200 if ok else 500)
+
+
+@app.get('/debug')
+async def debug_ui():
+    """Serve a simple debug UI (static file) to POST to /api/classify-all from the browser."""
+    return FileResponse(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_debug', 'index.html'))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run('asgi_app:app', host='0.0.0.0', port=int(os.environ.get('PORT', '5000')))
@@ -0,0 +1,424 @@
+"""
+Batch CLI: the /api/classify-all analysis over a CSV, in-process.
+
+    python batch_classify.py tweets_extracted.csv scored.csv --workers 4 --llm-concurrency 32
+
+Each input row is one request: tweet text, the URLs it links to and the
+author's profile, read from configurable columns. Rows go through the same
+choices and fallbacks as classify_all_api() in app.py, in two stages:
+
+- CPU stage: regex rule packs, cascade decisions, URL/profile signals and the
+  local models, sharded over a process pool (--workers).
+- LLM stage: whatever still needs Groq is awaited on one AsyncGroq client in
+  this process, at most --llm-concurrency calls at a time. Rows of a chunk
+  that repeat a tweet, URL or author share one call, and the verdict caches
+  live here too, so later chunks reuse the answers.
+
+The file is read and written in chunks (--chunksize rows); the CPU stage of
+the next chunk runs while the LLM stage of the current one waits on Groq.
+Output is the input columns plus the classify-all verdicts.
+"""
+import os
+import re
+import ast
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from app import (
+    detector, SCORERS, PROFILE_USE_LLM, URL_USE_LLM,
+    classify_all_response, tweet_fallback, profile_with_local_model, urls_with_local_model,
+)
+from document import AnalyzedDocument
+from url_canonical import url_cache_keys
+from verdict_cache import text_key
+from csv_stream import DEFAULT_CHUNKSIZE, RAW_TEXT, ChunkWriter, csv_header, read_chunks
+from dataset_io import text_to_type
+from tweet_ingest import parse_list_column
+
+# ============ CONFIG ============
+
+DEFAULT_LLM_CONCURRENCY = 16
+
+# Profile keys read from same-named columns unless --profile-col maps them.
+# "url" is left out: in most tweet files a url column holds links, not the bio URL.
+PROFILE_KEYS = (
+    'username', 'display_name', 'bio', 'followers', 'following', 'tweets',
+    'followers_count', 'following_count', 'tweet_count', 'account_age_days',
+    'has_profile_image', 'has_banner', 'verified',
+)
+
+# Profile fields that are not text. The CSV is read as raw text (so the other
+# columns are written back unchanged), and these are converted explicitly.
+PROFILE_TYPES = {
+    'followers': 'float64', 'following': 'float64', 'tweets': 'float64',
+    'followers_count': 'float64', 'following_count': 'float64', 'tweet_count': 'float64',
+    'account_age_days': 'float64',
+    'has_profile_image': 'bool', 'has_banner': 'bool', 'verified': 'bool',
+}
+
+RESULT_COLUMNS = (
+    'overall_classification', 'overall_confidence', 'tweet_classification', 'tweet_probability',
+    'profile_classification', 'profile_probability', 'url_results',
+)
+
+_URL_SPLIT_RE = re.compile(r'[\s,]+')
+
+# ========== INPUT ROWS ==========
+
+
+def parse_url_cell(value):
+    """URLs in one CSV cell: a list literal (['https://t.co/x']) or whitespace/comma-separated"""
+    if isinstance(value, (list, tuple)):
+        return [str(u) for u in value if u]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    text = value.strip()
+    if text.startswith('['):
+        try:
+            return [str(u) for u in ast.literal_eval(text) if u]
+        except (ValueError, SyntaxError):
+            pass
+    return [u for u in _URL_SPLIT_RE.split(text.strip('[]')) if u]
+
+
+def column_mapping(columns, text_col='text', urls_col='urls', profile_cols=()):
+    """
+    Which input column feeds which part of the request.
+
+    Args:
+        columns: input CSV header
+        profile_cols: "key=column" overrides, e.g. ("url=profile_url", "bio=description")
+
+    Returns:
+        dict: {'text': column or None, 'urls': column or None, 'profile': {profile key: column}}
+    """
+    profile = {key: key for key in PROFILE_KEYS if key in columns}
+    for item in profile_cols:
+        key, _, col = item.partition('=')
+        if not col:
+            raise ValueError(f'--profile-col expects KEY=COLUMN, got {item!r}')
+        profile[key.strip()] = col.strip()
+    missing = [c for c in [text_col, urls_col, *profile.values()] if c and c not in columns]
+    if missing:
+        raise ValueError(f'columns not in the input: {missing} (found: {list(columns)})')
+    return {'text': text_col or None, 'urls': urls_col or None, 'profile': profile}
+
+
+def row_inputs(row, mapping, urls=None):
+    """(tweet_text, profile, urls) for one input row, like classify_all_inputs() for a request body"""
+    text = row.get(mapping['text']) if mapping['text'] else ''
+    text = text if isinstance(text, str) else ''
+    if urls is None:
+        urls = parse_url_cell(row.get(mapping['urls'])) if mapping['urls'] else []
+    profile = {key: row[col] for key, col in mapping['profile'].items() if not pd.isna(row[col])}
+    return text, profile, urls
+
+
+def typed_profile_columns(chunk, mapping):
+    """
+    chunk (read with RAW_TEXT) with its mapped profile columns converted to PROFILE_TYPES:
+    counts to numbers, flags from "True"/"False" text to bools. A cell that doesn't parse
+    is left out of the profile, like an empty one.
+    """
+    chunk = chunk.copy()
+    for key, col in mapping['profile'].items():
+        if key in PROFILE_TYPES:
+            values = text_to_type(chunk[col], PROFILE_TYPES[key]).astype(object)
+            # Whole counts as int, per cell: "1200" gives 1200 whatever else the chunk holds
+            chunk[col] = values.map(_whole) if PROFILE_TYPES[key] == 'float64' else values
+    return chunk
+
+
+def _whole(value):
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def chunk_inputs(chunk, mapping):
+    """row_inputs() for every row of a chunk; list-literal URL cells are parsed in one pass (tweet_ingest)"""
+    records = typed_profile_columns(chunk, mapping).to_dict('records')
+    if not mapping['urls']:
+        return [row_inputs(r, mapping, []) for r in records]
+    url_lists = parse_list_column(chunk[mapping['urls']], fallback=parse_url_cell).to_lists()
+    return [row_inputs(r, mapping, [u for u in urls if u]) for r, urls in zip(records, url_lists)]
+
+
+# ========== CPU STAGE (process pool) ==========
+#
+# Each component becomes a plan: ('done', score) when nothing is left to ask,
+# or ('llm', ...) with everything the LLM stage needs. Plans are plain tuples,
+# so they travel back from the worker processes cheaply.
+
+_stage = {'llm': False}
+
+
+def _init_worker(llm_enabled):
+    _stage['llm'] = llm_enabled
+
+
+def _plan_tweet(det, wrappers, text, profile, doc):
+    try:
+        regex_percent, regex_tags, decided = wrappers._tweet_regex(text, bool(profile.get('verified')), None, doc)
+    except Exception:
+        return ('done', tweet_fallback(det, text, doc)['score'])
+    if decided is not None:
+        return ('done', decided['fake_percent'])
+    if _stage['llm'] and wrappers.classify_with_groq_percentage_async:
+        return ('llm', text, regex_percent, ','.join(regex_tags))
+    return ('done', regex_percent)
+
+
+def _plan_profile(det, scorer, profile):
+    if profile and det.profile_model is not None and not PROFILE_USE_LLM:
+        return ('done', profile_with_local_model(det, profile)['score'])
+    if not (_stage['llm'] and scorer):
+        return ('done', 50)   # llm_wrappers.classify_profile without a Groq key
+    try:
+        return ('llm', profile, scorer.score_profile_signals(profile))
+    except Exception:
+        return ('done', 50)
+
+
+def _plan_url(scorer, url, doc):
+    if not (_stage['llm'] and scorer):
+        return ('done', 50)   # llm_wrappers.classify_url without a Groq key
+    try:
+        return ('llm', url, scorer.score_url_signals(url, None, doc))
+    except Exception:
+        return ('done', 50)
+
+
+def score_rows(rows):
+    """
+    CPU stage for a shard of (tweet_text, profile, urls) rows.
+
+    Returns:
+        list of (tweet plan, profile plan, [url plans]) per row
+    """
+    det = detector.pinned()
+    wrappers = SCORERS.module('llm_wrappers')
+    profile_scorer = SCORERS.module('profile_classifier')
+    url_scorer = SCORERS.module('url_classifier')
+
+    # Local URL model: one vectorized batch for every URL in the shard
+    local_scores = None
+    if det.url_model is not None and not URL_USE_LLM:
+        flat = [u for _, _, urls in rows for u in urls]
+        results = urls_with_local_model(det, flat) if flat else []
+        if len(results) == len(flat) and flat:
+            local_scores = iter([r['score'] for r in results])
+
+    plans = []
+    for text, profile, urls in rows:
+        doc = AnalyzedDocument(text, urls)
+        tweet = _plan_tweet(det, wrappers, text, profile, doc)
+        prof = _plan_profile(det, profile_scorer, profile)
+        if local_scores is not None and urls:
+            url_plans = [('done', next(local_scores)) for _ in urls]
+        else:
+            url_plans = [_plan_url(url_scorer, u, doc) for u in urls]
+        plans.append((tweet, prof, url_plans))
+    return plans
+
+
+# ========== LLM STAGE (this process) ==========
+
+
+class LLMStage:
+    """Resolves 'llm' plans on one AsyncGroq client, at most `concurrency` calls in flight"""
+
+    def __init__(self, client, concurrency):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.wrappers = SCORERS.module('llm_wrappers')
+        self.profile_scorer = SCORERS.module('profile_classifier')
+        self.url_scorer = SCORERS.module('url_classifier')
+        # The chunk's calls by verdict cache key: a repeat awaits the first call
+        # instead of missing the cache while that call is still in flight
+        self.inflight = {}
+
+    def _once(self, key, call):
+        """Task running call() for the first plan with this cache key; None (no key) never shares"""
+        task = self.inflight.get(key) if key is not None else None
+        if task is None:
+            task = asyncio.ensure_future(call())
+            if key is not None:
+                self.inflight[key] = task
+        return task
+
+    async def _limited(self, coro):
+        async with self.semaphore:
+            return await coro
+
+    async def tweet_score(self, plan):
+        if plan[0] == 'done':
+            return plan[1]
+        _, text, regex_percent, regex_tags = plan
+        try:
+            fake_percent, _ = await self._once(('tweet', text_key(text)), lambda: self._limited(
+                self.wrappers.classify_with_groq_percentage_async(text, regex_percent, regex_tags, self.client)))
+            return fake_percent
+        except Exception:
+            return regex_percent
+
+    async def profile_score(self, plan):
+        if plan[0] == 'done':
+            return plan[1]
+        _, profile, signals = plan
+        try:
+            username, fingerprint = self.profile_scorer.profile_cache_key(profile)
+            key = ('profile', username, fingerprint) if username is not None else None
+            p = await self._once(key, lambda: self._limited(
+                self.profile_scorer.classify_profile_async(profile, self.client, signals=signals)))
+            return p.get('fake_probability', p.get('fake_percent', 50))
+        except Exception:
+            return 50
+
+    async def url_score(self, plan):
+        if plan[0] == 'done':
+            return plan[1]
+        _, url, signals = plan
+        try:
+            ur = await self._once(('url', url_cache_keys(url)[0]), lambda: self._limited(
+                self.url_scorer.classify_url_async(url, self.client, signals=signals)))
+            return ur.get('malicious_probability', 50)
+        except Exception:
+            return 50
+
+    async def resolve(self, plans):
+        """[(tweet score, profile score, [url scores])] for a chunk's plans"""
+        async def one(tweet, prof, url_plans):
+            return await asyncio.gather(
+                self.tweet_score(tweet), self.profile_score(prof),
+                asyncio.gather(*(self.url_score(p) for p in url_plans)))
+        try:
+            return await asyncio.gather(*(one(*p) for p in plans))
+        finally:
+            # Finished calls are in the verdict caches now
+            self.inflight.clear()
+
+
+def result_columns(rows, scores):
+    """RESULT_COLUMNS values per row, from the same aggregation as /api/classify-all"""
+    out = {c: [] for c in RESULT_COLUMNS}
+    for (_, _, urls), (tweet, prof, url_scores) in zip(rows, scores):
+        body = classify_all_response(urls, {'score': tweet, 'flags': []}, {'score': prof},
+                                     [{'score': s} for s in url_scores], None)
+        out['overall_classification'].append(body['overall']['classification'])
+        out['overall_confidence'].append(body['overall']['confidence'])
+        out['tweet_classification'].append(body['tweet']['classification'])
+        out['tweet_probability'].append(body['tweet']['probability'])
+        out['profile_classification'].append(body['profile']['classification'])
+        out['profile_probability'].append(body['profile']['probability'])
+        out['url_results'].append(json.dumps(body['urls']))
+    return out
+
+
+# ========== RUNNER ==========
+
+
+def _shards(rows, n):
+    size = -(-len(rows) // n) if rows else 0
+    return [rows[i:i + size] for i in range(0, len(rows), size)] if size else []
+
+
+def _make_client(concurrency):
+    import httpx
+    from groq import AsyncGroq
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    return AsyncGroq(api_key=os.environ['GROQ_API_KEY'], http_client=httpx.AsyncClient(limits=limits))
+
+
+async def _run(input_csv, output_csv, mapping, chunksize, pool, shards, llm):
+    loop = asyncio.get_running_loop()
+
+    async def finish(writer, chunk, rows, plans):
+        scores = await llm.resolve(plans) if llm else [
+            (t[1], p[1], [u[1] for u in us]) for t, p, us in plans]
+        writer.write(chunk.assign(**result_columns(rows, scores)))
+        print(f'[{writer.rows} rows] written')
+
+    previous = None
+    with ChunkWriter(output_csv) as writer:
+        # Raw text in, so pass-through columns (64-bit ids, counts) are written back unchanged
+        for chunk in read_chunks(input_csv, chunksize, **RAW_TEXT):
+            rows = chunk_inputs(chunk, mapping)
+            # Start this chunk's CPU stage, then finish the previous chunk's LLM stage meanwhile
+            futures = [loop.run_in_executor(pool, score_rows, part) for part in _shards(rows, shards)]
+            if previous is not None:
+                await finish(writer, *previous)
+            plans = [plan for part in await asyncio.gather(*futures) for plan in part]
+            previous = (chunk, rows, plans)
+        if previous is not None:
+            await finish(writer, *previous)
+    if llm:
+        await llm.client.close()
+    return {'rows': writer.rows, 'chunks': writer.chunks}
+
+
+def run(input_csv, output_csv, text_col='text', urls_col='urls', profile_cols=(), chunksize=DEFAULT_CHUNKSIZE,
+        workers=None, llm_concurrency=DEFAULT_LLM_CONCURRENCY, use_llm=True):
+    """
+    Classify every row of input_csv and write input columns + RESULT_COLUMNS to output_csv.
+
+    Returns:
+        dict: rows, chunks, seconds, rows_per_second, workers, llm (bool)
+    """
+    start = time.perf_counter()
+    mapping = column_mapping(csv_header(input_csv), text_col, urls_col, profile_cols)
+    workers = workers or os.cpu_count() or 1
+    llm_enabled = bool(use_llm and os.environ.get('GROQ_API_KEY'))
+    _init_worker(llm_enabled)
+    detector.load_models()
+
+    # Models and scorers are loaded before the pool starts, so forked workers inherit them
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(llm_enabled,)) if workers > 1 else None
+    try:
+        llm = None
+        if llm_enabled:
+            # The client is bound to the running loop, so it is made inside it
+            async def main():
+                stage = LLMStage(_make_client(llm_concurrency), llm_concurrency)
+                return await _run(input_csv, output_csv, mapping, chunksize, pool, workers, stage)
+            stats = asyncio.run(main())
+        else:
+            stats = asyncio.run(_run(input_csv, output_csv, mapping, chunksize, pool, workers, llm))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    seconds = time.perf_counter() - start
+    return dict(stats, seconds=round(seconds, 2), rows_per_second=round(stats['rows'] / seconds, 1),
+                workers=workers, llm=llm_enabled)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the /api/classify-all analysis (tweet + profile + URLs) over a CSV, in-process')
+    parser.add_argument('input', help='input CSV, one request per row')
+    parser.add_argument('output', help='output CSV: input columns + verdict columns')
+    parser.add_argument('--text-col', default='text', help='tweet text column ("" for none)')
+    parser.add_argument('--urls-col', default='urls', help='URL list column ("" for none)')
+    parser.add_argument('--profile-col', action='append', default=[], metavar='KEY=COLUMN',
+                        help='profile field from a column, e.g. url=profile_url (repeatable); '
+                             'same-named columns are used by default')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows per chunk')
+    parser.add_argument('--workers', type=int, default=None, help='CPU-stage processes (default: all cores)')
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help='max Groq calls in flight')
+    parser.add_argument('--no-llm', action='store_true', help='never call Groq (as without GROQ_API_KEY)')
+    args = parser.parse_args()
+
+    stats = run(args.input, args.output, args.text_col, args.urls_col, args.profile_col, args.chunksize,
+                args.workers, args.llm_concurrency, not args.no_llm)
+    print(f"[DONE] {stats['rows']} rows in {stats['seconds']} s ({stats['rows_per_second']} rows/s, "
+          f"{stats['workers']} workers, LLM {'on' if stats['llm'] else 'off'}) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
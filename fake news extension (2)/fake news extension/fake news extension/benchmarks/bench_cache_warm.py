@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bench_hot_paths import BASE_DIR, ML_MODEL_DIR, stub_groq, _git_commit
+
+# ============ CONFIG ============
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "cache_warm.json")
+N_ROWS = 1_000_000
+ERROR_RATE = 0.05       # share of "Groq error: 401" rows, which the warmer must skip
+STALE_RATE = 0.05       # share of rows from another model or prompt, which it must reject
+SEED = 42
+
+# ========== INPUTS ==========
+
+
+def synthetic_files(directory, n=N_ROWS, seed=SEED):
+    """n-row tweet, profile and URL verdict CSVs in the offline output layouts"""
+    import groq_llm_fake_news
+    import profile_classifier
+    import url_classifier
+
+    rng = np.random.default_rng(seed)
+    tweets = pd.read_csv(os.path.join(BASE_DIR, "tweets_extracted.csv"))["text"].fillna("").astype(str).to_numpy()
+    profiles = pd.read_csv(os.path.join(BASE_DIR, "fake_profile_dataset.csv"))
+    urls = pd.read_csv(os.path.join(BASE_DIR, "fake_url_dataset.csv"))["url"].astype(str).to_numpy()
+
+    ids = np.arange(n)
+    errors = rng.random(n) < ERROR_RATE
+    scores = rng.integers(0, 101, n)
+    stale = rng.random(n) < STALE_RATE
+
+    def reasons(ok_reason):
+        return np.where(errors, "Groq error: Error code: 401 - {'error': {'message': 'Invalid API Key'}}", ok_reason)
+
+    def sources(live):
+        return np.where(stale, "llama3-8b-8192:000000000000", live)
+
+    files = {}
+    files["tweet"] = os.path.join(directory, "tweets_with_groq_percentage.csv")
+    pd.DataFrame({
+        "tweet_id": ids,
+        "text": [f"{t} #{i}" for t, i in zip(tweets[rng.integers(0, len(tweets), n)].tolist(), ids.tolist())],
+        "regex_fake_percent": rng.random(n) * 30,
+        "groq_fake_percent": np.where(errors, 0.0, scores),
+        "groq_reason": reasons("Sensational claim without a source."),
+        "groq_source": sources(groq_llm_fake_news.VERDICT_SOURCE),
+    }).to_csv(files["tweet"], index=False)
+
+    picks = profiles.iloc[rng.integers(0, len(profiles), n)].reset_index(drop=True)
+    picks["username"] = [f"{u}_{i}" for u, i in zip(picks["username"].astype(str).tolist(), ids.tolist())]
+    picks["llm_profile_fake_percent"] = np.where(errors, 0.0, scores)
+    picks["llm_profile_reason"] = reasons("Bio pushes a crypto giveaway.")
+    picks["llm_profile_source"] = sources(profile_classifier.VERDICT_SOURCE)
+    files["profile"] = os.path.join(directory, "profiles_with_groq_profile_scores.csv")
+    picks.to_csv(files["profile"], index=False)
+
+    files["url"] = os.path.join(directory, "url_verdicts.csv")
+    pd.DataFrame({
+        "url": [f"{u}{'&' if '?' in u else '?'}id={i}" for u, i in zip(urls[rng.integers(0, len(urls), n)].tolist(), ids.tolist())],
+        "malicious_probability": scores,
+        "llm_threat_type": np.where(scores >= 70, "phishing", "safe"),
+        "reason": reasons("Look-alike login page."),
+        "llm_url_source": sources(url_classifier.VERDICT_SOURCE),
+    }).to_csv(files["url"], index=False)
+    return files
+
+
+# ========== RUNNER ==========
+
+
+def run(output=DEFAULT_OUTPUT, n=N_ROWS):
+    stub_groq()
+    sys.path.insert(0, ML_MODEL_DIR)
+    from cache_warmer import warm_file
+    from verdict_cache import VERDICT_CACHE_SIZE, clear_caches
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        files = synthetic_files(directory, n)
+        print(f"generated {n} rows per kind in {time.perf_counter() - start:.1f} s")
+
+        for kind, path in files.items():
+            clear_caches()
+            report = warm_file(path, kind)
+            results[f"warm_file[{kind},{n}]"] = dict(
+                report, file=os.path.basename(path), file_mb=round(os.path.getsize(path) / 1e6, 1),
+                rows_per_second=round(report["rows"] / report["seconds"]))
+            print(f"{kind:8s} {report['rows']:>9d} rows  {report['rejected']:>7d} rejected  "
+                  f"{report['skipped']:>7d} skipped  {report['loaded']:>9d} loaded  {report['seconds']:>7.2f} s")
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "n_rows": n,
+            "cache_size": VERDICT_CACHE_SIZE,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time loading prior LLM verdicts from large scored CSVs into the verdict caches")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--n", type=int, default=N_ROWS, help="rows per generated CSV")
+    parser.add_argument("--cache-size", type=int, help="VERDICT_CACHE_SIZE for this run (default: the env setting)")
+    args = parser.parse_args()
+    if args.cache_size is not None:
+        # Read when verdict_cache is imported, so set it first
+        os.environ["VERDICT_CACHE_SIZE"] = str(args.cache_size)
+    run(args.output, args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from bench_hot_paths import BASE_DIR, TWEETS_CSV, PROFILES_CSV, _git_commit
+
+# ============ CONFIG ============
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "csv_stream.json")
+SIZES = (1_000, 100_000, 1_000_000)
+LLM_SIZES = (1_000, 50_000)       # one Groq call per row (mock server), so smaller inputs
+WHOLE_FILE_MAX_ROWS = 100_000     # the whole-file mode (--chunksize 0) needs RAM in proportion to the file
+CHUNKSIZE = 10_000
+
+TWEETS_REGEX_CSV = os.path.join(BASE_DIR, "tweets_with_regex_scores.csv")
+PROFILES_REGEX_CSV = "profiles_with_regex_scores.csv"    # made by profile_regex_scoring.py in the run's directory
+
+# Batch scripts under test: (script, input rows it scores, calls Groq)
+SCRIPTS = {
+    "tweet_regex": ("ml-model/groq_llm_with_regex_percentage.py", TWEETS_CSV, False),
+    "profile_regex": ("ml-model/profile_regex_scoring.py", PROFILES_CSV, False),
+    "tweet_llm": ("ml-model/groq_llm_fake_news.py", TWEETS_REGEX_CSV, True),
+    "profile_llm": ("ml-model/groq_llm_profile_percentage.py", PROFILES_REGEX_CSV, True),
+    "batch_classify": ("batch_classify.py", TWEETS_CSV, True),
+}
+
+# The Groq stand-in the LLM scripts call: no latency, so the runs measure the scripts
+MOCK_CONFIG = {"latency": "fixed:0"}
+
+# Runs a script and writes its own peak RSS (VmHWM, KiB) to $BENCH_PEAK_FILE at exit.
+# wait4()'s ru_maxrss won't do: Linux carries the parent's high-water mark over
+# fork + exec, so every child would report at least this process's RSS.
+PEAK_RSS_RUNNER = """
+import os, sys, atexit, runpy
+
+def report():
+    with open("/proc/self/status") as status:
+        peak_kb = next(line.split()[1] for line in status if line.startswith("VmHWM:"))
+    with open(os.environ["BENCH_PEAK_FILE"], "w") as f:
+        f.write(peak_kb)
+
+atexit.register(report)
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+# ========== INPUTS ==========
+
+
+def synthetic_csv(path, source_csv, n, block=50_000):
+    """n rows cycled from source_csv, written block by block so generating stays flat too"""
+    source = pd.read_csv(source_csv, dtype=str, keep_default_na=False)
+    reps = -(-block // len(source))
+    block_df = pd.concat([source] * reps, ignore_index=True).iloc[:block]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        written = 0
+        while written < n:
+            part = block_df.iloc[:min(block, n - written)]
+            part.to_csv(f, header=written == 0, index=False)
+            written += len(part)
+    return path
+
+
+def run_script(script, input_csv, output_csv, chunksize, env=None):
+    """Run one batch script in a fresh process; (seconds, peak RSS MB) of that process"""
+    path = os.path.join(BASE_DIR, script)
+    if script == "batch_classify.py":
+        # One worker: a process pool's children would not count in this process's RSS
+        args = [input_csv, output_csv, "--workers", "1"]
+    else:
+        args = ["--input", input_csv, "--output", output_csv]
+    peak_file = output_csv + ".peak"
+    start = time.perf_counter()
+    # cwd is the script's directory, which is also sys.path[0] when it runs directly
+    proc = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_RUNNER, path, *args, "--chunksize", str(chunksize)],
+        cwd=os.path.dirname(path), env=dict(os.environ, BENCH_PEAK_FILE=peak_file, **(env or {})),
+        stdout=subprocess.DEVNULL)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} exited with {proc.returncode}")
+    with open(peak_file, encoding="utf-8") as f:
+        peak_kb = int(f.read())
+    os.remove(peak_file)
+    return seconds, peak_kb / 1024
+
+
+def start_mock_groq():
+    """The load tests' Groq stand-in, in this process; (server, env for the scripts)"""
+    sys.path.insert(0, os.path.join(BASE_DIR, "loadtest"))
+    from mock_groq_server import start_mock_server
+
+    server, url = start_mock_server(MOCK_CONFIG)
+    return server, {"GROQ_BASE_URL": url, "GROQ_API_KEY": "mock", "GROQ_REQUEST_DELAY": "0"}
+
+
+# ========== RUNNER ==========
+
+
+def run(output=DEFAULT_OUTPUT, sizes=SIZES, chunksize=CHUNKSIZE, whole_file_max=WHOLE_FILE_MAX_ROWS,
+        llm_sizes=LLM_SIZES):
+    results = {}
+    mock, llm_env = start_mock_groq()
+    with tempfile.TemporaryDirectory() as directory:
+        # The profile LLM script reads the profile regex script's output
+        profiles_regex = os.path.join(directory, PROFILES_REGEX_CSV)
+        run_script(SCRIPTS["profile_regex"][0], PROFILES_CSV, profiles_regex, 0)
+
+        for name, (script, source_csv, uses_llm) in SCRIPTS.items():
+            source_csv = os.path.join(directory, source_csv) if source_csv == PROFILES_REGEX_CSV else source_csv
+            for n in (llm_sizes if uses_llm else sizes):
+                input_csv = synthetic_csv(os.path.join(directory, f"{name}_{n}.csv"), source_csv, n)
+                output_csv = os.path.join(directory, f"{name}_{n}_out.csv")
+                modes = [("stream", chunksize)] + ([("whole_file", 0)] if n <= whole_file_max else [])
+                for mode, size in modes:
+                    seconds, peak_mb = run_script(script, input_csv, output_csv, size, llm_env if uses_llm else None)
+                    results[f"{name}[{mode},{n}]"] = {
+                        "rows": n,
+                        "chunksize": size,
+                        "input_mb": round(os.path.getsize(input_csv) / 1e6, 1),
+                        "peak_rss_mb": round(peak_mb, 1),
+                        "seconds": round(seconds, 2),
+                        "rows_per_second": round(n / seconds),
+                    }
+                    print(f"{name:14s} {mode:10s} {n:>10d} rows  {os.path.getsize(input_csv) / 1e6:>8.1f} MB in  "
+                          f"peak RSS {peak_mb:>7.1f} MB  {seconds:>7.1f} s")
+                os.remove(input_csv)
+                os.remove(output_csv)
+    mock.shutdown()
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "chunksize": chunksize,
+            "mock_groq": MOCK_CONFIG,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Peak RSS of the batch scripts in streaming vs whole-file mode, across input sizes")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="input rows per run")
+    parser.add_argument("--llm-sizes", type=int, nargs="+", default=list(LLM_SIZES),
+                        help="input rows per run of the scripts that call Groq (the mock server)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="rows per chunk in streaming mode")
+    parser.add_argument("--whole-file-max", type=int, default=WHOLE_FILE_MAX_ROWS,
+                        help="largest input also run with --chunksize 0 (whole file in memory)")
+    args = parser.parse_args()
+    run(args.output, args.sizes, args.chunksize, args.whole_file_max, args.llm_sizes)
+
+
+if __name__ == "__main__":
+    main()
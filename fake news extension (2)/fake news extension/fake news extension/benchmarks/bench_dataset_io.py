@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bench_hot_paths import BASE_DIR, ML_MODEL_DIR, TWEETS_CSV, _git_commit
+
+# ============ CONFIG ============
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "dataset_io.json")
+N_ROWS = 500_000
+REPEAT = 3
+FORMATS = ("csv", "parquet", "arrow")
+PROJECTION = ["text"]       # what the tweet regex stage reads
+SEED = 42
+
+# ========== INPUTS ==========
+
+
+def synthetic_tweets(path, n, block=50_000, seed=SEED):
+    """
+    n tweets_extracted.csv-style rows. Rows cycle through the committed tweets,
+    but ids, texts, timestamps and t.co links are unique per row, so the
+    columnar formats can't just compress away repeats.
+    """
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(TWEETS_CSV, dtype=str, keep_default_na=False)
+    alphabet = np.array(list("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for start in range(0, n, block):
+            size = min(block, n - start)
+            part = source.iloc[np.arange(start, start + size) % len(source)].reset_index(drop=True)
+            ids = np.arange(start, start + size)
+            codes = ["".join(c) for c in alphabet[rng.integers(0, len(alphabet), (size, 10))]]
+            links = [f"https://t.co/{c}" for c in codes]
+            part["tweet_id"] = (1991880204286038505 + ids).astype(str)
+            part["created_at"] = pd.to_datetime(1_763_700_000 + ids * 7, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+            part["text"] = [f"{t} {u} #{i}" for t, u, i in zip(part["text"], links, ids.tolist())]
+            part["raw_text"] = part["text"]
+            part["urls"] = [str([u]) for u in links]
+            part.to_csv(f, header=start == 0, index=False)
+    return path
+
+
+# ========== RUNNER ==========
+
+
+def _best(fn, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(output=DEFAULT_OUTPUT, n=N_ROWS, repeat=REPEAT):
+    sys.path.insert(0, ML_MODEL_DIR)
+    import pyarrow
+    from dataset_io import read_dataset, write_dataset, convert, stream_dataset
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {fmt: os.path.join(directory, f"tweets.{fmt}") for fmt in FORMATS}
+        synthetic_tweets(paths["csv"], n)
+        for fmt in ("parquet", "arrow"):
+            report = convert(paths["csv"], paths[fmt])
+            results[f"convert[csv->{fmt}]"] = {"seconds": report["seconds"]}
+        df = read_dataset(paths["parquet"])
+
+        for fmt, path in paths.items():
+            row = {"file_mb": round(os.path.getsize(path) / 1e6, 1)}
+            # Typed DataFrame: lists as lists, flags as bool (the CSV path parses the list literals)
+            row["read_all_s"] = round(_best(lambda: read_dataset(path), repeat), 3)
+            row["read_projected_s"] = round(_best(lambda: read_dataset(path, PROJECTION), repeat), 3)
+            out = os.path.join(directory, f"written.{fmt}")
+            row["write_s"] = round(_best(lambda: write_dataset(df, out), repeat), 3)
+            # A pipeline stage with a trivial scorer: the I/O cost every stage pays
+            staged = os.path.join(directory, f"staged.{fmt}")
+            row["stage_passthrough_s"] = round(_best(lambda: stream_dataset(
+                path, staged, lambda chunk, offset: {"score": [0.0] * len(chunk)}, columns=PROJECTION), repeat), 3)
+            results[f"{fmt}[{n}]"] = row
+            print(f"{fmt:8s} {row['file_mb']:>8.1f} MB  read {row['read_all_s']:>7.2f} s  "
+                  f"read {PROJECTION} {row['read_projected_s']:>6.2f} s  write {row['write_s']:>6.2f} s  "
+                  f"stage {row['stage_passthrough_s']:>6.2f} s")
+
+        # Plain pd.read_csv (lists left as strings), for reference
+        results[f"csv_untyped[{n}]"] = {"read_all_s": round(_best(lambda: pd.read_csv(paths["csv"]), repeat), 3)}
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "pyarrow": pyarrow.__version__,
+            "n_rows": n,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="File size and parse / write / stage time of the tweet dataset as CSV, Parquet and Arrow")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--n", type=int, default=N_ROWS, help="rows in the generated dataset")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per case (best is kept)")
+    args = parser.parse_args()
+    run(args.output, args.n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+import types
+import argparse
+import platform
+import statistics
+import subprocess
+import pandas as pd
+
+# ============ CONFIG ============
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ML_MODEL_DIR = os.path.join(BASE_DIR, "ml-model")
+TWEETS_CSV = os.path.join(BASE_DIR, "tweets_extracted.csv")
+URLS_CSV = os.path.join(BASE_DIR, "fake_url_dataset.csv")
+PROFILES_CSV = os.path.join(BASE_DIR, "fake_profile_dataset.csv")
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "hot_paths.json")
+
+REPEAT = 7                    # timed passes over each input set
+MIN_PASS_SECONDS = 0.05       # inner loops repeat a pass until it takes at least this long
+REGRESSION_THRESHOLD = 0.10   # compare: flag cases whose median got >10% slower
+LONG_TEXT_SIZES = (5_000, 50_000)
+
+# ========== GROQ STUB ==========
+
+
+class _StubCompletions:
+    """Answers every chat.completions.create call with a fixed, schema-valid verdict (no network)."""
+
+    CONTENT = json.dumps({
+        "fake_percent": 50, "fake_probability": 50, "malicious_probability": 50,
+        "threat_type": "safe", "verdict": "uncertain", "reason": "benchmark stub",
+        "detected_issues": [], "confidence": "low",
+    })
+
+    def create(self, **kwargs):
+        message = types.SimpleNamespace(content=self.CONTENT)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+class StubGroq:
+    def __init__(self, *args, **kwargs):
+        self.chat = types.SimpleNamespace(completions=_StubCompletions())
+
+
+def stub_groq():
+    """Replace groq.Groq before any scorer module imports it; works without the groq package too."""
+    try:
+        import groq
+    except ImportError:
+        groq = types.ModuleType("groq")
+        sys.modules["groq"] = groq
+    groq.Groq = StubGroq
+    os.environ.setdefault("GROQ_API_KEY", "benchmark-stub")
+
+
+# ========== INPUTS ==========
+
+
+def load_inputs():
+    """Realistic inputs from the committed CSVs plus synthetic long texts"""
+    tweets = pd.read_csv(TWEETS_CSV)["text"].fillna("").astype(str).tolist()
+    url_df = pd.read_csv(URLS_CSV)
+    urls = url_df["url"].fillna("").astype(str).tolist()
+
+    prof_df = pd.read_csv(PROFILES_CSV)
+    prof_df = prof_df.fillna({c: "" for c in ("username", "display_name", "bio", "url")})
+    # Raw rows use the extension's key names (followers/following/tweets)
+    profiles = prof_df.to_dict("records")
+
+    joined = " ".join(tweets)
+    long_texts = {size: (joined * (size // max(len(joined), 1) + 1))[:size] for size in LONG_TEXT_SIZES}
+    return {"tweets": tweets, "urls": urls, "profiles": profiles, "long_texts": long_texts}
+
+
+def build_cases(inputs):
+    """name -> (callable taking one input, list of inputs)"""
+    sys.path.insert(0, BASE_DIR)
+    sys.path.insert(0, ML_MODEL_DIR)
+
+    from app import FakeNewsDetector, analyze_complete_payload, analyze_url_payload
+    from groq_llm_with_regex_percentage import compute_regex_percent
+    from profile_regex_scoring import compute_profile_regex_score
+    import url_classifier
+    import profile_classifier
+    import text_features
+
+    detector = FakeNewsDetector()
+    tweets, urls, profiles = inputs["tweets"], inputs["urls"], inputs["profiles"]
+
+    cases = {
+        "extract_text_features[tweets]": (detector.extract_text_features, tweets),
+        "extract_url_features[urls]": (detector.extract_url_features, urls),
+        "extract_profile_features[profiles]": (detector.extract_profile_features, profiles),
+        "compute_regex_percent[tweets]": (compute_regex_percent, tweets),
+        "compute_profile_regex_score[profiles]": (
+            lambda p: compute_profile_regex_score(p["username"], p["display_name"], p["bio"], p["url"]), profiles),
+        "url_classifier.check_regex_patterns[urls]": (url_classifier.check_regex_patterns, urls),
+        "profile_classifier.check_regex_patterns[profiles]": (profile_classifier.check_regex_patterns, profiles),
+    }
+    # Whole endpoint bodies, lean default vs ?detail=full (fields=None)
+    requests = [{"text": t, "urls": urls[i % len(urls):i % len(urls) + 2], "profile": profiles[i % len(profiles)]}
+                for i, t in enumerate(tweets)]
+    url_batch = {"urls": urls[:100]}
+    for mode, fields in (("lean", frozenset()), ("full", None)):
+        cases[f"analyze_complete_payload[{mode}]"] = (
+            lambda body, fields=fields: analyze_complete_payload(detector, body, fields), requests)
+        cases[f"analyze_url_payload[batch_100,{mode}]"] = (
+            lambda body, fields=fields: analyze_url_payload(detector, body, fields), [url_batch])
+    # Batch text scoring: feature matrix + vectorized rules vs one text at a time
+    text_batch = (tweets * (1000 // len(tweets) + 1))[:1000]
+    cases["text_feature_matrix[batch_1000]"] = (text_features.text_feature_matrix, [text_batch])
+    cases["rule_scores[batch_1000]"] = (text_features.rule_scores, [text_features.text_feature_matrix(text_batch)])
+    cases["extract_text_features+rule_score[batch_1000]"] = (
+        lambda batch: [text_features.rule_score(text_features.extract_text_features(t)) for t in batch], [text_batch])
+    for size, text in inputs["long_texts"].items():
+        cases[f"extract_text_features[long_{size // 1000}k]"] = (detector.extract_text_features, [text])
+        cases[f"compute_regex_percent[long_{size // 1000}k]"] = (compute_regex_percent, [text])
+    return cases
+
+
+# ========== RUNNER ==========
+
+
+def time_case(fn, items, repeat=REPEAT):
+    """
+    Time fn over every item. Each timed pass loops over all items (several
+    times if needed to reach MIN_PASS_SECONDS) and yields a per-call average.
+
+    Returns:
+        dict: per-call microseconds (min/median/mean/max over passes), calls per pass
+    """
+    for item in items:  # warm-up: regex compile caches, lazy imports
+        fn(item)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in items:
+                fn(item)
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_PASS_SECONDS or loops >= 1 << 16:
+            break
+        loops *= 2
+
+    calls = loops * len(items)
+    per_call = [elapsed / calls]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for item in items:
+                fn(item)
+        per_call.append((time.perf_counter() - start) / calls)
+
+    us = [t * 1e6 for t in per_call]
+    return {
+        "per_call_us": {
+            "min": round(min(us), 3),
+            "median": round(statistics.median(us), 3),
+            "mean": round(statistics.mean(us), 3),
+            "max": round(max(us), 3),
+        },
+        "calls_per_pass": calls,
+        "inputs": len(items),
+        "calls_per_second": round(1e6 / statistics.median(us), 1),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def run(output=DEFAULT_OUTPUT, repeat=REPEAT, name_filter=None):
+    stub_groq()
+    cases = build_cases(load_inputs())
+    results = {}
+    for name, (fn, items) in cases.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = time_case(fn, items, repeat)
+        r = results[name]["per_call_us"]
+        print(f"{name:55s} median {r['median']:>11.2f} µs   min {r['min']:>11.2f} µs")
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def compare(baseline_path, current_path, threshold=REGRESSION_THRESHOLD, stat="median"):
+    """
+    Compare per-call time of two runs (median by default; min is steadier on a noisy host).
+
+    Returns:
+        list[str]: names of cases slower than baseline by more than threshold
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(current_path, encoding="utf-8") as f:
+        current = json.load(f)["results"]
+
+    regressions = []
+    print(f"{'case':55s} {'base µs':>11s} {'new µs':>11s} {'change':>8s}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:55s} {'(only in ' + ('baseline' if name in baseline else 'current') + ')':>32s}")
+            continue
+        old = baseline[name]["per_call_us"][stat]
+        new = current[name]["per_call_us"][stat]
+        change = (new - old) / old if old else 0.0
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        print(f"{name:55s} {old:>11.2f} {new:>11.2f} {change:>+7.1%}{mark}")
+
+    if regressions:
+        print(f"[FAIL] {len(regressions)} case(s) slower by more than {threshold:.0%}")
+    else:
+        print(f"[OK] No regressions beyond {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the scoring hot paths (Groq stubbed, offline)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--stat", choices=["median", "min", "mean"], default="median",
+                        help="per-call statistic compared by --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(args.compare[0], args.compare[1], args.threshold, args.stat)
+        sys.exit(1 if regressions else 0)
+    run(args.output, args.repeat, args.filter)
+
+
+if __name__ == "__main__":
+    main()
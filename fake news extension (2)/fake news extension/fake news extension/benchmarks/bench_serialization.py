@@ -0,0 +1,111 @@
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import platform
+
+from bench_hot_paths import BASE_DIR, ML_MODEL_DIR, REPEAT, time_case, load_inputs, stub_groq, _git_commit
+
+# ============ CONFIG ============
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "serialization.json")
+BATCH_SIZES = (100, 1000)
+
+# ========== PAYLOADS ==========
+
+
+def build_payloads(inputs):
+    """Real response bodies, built by the same payload functions the endpoints use"""
+    sys.path.insert(0, BASE_DIR)
+    sys.path.insert(0, ML_MODEL_DIR)
+
+    from app import FakeNewsDetector, analyze_complete_payload, analyze_url_payload, classify_all_response
+    import url_classifier
+
+    detector = FakeNewsDetector()
+    tweets, urls, profiles = inputs["tweets"], inputs["urls"], inputs["profiles"]
+
+    def url_llm_result(url):
+        # classify_url's shape without the network call
+        features, regex_score, tags, red_flags, _ = url_classifier.score_url_signals(url, cascade=False)
+        return url_classifier.build_url_result(url, features, regex_score, tags, red_flags, 72, "phishing",
+                                               "Login form on a look-alike domain.")
+
+    payloads = {
+        "analyze-complete": analyze_complete_payload(
+            detector, {"text": tweets[0], "urls": urls[:2], "profile": profiles[0]})[0],
+        "classify-all": classify_all_response(
+            urls[:2], {"score": 63.0, "flags": []}, {"score": 41.5},
+            [{"score": 72, "meta": url_llm_result(u)} for u in urls[:2]], None),
+    }
+    for size in BATCH_SIZES:
+        batch = (urls * (size // len(urls) + 1))[:size]
+        payloads[f"analyze-url[batch_{size}]"] = analyze_url_payload(detector, {"urls": batch})[0]
+        payloads[f"url_llm_results[batch_{size}]"] = {"success": True, "analyses": [url_llm_result(u) for u in batch]}
+    return payloads
+
+
+def encoders():
+    """name -> encode(payload) -> bytes, for every serializer available here"""
+    import serializers
+
+    found = {"json_stdlib": serializers.dumps_json_stdlib}
+    if serializers.dumps_json_orjson:
+        found["json_orjson"] = serializers.dumps_json_orjson
+    if serializers.dumps_msgpack:
+        found["msgpack"] = serializers.dumps_msgpack
+    return found
+
+
+# ========== RUNNER ==========
+
+
+def run(output=DEFAULT_OUTPUT, repeat=REPEAT):
+    stub_groq()
+    payloads = build_payloads(load_inputs())
+    results = {}
+    for payload_name, payload in payloads.items():
+        baseline = None
+        for encoder_name, encode in encoders().items():
+            body = encode(payload)
+            timing = time_case(encode, [payload], repeat)
+            median = timing["per_call_us"]["median"]
+            baseline = baseline or median
+            results[f"{encoder_name}[{payload_name}]"] = dict(
+                timing, bytes=len(body), gzip_bytes=len(gzip.compress(body, 6)),
+                speedup_vs_stdlib=round(baseline / median, 2))
+            print(f"{payload_name:28s} {encoder_name:12s} median {median:>10.2f} µs  "
+                  f"{len(body):>9d} B  gzip {results[f'{encoder_name}[{payload_name}]']['gzip_bytes']:>8d} B  "
+                  f"x{baseline / median:.1f}")
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encode time and payload size of response serializers (stdlib JSON, orjson, MessagePack)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args()
+    # Results use the same layout as bench_hot_paths.py, so its --compare works on them
+    run(args.output, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+
+import numpy as np
+import pandas as pd
+
+from bench_hot_paths import BASE_DIR, ML_MODEL_DIR, _git_commit
+
+# ============ CONFIG ============
+
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, "benchmarks", "results", "url_batch.json")
+URL_DATASET = os.path.join(BASE_DIR, "fake_url_dataset.csv")
+N_URLS = 1_000_000
+SCALAR_N = 50_000       # the scalar path is timed on a sample and reported per URL
+REPEAT = 3
+SEED = 42
+
+# ========== INPUTS ==========
+
+
+def synthetic_urls(n=N_URLS, seed=SEED):
+    """n distinct URLs: dataset URLs with a random ?id=N query or /pN path suffix"""
+    base = pd.read_csv(URL_DATASET)["url"].astype(str).to_numpy()
+    rng = np.random.default_rng(seed)
+    picks = base[rng.integers(0, len(base), n)]
+    ids = rng.integers(0, 10_000_000, n)
+    as_query = rng.random(n) < 0.5
+    return [
+        f"{u}{'&' if '?' in u else '?'}id={i}" if q else f"{u.rstrip('/')}/p{i}"
+        for u, i, q in zip(picks.tolist(), ids.tolist(), as_query.tolist())
+    ]
+
+
+# ========== RUNNER ==========
+
+
+def time_once(fn, items, repeat):
+    """Per-URL microseconds of fn(items) over repeat whole-list passes"""
+    per_url = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        per_url.append((time.perf_counter() - start) / len(items) * 1e6)
+    return {
+        "per_call_us": {
+            "min": round(min(per_url), 3),
+            "median": round(statistics.median(per_url), 3),
+            "mean": round(statistics.mean(per_url), 3),
+            "max": round(max(per_url), 3),
+        },
+        "calls_per_pass": len(items),
+    }
+
+
+def run(output=DEFAULT_OUTPUT, n=N_URLS, scalar_n=SCALAR_N, repeat=REPEAT):
+    sys.path.insert(0, ML_MODEL_DIR)
+    from url_batch import url_signals_batch
+    from url_classifier import extract_url_features, check_regex_patterns, check_url_red_flags
+
+    urls = synthetic_urls(n)
+    sample = urls[:scalar_n]
+
+    def scalar(items):
+        for u in items:
+            f = extract_url_features(u)
+            check_regex_patterns(u)
+            check_url_red_flags(u, f)
+
+    cases = {
+        f"scalar[sample_{len(sample)}]": (scalar, sample),
+        f"url_signals_batch[{n}]": (url_signals_batch, urls),
+        f"url_signals_batch[{n},strings=False]": (lambda items: url_signals_batch(items, strings=False), urls),
+    }
+    results = {}
+    scalar_us = None
+    for name, (fn, items) in cases.items():
+        timing = time_once(fn, items, repeat)
+        median = timing["per_call_us"]["median"]
+        scalar_us = scalar_us or median
+        results[name] = dict(timing, projected_seconds_per_1m=round(median, 2),
+                             speedup_vs_scalar=round(scalar_us / median, 2))
+        print(f"{name:44s} median {median:>8.2f} µs/url  ~{median:>6.1f} s per 1M  x{scalar_us / median:.1f}")
+
+    report = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "n_urls": n,
+            "scalar_sample": len(sample),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[DONE] Saved: {output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Vectorized url_signals_batch vs the per-URL scalar functions on a large synthetic URL list")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the JSON results")
+    parser.add_argument("--n", type=int, default=N_URLS, help="URLs in the batch")
+    parser.add_argument("--scalar-n", type=int, default=SCALAR_N, help="URLs the scalar path is timed on")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args()
+    # Results use the same layout as bench_hot_paths.py, so its --compare works on them
+    run(args.output, args.n, args.scalar_n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import multiprocessing
+
+# ========== GUNICORN (production serving) ==========
+#
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Every setting can be overridden from the environment (shown next to it).
+# Requests spend most of their time waiting on Groq, so each worker process
+# runs several threads; add processes for CPU-bound local scoring.
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# Load app + models once in the master, then fork: workers share them copy-on-write
+preload_app = True
+
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count())
+worker_class = "gthread"
+threads = _env_int("GUNICORN_THREADS", 8)
+
+# Keep-alive for the extension / load balancer connections
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# An LLM + VLM request can take several seconds; kill only truly stuck workers
+timeout = _env_int("GUNICORN_TIMEOUT", 120)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# Recycle workers periodically (bounded memory growth); jitter avoids restarting all at once
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 5000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 500)
+
+# Heartbeat files on tmpfs instead of disk
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")  # e.g. "-" for stdout
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Threads started in the master don't exist in the forked worker
+    import app
+
+    app.start_reload_watcher()
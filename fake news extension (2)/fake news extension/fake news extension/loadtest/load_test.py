@@ -0,0 +1,434 @@
+import os
+import sys
+import ast
+import json
+import time
+import queue
+import base64
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from io import BytesIO
+from urllib.parse import urlparse
+import pandas as pd
+
+# ============ CONFIG ============
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TWEETS_CSV = os.path.join(BASE_DIR, "tweets_extracted.csv")
+PROFILES_CSV = os.path.join(BASE_DIR, "fake_profile_dataset.csv")
+URLS_CSV = os.path.join(BASE_DIR, "fake_url_dataset.csv")
+RUNS_DIR = os.path.join(BASE_DIR, "loadtest", "runs")
+
+DEFAULT_TARGET = "http://127.0.0.1:5000"
+ENDPOINTS = {
+    "classify-all": "/api/classify-all",
+    "analyze-complete": "/analyze-complete",
+}
+REQUEST_TIMEOUT = 60.0
+
+# ========== PAYLOADS ==========
+
+
+def _as_list(value):
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            return [str(v) for v in ast.literal_eval(value)]
+        except (ValueError, SyntaxError):
+            return []
+    return []
+
+
+def _tiny_jpeg_b64():
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("RGB", (64, 64), (200, 30, 30)).save(buf, "JPEG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def build_payloads(n=500, seed=0, image_fraction=0.0):
+    """
+    Request bodies built from the committed CSVs: tweet text + its own links,
+    one or two URLs from fake_url_dataset.csv and a profile (the tweet's author
+    or a row of fake_profile_dataset.csv).
+
+    Returns:
+        list[dict]: {"classify-all": body, "analyze-complete": body}
+    """
+    rng = random.Random(seed)
+    tweets = pd.read_csv(TWEETS_CSV)
+    profiles = pd.read_csv(PROFILES_CSV)
+    profiles = profiles.fillna({c: "" for c in ("username", "display_name", "bio", "url")})
+    profile_rows = profiles.to_dict("records")
+    url_pool = pd.read_csv(URLS_CSV)["url"].dropna().astype(str).tolist()
+    image_b64 = _tiny_jpeg_b64() if image_fraction > 0 else None
+
+    payloads = []
+    tweet_rows = tweets.to_dict("records")
+    for i in range(n):
+        t = tweet_rows[i % len(tweet_rows)]
+        urls = _as_list(t.get("urls")) + rng.sample(url_pool, rng.randint(1, 2))
+        if rng.random() < 0.5:
+            p = rng.choice(profile_rows)
+            profile = {k: p[k] for k in ("username", "display_name", "bio", "url", "followers", "following",
+                                         "tweets", "account_age_days", "has_profile_image", "has_banner",
+                                         "verified")}
+        else:
+            profile = {
+                "username": str(t.get("username", "")),
+                "display_name": str(t.get("display_name", "")),
+                "followers": int(t.get("followers_count", 0) or 0),
+                "following": int(t.get("following_count", 0) or 0),
+            }
+        text = str(t.get("text", ""))
+        image = image_b64 if image_b64 and rng.random() < image_fraction else None
+
+        payloads.append({
+            "classify-all": {"tweet_text": text, "profile": profile, "urls": urls, "image_base64": image},
+            "analyze-complete": {"text": text, "urls": urls, "profile": profile},
+        })
+    return payloads
+
+
+# ========== CPU ACCOUNTING (requests per core) ==========
+
+
+def _children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+                if int(fields[1]) == pid:
+                    kids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+    return kids
+
+
+def process_cpu_seconds(pid):
+    """utime+stime of a process and its children (pre-forked workers); 0.0 off Linux"""
+    total = 0.0
+    tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    for p in [pid] + _children(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / tick
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+# ========== LOAD GENERATOR ==========
+
+
+class _Worker(threading.Thread):
+    """Sends requests over one keep-alive connection; records (endpoint, latency, status, error)."""
+
+    def __init__(self, target, jobs, results):
+        super().__init__(daemon=True)
+        parsed = urlparse(target)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.jobs = jobs
+        self.results = results
+        self.conn = None
+
+    def _send(self, path, body):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+        try:
+            self.conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            resp = self.conn.getresponse()
+            resp.read()
+            return resp.status
+        except Exception:
+            self.conn.close()
+            self.conn = None
+            raise
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                if self.conn is not None:
+                    self.conn.close()
+                return
+            endpoint, body, scheduled = job
+            now = time.perf_counter()
+            if scheduled is not None and scheduled > now:
+                time.sleep(scheduled - now)
+            # Open loop measures from the scheduled send time, so queueing behind a
+            # saturated server shows up in the latency (no coordinated omission)
+            start = scheduled if scheduled is not None else time.perf_counter()
+            status, error = None, None
+            try:
+                status = self._send(ENDPOINTS[endpoint], body)
+            except Exception as e:
+                error = type(e).__name__
+            self.results.append((endpoint, time.perf_counter() - start, status, error))
+
+
+def run_load(target, payloads, endpoints, duration, rps=None, concurrency=8, seed=0, server_pid=None):
+    """
+    Drive the server for `duration` seconds.
+
+    rps set   -> open loop: arrivals on a fixed schedule, `concurrency` is the worker pool size
+    rps None  -> closed loop: `concurrency` workers send back-to-back
+    """
+    rng = random.Random(seed)
+    bodies = [{ep: json.dumps(p[ep]).encode("utf-8") for ep in endpoints} for p in payloads]
+    jobs = queue.Queue(maxsize=0 if rps else concurrency * 2)
+    results = []
+    workers = [_Worker(target, jobs, results) for _ in range(concurrency)]
+    for w in workers:
+        w.start()
+
+    cpu_before = process_cpu_seconds(server_pid) if server_pid else None
+    start = time.perf_counter()
+    i = 0
+    while True:
+        if rps:
+            scheduled = start + i / rps
+            if scheduled - start >= duration:
+                break
+            # keep the queue a little ahead of the schedule
+            while scheduled - time.perf_counter() > 0.05:
+                time.sleep(0.01)
+        else:
+            scheduled = None
+            if time.perf_counter() - start >= duration:
+                break
+        endpoint = endpoints[rng.randrange(len(endpoints))]
+        jobs.put((endpoint, bodies[i % len(bodies)][endpoint], scheduled))
+        i += 1
+
+    for _ in workers:
+        jobs.put(None)
+    for w in workers:
+        w.join()
+    wall = time.perf_counter() - start
+    cpu = process_cpu_seconds(server_pid) - cpu_before if server_pid else None
+    return summarize(results, wall, rps, concurrency, cpu)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def summarize(results, wall, rps, concurrency, server_cpu_seconds=None):
+    report = {"wall_seconds": round(wall, 3), "target_rps": rps, "concurrency": concurrency, "endpoints": {}}
+    for endpoint in sorted({r[0] for r in results}):
+        rows = [r for r in results if r[0] == endpoint]
+        ok = sorted(r[1] for r in rows if r[2] is not None and 200 <= r[2] < 300)
+        errors = {}
+        for _, _, status, error in rows:
+            if error or not (200 <= (status or 0) < 300):
+                key = error or f"http_{status}"
+                errors[key] = errors.get(key, 0) + 1
+        report["endpoints"][endpoint] = {
+            "requests": len(rows),
+            "throughput_rps": round(len(rows) / wall, 2) if wall else 0.0,
+            "error_rate": round(sum(errors.values()) / len(rows), 4) if rows else 0.0,
+            "errors": errors,
+            "latency_ms": {
+                "p50": _ms(_percentile(ok, 0.50)),
+                "p95": _ms(_percentile(ok, 0.95)),
+                "p99": _ms(_percentile(ok, 0.99)),
+                "max": _ms(ok[-1] if ok else None),
+                "mean": _ms(sum(ok) / len(ok) if ok else None),
+            },
+        }
+    total = len(results)
+    report["total_requests"] = total
+    report["throughput_rps"] = round(total / wall, 2) if wall else 0.0
+    if server_cpu_seconds is not None:
+        report["server_cpu_seconds"] = round(server_cpu_seconds, 3)
+        report["requests_per_cpu_second"] = round(total / server_cpu_seconds, 2) if server_cpu_seconds else None
+    return report
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def print_report(report, label=""):
+    load = f"{report['target_rps']} rps target" if report["target_rps"] else f"{report['concurrency']} concurrent"
+    print(f"\n== {label or 'run'}: {load}, {report['wall_seconds']}s, "
+          f"{report['throughput_rps']} req/s achieved ==")
+    if report.get("requests_per_cpu_second") is not None:
+        print(f"   server CPU {report['server_cpu_seconds']}s → {report['requests_per_cpu_second']} req per CPU-second")
+    print(f"   {'endpoint':18s} {'reqs':>6s} {'rps':>8s} {'err%':>6s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'max':>9s}")
+    for ep, r in report["endpoints"].items():
+        lat = r["latency_ms"]
+        cells = [f"{lat[k]:>9.1f}" if lat[k] is not None else f"{'-':>9s}" for k in ("p50", "p95", "p99", "max")]
+        print(f"   {ep:18s} {r['requests']:>6d} {r['throughput_rps']:>8.1f} {r['error_rate'] * 100:>5.1f}% {' '.join(cells)}")
+        if r["errors"]:
+            print(f"   {'':18s} errors: {r['errors']}")
+
+
+# ========== SAVED RUNS ==========
+
+
+def save_run(run, name):
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    path = os.path.join(RUNS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}_{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    print(f"[DONE] Saved: {path}")
+    return path
+
+
+def compare_runs(path_a, path_b):
+    """Side-by-side p50/p95/p99, throughput and error rate per step and endpoint"""
+    with open(path_a, encoding="utf-8") as f:
+        a = json.load(f)
+    with open(path_b, encoding="utf-8") as f:
+        b = json.load(f)
+
+    print(f"A: {path_a}\nB: {path_b}")
+    for step_a, step_b in zip(a["steps"], b["steps"]):
+        load = step_a["target_rps"] or f"c{step_a['concurrency']}"
+        for ep in sorted(set(step_a["endpoints"]) & set(step_b["endpoints"])):
+            ra, rb = step_a["endpoints"][ep], step_b["endpoints"][ep]
+            print(f"[{load}] {ep}")
+            for key in ("p50", "p95", "p99"):
+                va, vb = ra["latency_ms"][key], rb["latency_ms"][key]
+                change = f"{(vb - va) / va:+.1%}" if va and vb is not None else "n/a"
+                print(f"    {key:4s} {va!s:>10} → {vb!s:>10} ms  {change}")
+            print(f"    rps  {ra['throughput_rps']:>10} → {rb['throughput_rps']:>10}")
+            print(f"    err  {ra['error_rate']:>10.2%} → {rb['error_rate']:>10.2%}")
+
+
+# ========== LOCAL SERVER + MOCK ==========
+
+
+def start_local_stack(port, mock_config=None, env=None, serve="dev"):
+    """
+    Start the mock Groq server in-process and the app in a subprocess pointed at it.
+    serve="dev" runs Flask's development server, "gunicorn" the production config,
+    "asgi" the async variant (asgi_app.py) under uvicorn.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from mock_groq_server import start_mock_server
+
+    mock, mock_url = start_mock_server(mock_config)
+    child_env = dict(os.environ, GROQ_BASE_URL=mock_url, GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "mock"))
+    child_env.update(env or {})
+    if serve == "gunicorn":
+        child_env["BIND"] = f"127.0.0.1:{port}"
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]
+    elif serve == "asgi":
+        cmd = [sys.executable, "-m", "uvicorn", "asgi_app:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--backlog", "4096"]
+    else:
+        cmd = [sys.executable, "-c", f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=child_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    else:
+        proc.kill()
+        raise RuntimeError("app did not come up on port %d" % port)
+    return proc, mock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/classify-all and /analyze-complete")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="base URL of a running server")
+    parser.add_argument("--endpoints", default="classify-all,analyze-complete",
+                        help=f"comma-separated mix of {', '.join(ENDPOINTS)}")
+    parser.add_argument("--rps", default=None,
+                        help="open-loop target rate; a comma list (e.g. 5,10,20,40) runs steps to find saturation")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="closed-loop workers (or worker pool size with --rps)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--payloads", type=int, default=500)
+    parser.add_argument("--image-fraction", type=float, default=0.0, help="share of classify-all bodies with an image")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--server-pid", type=int, help="measure server CPU (process + children) for req/CPU-second")
+    parser.add_argument("--local", action="store_true",
+                        help="start the mock Groq server and app.py locally and test against them")
+    parser.add_argument("--port", type=int, default=5055, help="app port with --local")
+    parser.add_argument("--serve", choices=["dev", "gunicorn", "asgi"], default="dev",
+                        help="server started by --local (gunicorn uses gunicorn.conf.py + WEB_CONCURRENCY/GUNICORN_THREADS, "
+                             "asgi runs asgi_app.py under uvicorn)")
+    parser.add_argument("--mock-latency", default="lognormal:250,0.5", help="mock text latency with --local")
+    parser.add_argument("--mock-image-latency", default="lognormal:1200,0.4")
+    parser.add_argument("--save", metavar="NAME", help="save the run under loadtest/runs/")
+    parser.add_argument("--compare", nargs=2, metavar=("RUN_A", "RUN_B"), help="compare two saved runs")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_runs(*args.compare)
+        return
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    for e in endpoints:
+        if e not in ENDPOINTS:
+            parser.error(f"unknown endpoint '{e}' (choose from {', '.join(ENDPOINTS)})")
+
+    proc = mock = None
+    target, server_pid = args.target, args.server_pid
+    if args.local:
+        proc, mock = start_local_stack(args.port, {"latency": args.mock_latency,
+                                                   "image_latency": args.mock_image_latency,
+                                                   "seed": args.seed}, serve=args.serve)
+        target, server_pid = f"http://127.0.0.1:{args.port}", proc.pid
+
+    payloads = build_payloads(args.payloads, args.seed, args.image_fraction)
+    steps = [float(r) for r in args.rps.split(",")] if args.rps else [None]
+    run = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "target": target,
+        "endpoints": endpoints,
+        "duration": args.duration,
+        "local_mock": bool(args.local),
+        "serve": args.serve if args.local else None,
+        "cpu_count": os.cpu_count(),
+        "steps": [],
+    }
+    try:
+        for rps in steps:
+            report = run_load(target, payloads, endpoints, args.duration, rps, args.concurrency,
+                              args.seed, server_pid)
+            run["steps"].append(report)
+            print_report(report, f"step {len(run['steps'])}")
+            if mock is not None:
+                run["steps"][-1]["mock_groq"] = mock.state.snapshot()
+                mock.state.reset()
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if mock is not None:
+            mock.shutdown()
+
+    if len(steps) > 1:
+        print("\nSaturation: target → achieved rps, p99 ms")
+        for r in run["steps"]:
+            p99 = max((e["latency_ms"]["p99"] or 0) for e in r["endpoints"].values()) if r["endpoints"] else 0
+            print(f"   {r['target_rps']:>7} → {r['throughput_rps']:>7}   p99 {p99}")
+    if args.save:
+        save_run(run, args.save)
+
+
+if __name__ == "__main__":
+    main()
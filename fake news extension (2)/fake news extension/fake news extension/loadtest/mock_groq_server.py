@@ -0,0 +1,325 @@
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ========== MOCK GROQ (OpenAI-compatible chat completions) ==========
+#
+# A local stand-in for api.groq.com. Point the client at it with its base URL:
+#
+#     GROQ_BASE_URL=http://127.0.0.1:8001 python app.py
+#
+# groq.Groq(...) reads GROQ_BASE_URL and posts to /openai/v1/chat/completions.
+# Verdicts are schema-valid JSON for the tweet, profile, URL and image prompts,
+# deterministic per prompt, with configurable latency, error injection and
+# token usage. Note the groq client retries 429/5xx itself (max_retries=2 by
+# default), so one app-level call may show up as several requests here.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8001
+CHAT_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions")
+
+DEFAULT_CONFIG = {
+    "latency": "lognormal:250,0.5",       # text prompts
+    "image_latency": "lognormal:1200,0.4",  # VLM prompts
+    "error_latency": "fixed:5",
+    "rate_429": 0.0,
+    "rate_5xx": 0.0,
+    "rate_malformed": 0.0,
+    "rate_fenced": 0.0,                   # wrap the JSON in ```json fences (valid, but needs stripping)
+    "retry_after": 1,
+    "chars_per_token": 4.0,
+    "tokens_per_second": 0.0,             # > 0 adds completion_tokens / tps to the latency
+    "image_tokens": 1200,                 # prompt tokens charged per image
+    "seed": 0,
+}
+
+# ========== LATENCY DISTRIBUTIONS ==========
+
+
+def parse_latency(spec):
+    """
+    Parse a latency spec (milliseconds) into a sampler taking a random.Random.
+
+        fixed:MS | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA | exp:MEAN
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    try:
+        if kind == "fixed":
+            (ms,) = values
+            return lambda rng: ms
+        if kind == "uniform":
+            lo, hi = values
+            return lambda rng: rng.uniform(lo, hi)
+        if kind == "normal":
+            mean, sd = values
+            return lambda rng: max(0.0, rng.gauss(mean, sd))
+        if kind == "lognormal":
+            median, sigma = values
+            return lambda rng: rng.lognormvariate(math.log(median), sigma)
+        if kind == "exp":
+            (mean,) = values
+            return lambda rng: rng.expovariate(1.0 / mean)
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency spec '{spec}' (fixed:MS, uniform:LO,HI, normal:MEAN,SD, "
+                     f"lognormal:MEDIAN,SIGMA, exp:MEAN)")
+
+
+# ========== PROMPT DETECTION / VERDICTS ==========
+
+_REGEX_HINT = re.compile(r'(?:REGEX SCORE:\s*|"(?:profile_)?regex_fake_percent":\s*)([\d.]+)')
+
+
+def _prompt_text(messages):
+    parts, has_image = [], False
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    has_image = True
+                elif part.get("type") == "text":
+                    parts.append(part.get("text", ""))
+        elif content:
+            parts.append(str(content))
+    return "\n".join(parts), has_image
+
+
+def detect_kind(messages):
+    """'image' | 'url' | 'profile' | 'tweet' from the prompt the scorer sent"""
+    text, has_image = _prompt_text(messages)
+    if has_image:
+        return "image", text
+    if "malicious_probability" in text:
+        return "url", text
+    if "fake_probability" in text or "social media profiles" in text or '"username"' in text:
+        return "profile", text
+    return "tweet", text
+
+
+def verdict_for(kind, text):
+    """Deterministic, schema-valid verdict: same prompt -> same answer; leans on the regex hint when present."""
+    digest = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+    score = digest % 101
+    hint = _REGEX_HINT.search(text)
+    if hint:
+        score = round(0.6 * min(float(hint.group(1)), 100.0) + 0.4 * score)
+
+    if kind == "url":
+        threat = "safe" if score < 40 else ("phishing", "scam", "malware", "spam")[digest % 4]
+        return {"malicious_probability": score, "threat_type": threat, "reason": "Mock verdict for load testing."}
+    if kind == "image":
+        verdict = "likely_real" if score < 40 else "uncertain" if score < 70 else "manipulated"
+        return {
+            "fake_probability": score, "verdict": verdict, "reason": "Mock VLM verdict for load testing.",
+            "detected_issues": [] if score < 40 else ["mock_issue"], "confidence": "medium",
+        }
+    if kind == "profile" and "fake_probability" in text:
+        return {"fake_probability": score, "reason": "Mock verdict for load testing."}
+    return {"fake_percent": score, "reason": "Mock verdict for load testing."}
+
+
+# ========== SERVER ==========
+
+
+class MockGroqState:
+    """Config, RNG and counters shared by all handler threads"""
+
+    def __init__(self, config=None):
+        self.config = dict(DEFAULT_CONFIG, **(config or {}))
+        self.rng = random.Random(self.config["seed"])
+        self.latency = parse_latency(self.config["latency"])
+        self.image_latency = parse_latency(self.config["image_latency"])
+        self.error_latency = parse_latency(self.config["error_latency"])
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {"requests": 0, "by_kind": {}, "by_outcome": {}, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def draw(self):
+        """Pick this request's outcome; reproducible for a given seed and request order"""
+        with self.lock:
+            r = self.rng.random()
+        for outcome, key in (("rate_limited", "rate_429"), ("server_error", "rate_5xx"),
+                             ("malformed", "rate_malformed"), ("fenced", "rate_fenced")):
+            if r < self.config[key]:
+                return outcome
+            r -= self.config[key]
+        return "ok"
+
+    def sample(self, sampler):
+        with self.lock:
+            return sampler(self.rng) / 1000.0
+
+    def record(self, kind, outcome, prompt_tokens=0, completion_tokens=0):
+        with self.lock:
+            s = self.stats
+            s["requests"] += 1
+            s["by_kind"][kind] = s["by_kind"].get(kind, 0) + 1
+            s["by_outcome"][outcome] = s["by_outcome"].get(outcome, 0) + 1
+            s["prompt_tokens"] += prompt_tokens
+            s["completion_tokens"] += completion_tokens
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.stats))
+
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+    # Headers and body go out in two writes; with Nagle on, a keep-alive client's
+    # delayed ACK holds the body back ~40 ms, which no real API adds
+    disable_nagle_algorithm = True
+    server_version = "MockGroq/1.0"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.path == "/stats":
+            return self._send_json(200, state.snapshot())
+        if self.path.endswith("/models"):
+            return self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        return self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        state = self.server.state
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        if self.path == "/stats/reset":
+            state.reset()
+            return self._send_json(200, {"ok": True})
+        if self.path not in CHAT_PATHS:
+            return self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+        try:
+            request = json.loads(raw or b"{}")
+            messages = request.get("messages") or []
+        except ValueError:
+            return self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+
+        kind, text = detect_kind(messages)
+        outcome = state.draw()
+        cfg = state.config
+
+        if outcome == "rate_limited":
+            time.sleep(state.sample(state.error_latency))
+            state.record(kind, outcome)
+            return self._send_json(429, {"error": {
+                "message": "Rate limit reached (mock). Please try again later.",
+                "type": "tokens", "code": "rate_limit_exceeded"}},
+                {"Retry-After": str(cfg["retry_after"])})
+        if outcome == "server_error":
+            time.sleep(state.sample(state.error_latency))
+            state.record(kind, outcome)
+            return self._send_json(503, {"error": {"message": "Service Unavailable (mock)",
+                                                   "type": "internal_server_error"}})
+
+        verdict = json.dumps(verdict_for(kind, text))
+        if outcome == "malformed":
+            content = verdict[: max(1, len(verdict) // 2)]   # truncated JSON
+        elif outcome == "fenced":
+            content = f"```json\n{verdict}\n```"
+        else:
+            content = verdict
+
+        prompt_tokens = math.ceil(len(text) / cfg["chars_per_token"]) + (cfg["image_tokens"] if kind == "image" else 0)
+        completion_tokens = math.ceil(len(content) / cfg["chars_per_token"])
+        delay = state.sample(state.image_latency if kind == "image" else state.latency)
+        if cfg["tokens_per_second"] > 0:
+            delay += completion_tokens / cfg["tokens_per_second"]
+        time.sleep(delay)
+        state.record(kind, outcome, prompt_tokens, completion_tokens)
+
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{state.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "logprobs": None,
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "total_time": round(delay, 4),
+            },
+            "system_fingerprint": "mock",
+        })
+
+
+def start_mock_server(config=None, host=DEFAULT_HOST, port=0):
+    """
+    Start the mock in a background thread (port=0 picks a free port).
+
+    Returns:
+        (server, base_url)  -- call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), MockGroqHandler)
+    server.daemon_threads = True
+    server.state = MockGroqState(config)
+    threading.Thread(target=server.serve_forever, name="mock-groq", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Groq/OpenAI chat-completions stand-in for load testing")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default=DEFAULT_CONFIG["latency"],
+                        help="text prompt latency in ms: fixed:MS | uniform:LO,HI | normal:MEAN,SD | "
+                             "lognormal:MEDIAN,SIGMA | exp:MEAN")
+    parser.add_argument("--image-latency", default=DEFAULT_CONFIG["image_latency"], help="VLM prompt latency (ms)")
+    parser.add_argument("--error-latency", default=DEFAULT_CONFIG["error_latency"], help="latency of 429/5xx answers")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction answered with 429 + Retry-After")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="fraction answered with 503")
+    parser.add_argument("--rate-malformed", type=float, default=0.0, help="fraction with truncated JSON content")
+    parser.add_argument("--rate-fenced", type=float, default=0.0, help="fraction wrapped in ```json fences")
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_CONFIG["retry_after"])
+    parser.add_argument("--chars-per-token", type=float, default=DEFAULT_CONFIG["chars_per_token"])
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="generation speed; adds completion_tokens / tps to each latency")
+    parser.add_argument("--image-tokens", type=int, default=DEFAULT_CONFIG["image_tokens"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = {k: v for k, v in vars(args).items() if k in DEFAULT_CONFIG}
+    server = ThreadingHTTPServer((args.host, args.port), MockGroqHandler)
+    server.daemon_threads = True
+    server.state = MockGroqState(config)
+    print(f"Mock Groq listening on http://{args.host}:{args.port}")
+    print(f"  export GROQ_BASE_URL=http://{args.host}:{args.port}   (and any GROQ_API_KEY)")
+    print("  GET /stats for request / outcome / token counts, POST /stats/reset to clear")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[DONE] Mock Groq stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import sys
+import time
+import argparse
+import importlib
+
+import pandas as pd
+
+from url_canonical import url_cache_keys
+from verdict_cache import get_cache, text_key, cache_stats
+
+# ========== CACHE WARMING ==========
+#
+# The offline scripts already asked Groq about many tweets, profiles and URLs
+# and wrote the answers to CSV. Loading those answers into the verdict caches
+# at startup means the online path does not ask again. Rows are keyed exactly
+# like the online lookups (text_key, profile_cache_key, canonical URL), and
+# rows whose "verdict" is really an error or a fallback are skipped.
+#
+# Verdicts must come from the same model and prompt as the online scorer:
+# every file carries a source column (VERDICT_SOURCE of the scorer module that
+# produced them) and rows from any other source are rejected. Files written
+# before the source columns existed have none and are rejected too, unless
+# WARM_CACHE_ACCEPT_UNSOURCED=1 (or --accept-unsourced) vouches for them. URL verdicts only fill the exact-URL cache; whether a verdict may
+# cover a whole domain is decided by live lookups (url_classifier.store_verdict).
+
+# Output CSV layouts, recognized by their score column
+CSV_KINDS = {
+    "tweet": {"key": "text", "score": "groq_fake_percent", "reason": "groq_reason",
+              "source": "groq_source"},  # groq_llm_fake_news.py
+    "profile": {"key": "username", "score": "llm_profile_fake_percent", "reason": "llm_profile_reason",
+                "source": "llm_profile_source"},  # groq_llm_profile_percentage.py --live-prompt
+    "url": {"key": "url", "score": "malicious_probability", "reason": "reason",
+            "threat": "llm_threat_type", "source": "llm_url_source"},  # groq_url_scoring.py
+}
+
+# Load files without a source column as if their verdicts were current (opt-in, logged and counted)
+ACCEPT_UNSOURCED = os.environ.get("WARM_CACHE_ACCEPT_UNSOURCED", "0") == "1"
+
+# Scorer module whose VERDICT_SOURCE a kind's source column must match
+SOURCE_MODULES = {"tweet": "groq_llm_fake_news", "profile": "profile_classifier", "url": "url_classifier"}
+
+# Reasons that mean no LLM verdict was obtained ("Groq error: Error code: 401 - ...", fallbacks, cascade)
+ERROR_REASON_PREFIXES = (
+    "Groq error", "LLM error", "Empty or invalid text", "No reason provided",
+    "regex_fallback", "no_model_available", "Decided by regex cascade", "regex_cascade_",
+)
+
+# Profile columns that feed profile_cache_key / the behavioral checks, when the CSV has them
+PROFILE_COLUMNS = [
+    "username", "display_name", "bio", "url", "followers", "following", "tweets",
+    "followers_count", "following_count", "tweet_count", "account_age_days",
+    "has_profile_image", "has_banner", "verified",
+]
+
+
+def detect_kind(columns):
+    """"tweet" | "profile" | "url" for an output CSV header, or None"""
+    for kind, cols in CSV_KINDS.items():
+        if cols["key"] in columns and cols["score"] in columns and cols["reason"] in columns:
+            return kind
+    return None
+
+
+def _as_score(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def _valid_rows(df, kind):
+    """Rows holding a real LLM verdict, last occurrence per key, in file order"""
+    cols = CSV_KINDS[kind]
+    reason = df[cols["reason"]]
+    score = pd.to_numeric(df[cols["score"]], errors="coerce")
+    key = df[cols["key"]]
+    valid = (
+        reason.notna() & score.notna() & key.notna()
+        & ~reason.astype(str).str.startswith(ERROR_REASON_PREFIXES)
+        & (key.astype(str).str.strip() != "")
+    )
+    rows = df[valid].assign(**{cols["score"]: score[valid]})
+    return rows.drop_duplicates(subset=cols["key"], keep="last")
+
+
+def _source_rows(df, kind, accept_unsourced=False):
+    """
+    (rows from the live scorer's model and prompt, number rejected, number taken unchecked);
+    a file without a source column has none, unless accept_unsourced
+    """
+    source = CSV_KINDS[kind]["source"]
+    if source not in df.columns:
+        return (df, 0, len(df)) if accept_unsourced else (df.head(0), len(df), 0)
+    live = importlib.import_module(SOURCE_MODULES[kind]).VERDICT_SOURCE
+    matches = df[source] == live
+    return df[matches], int((~matches).sum()), 0
+
+
+def _tweet_items(rows):
+    cols = CSV_KINDS["tweet"]
+    return [
+        (text_key(text), (float(score), reason))
+        for text, score, reason in zip(rows[cols["key"]], rows[cols["score"]], rows[cols["reason"]].astype(str))
+    ]
+
+
+def _profile_items(rows):
+    profile_classifier = importlib.import_module("profile_classifier")
+    cols = CSV_KINDS["profile"]
+    present = [c for c in PROFILE_COLUMNS if c in rows.columns]
+    # A missing field is left out, so the scorer's default applies (as for groq_llm_profile_percentage.py)
+    records = [{k: v for k, v in record.items() if v is not None}
+               for record in rows[present].astype(object).where(rows[present].notna(), None).to_dict("records")]
+    items = []
+    for profile, score, reason in zip(records, rows[cols["score"]], rows[cols["reason"]].astype(str)):
+        username, fingerprint = profile_classifier.profile_cache_key(profile)
+        if username is None:
+            continue
+        # Same result the online path builds: regex + behavioral signals around the LLM verdict
+        _, regex_score, tags, flags, _ = profile_classifier.score_profile_signals(profile, cascade=False)
+        result = profile_classifier.build_profile_result(regex_score, tags, flags, _as_score(score), reason)
+        items.append((username, (fingerprint, result)))
+    return items
+
+
+def _url_items(rows):
+    cols = CSV_KINDS["url"]
+    if cols["threat"] in rows.columns:
+        threats = rows[cols["threat"]].fillna("unknown").astype(str).tolist()
+    else:
+        threats = ["unknown"] * len(rows)
+    return [
+        (url_cache_keys(url)[0], (_as_score(score), threat_type, reason))
+        for url, score, threat_type, reason
+        in zip(rows[cols["key"]], rows[cols["score"]], threats, rows[cols["reason"]].astype(str))
+    ]
+
+
+def warm_file(path, kind=None, accept_unsourced=None):
+    """
+    Load the LLM verdicts of one output CSV into the matching verdict cache.
+
+    Args:
+        accept_unsourced: load a file without a source column unchecked (default: ACCEPT_UNSOURCED)
+
+    Returns:
+        dict: file, kind, rows read, rows rejected (another model or prompt), rows taken
+              without a source check (unsourced), rows skipped (errors, fallbacks,
+              duplicates), entries loaded, seconds
+    """
+    accept_unsourced = ACCEPT_UNSOURCED if accept_unsourced is None else accept_unsourced
+    start = time.perf_counter()
+    header = pd.read_csv(path, nrows=0).columns
+    kind = kind or detect_kind(header)
+    if kind is None:
+        raise ValueError(f"{path}: not a tweet, profile or URL verdict CSV (columns: {list(header)})")
+
+    cols = CSV_KINDS[kind]
+    wanted = [cols["key"], cols["score"], cols["reason"]]
+    if kind == "profile":
+        wanted += [c for c in PROFILE_COLUMNS if c in header and c not in wanted]
+    elif kind == "url" and cols["threat"] in header:
+        wanted.append(cols["threat"])
+    text_cols = [cols["key"], cols["reason"]]
+    if cols["source"] in header:
+        wanted.append(cols["source"])
+        text_cols.append(cols["source"])
+    df = pd.read_csv(path, usecols=wanted, dtype={c: str for c in text_cols})
+    current, rejected, unsourced = _source_rows(df, kind, accept_unsourced)
+    if unsourced:
+        print(f"[CACHE] {path}: no {cols['source']} column; loading {unsourced} rows without a source check")
+    rows = _valid_rows(current, kind)
+    skipped = len(current) - len(rows)
+
+    cache_names = {"tweet": "tweet", "profile": "profile", "url": "url_exact"}
+    cache = get_cache(cache_names[kind])
+    # Only the newest maxsize rows can stay in the cache; don't build the rest
+    rows = rows.tail(max(cache.maxsize, 0)) if cache.enabled else rows.head(0)
+    build_items = {"tweet": _tweet_items, "profile": _profile_items, "url": _url_items}[kind]
+    loaded = cache.put_many(build_items(rows))
+
+    return {
+        "file": path,
+        "kind": kind,
+        "rows": len(df),
+        "rejected": rejected,
+        "unsourced": unsourced,
+        "skipped": skipped,
+        "loaded": loaded,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def warm_caches(paths, accept_unsourced=None):
+    """
+    warm_file for each path; a file that fails is reported, not raised: "error" is the
+    exception type, "detail" its message (may quote the file, so it is only printed here)
+    """
+    reports = []
+    for path in paths:
+        try:
+            report = warm_file(path, accept_unsourced=accept_unsourced)
+        except Exception as e:
+            report = {"file": path, "error": type(e).__name__, "detail": str(e)}
+        print(f"[CACHE] warm {report}")
+        reports.append(report)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load prior LLM verdicts from scored CSVs into the verdict caches")
+    parser.add_argument("files", nargs="+", help="tweet / profile / URL verdict CSVs (kind detected from columns)")
+    parser.add_argument("--server", help="warm a running API instead (POST /admin/warm-cache); "
+                                         "paths are then read by the server, inside its WARM_CACHE_DIR")
+    parser.add_argument("--accept-unsourced", action="store_true",
+                        help="load files without a source column unchecked (legacy verdicts; local runs only, "
+                             "the server follows its own WARM_CACHE_ACCEPT_UNSOURCED)")
+    parser.add_argument("--token", default=os.environ.get("ADMIN_TOKEN"), help="X-Admin-Token for --server")
+    args = parser.parse_args()
+
+    if args.server:
+        import requests
+
+        headers = {"X-Admin-Token": args.token} if args.token else {}
+        files = [os.path.abspath(f) for f in args.files]
+        response = requests.post(args.server.rstrip("/") + "/admin/warm-cache", json={"files": files},
+                                 headers=headers, timeout=600)
+        print(response.status_code, response.text)
+        sys.exit(0 if response.ok else 1)
+
+    # Local run: what the server would load, and how long it takes
+    reports = warm_caches(args.files, accept_unsourced=args.accept_unsourced or None)
+    for name, stats in cache_stats().items():
+        print(f"{name:12s} {stats['size']:>8d} entries")
+    print(f"[DONE] {sum(r.get('loaded', 0) for r in reports)} verdicts loaded")
+    if any("error" in r for r in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
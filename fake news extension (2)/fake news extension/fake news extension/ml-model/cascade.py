@@ -0,0 +1,259 @@
+import os
+import json
+import argparse
+import threading
+
+# ========== CASCADE CONFIG ==========
+
+# When enabled, a cheap regex/heuristic score that is decisive on its own is
+# returned immediately and only ambiguous items escalate to the Groq LLM.
+CASCADE_ENABLED = os.environ.get("CASCADE_MODE", "0").lower() in ("1", "true", "yes", "on")
+
+# Per-component thresholds on the cheap score (0-100).
+#   score <= low  (and no extra red flags)  -> decided as benign, no LLM call
+#   score >= high                           -> decided as fake/malicious, no LLM call
+#   anything in between                     -> escalate to the LLM
+# Scales differ per component: tweet regex percent is matched/32 categories,
+# URL regex score is matched/30 * 400 and profile regex score is matched/36 * 300.
+# "high_score" is the minimum probability reported for a decisive "high" item so
+# it lands in the component's FAKE/MALICIOUS band.
+DEFAULT_THRESHOLDS = {
+    "tweet": {"low": 0.0, "high": 9.0, "high_score": 75.0},
+    "url": {"low": 0.0, "high": 40.0, "high_score": 70.0},
+    "profile": {"low": 0.0, "high": 25.0, "high_score": 70.0},
+}
+
+
+def _load_thresholds():
+    """Defaults, optionally overridden by the CASCADE_THRESHOLDS env var (JSON)."""
+    thresholds = {k: dict(v) for k, v in DEFAULT_THRESHOLDS.items()}
+    raw = os.environ.get("CASCADE_THRESHOLDS")
+    if raw:
+        try:
+            for component, values in json.loads(raw).items():
+                thresholds.setdefault(component, {}).update(values)
+        except Exception as e:
+            print(f"[CASCADE] Ignoring invalid CASCADE_THRESHOLDS: {e}")
+    return thresholds
+
+
+CASCADE_THRESHOLDS = _load_thresholds()
+
+# ========== ESCALATION STATS ==========
+
+_stats_lock = threading.Lock()
+_stats = {c: {"decided_low": 0, "decided_high": 0, "escalated": 0} for c in DEFAULT_THRESHOLDS}
+
+
+def cascade_decision(component, cheap_score, flags=()):
+    """
+    Decide whether the cheap score settles the item on its own.
+
+    Args:
+        component (str): "tweet" | "url" | "profile"
+        cheap_score (float): regex/heuristic score (0-100)
+        flags (iterable): extra red flags; any flag blocks a "low" decision
+
+    Returns:
+        "low" | "high" | None (None means escalate to the LLM)
+    """
+    limits = CASCADE_THRESHOLDS.get(component)
+    if limits is None:
+        return None
+
+    if cheap_score >= limits.get("high", 101):
+        decision = "high"
+    elif cheap_score <= limits.get("low", -1) and not flags:
+        decision = "low"
+    else:
+        decision = None
+
+    key = "escalated" if decision is None else f"decided_{decision}"
+    with _stats_lock:
+        _stats.setdefault(component, {"decided_low": 0, "decided_high": 0, "escalated": 0})[key] += 1
+    return decision
+
+
+def decided_score(component, decision, cheap_score):
+    """Probability to report for an item the cascade settled without the LLM."""
+    if decision == "high":
+        return max(cheap_score, CASCADE_THRESHOLDS.get(component, {}).get("high_score", cheap_score))
+    return cheap_score
+
+
+def cascade_stats():
+    """Return per-component counts plus escalation rate (escalated / total)."""
+    with _stats_lock:
+        snapshot = {c: dict(v) for c, v in _stats.items()}
+
+    for counts in snapshot.values():
+        total = counts["decided_low"] + counts["decided_high"] + counts["escalated"]
+        counts["total"] = total
+        counts["escalation_rate"] = round(counts["escalated"] / total, 4) if total else 0.0
+    return snapshot
+
+
+def reset_cascade_stats():
+    with _stats_lock:
+        for counts in _stats.values():
+            for k in counts:
+                counts[k] = 0
+
+
+# ========== AGREEMENT CHECK ==========
+
+def _to_binary(score, cutoff=50):
+    return 1 if score >= cutoff else 0
+
+
+def evaluate_cascade(items, cheap_fn, llm_fn, component):
+    """
+    Run the cascade over labeled items and compare decisive verdicts with the LLM.
+
+    Args:
+        items (list): (item, label) pairs, label is 0 (real/safe) or 1 (fake/malicious)
+        cheap_fn (callable): item -> (cheap_score, flags)
+        llm_fn (callable or None): item -> LLM probability (0-100); None skips the LLM check
+        component (str): threshold key
+
+    Returns:
+        dict: escalation rate, label accuracy of decided items, LLM agreement on decided items
+    """
+    decided = escalated = 0
+    label_hits = llm_checked = llm_agree = 0
+
+    for item, label in items:
+        score, flags = cheap_fn(item)
+        decision = cascade_decision(component, score, flags)
+        if decision is None:
+            escalated += 1
+            continue
+
+        decided += 1
+        verdict = 1 if decision == "high" else 0
+        label_hits += int(verdict == int(label))
+
+        if llm_fn is not None:
+            llm_prob = llm_fn(item)
+            if llm_prob is not None:
+                llm_checked += 1
+                llm_agree += int(verdict == _to_binary(llm_prob))
+
+    total = decided + escalated
+    return {
+        "component": component,
+        "thresholds": CASCADE_THRESHOLDS.get(component),
+        "items": total,
+        "decided": decided,
+        "escalated": escalated,
+        "escalation_rate": round(escalated / total, 4) if total else 0.0,
+        "decided_label_accuracy": round(label_hits / decided, 4) if decided else None,
+        "llm_checked": llm_checked,
+        "llm_agreement": round(llm_agree / llm_checked, 4) if llm_checked else None,
+    }
+
+
+def main():
+    import random
+    import pandas as pd
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Escalation rate and LLM agreement of the cascade")
+    parser.add_argument("--tweet-csv", default=os.path.join(base, "tweets_with_groq_percentage.csv"))
+    parser.add_argument("--url-csv", default=os.path.join(base, "fake_url_dataset.csv"))
+    parser.add_argument("--profile-csv", default=os.path.join(base, "fake_profile_dataset.csv"))
+    parser.add_argument("--sample", type=int, default=100, help="labeled items per component")
+    parser.add_argument("--no-llm", action="store_true", help="skip the LLM agreement check")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import url_classifier
+    import profile_classifier
+    from groq_llm_with_regex_percentage import compute_regex_percent
+
+    api_key = os.environ.get("GROQ_API_KEY")
+    use_llm = api_key and not args.no_llm
+    rng = random.Random(args.seed)
+
+    # ---- Tweets ----
+    # No human labels for tweets: the label is the verdict recorded in
+    # groq_fake_percent by the offline Groq stage (>= 50 is fake). "Groq error"
+    # rows carry a placeholder 0.0, not a verdict, so they are not labels.
+    tweet_df = pd.read_csv(args.tweet_csv).dropna(subset=["text", "groq_fake_percent"])
+    if "groq_reason" in tweet_df.columns:
+        tweet_df = tweet_df[~tweet_df["groq_reason"].fillna("").astype(str).str.startswith("Groq error")]
+    verified = (tweet_df["verified"].fillna(False).astype(bool) if "verified" in tweet_df.columns
+                else [False] * len(tweet_df))
+    tweet_items = [((text, bool(v)), _to_binary(percent))
+                   for text, v, percent in zip(tweet_df["text"], verified, tweet_df["groq_fake_percent"])]
+    tweet_items = rng.sample(tweet_items, min(args.sample, len(tweet_items)))
+
+    def tweet_cheap(item):
+        # Same flags as llm_wrappers: an unverified author blocks a "low" decision
+        text, is_verified = item
+        _, percent, _ = compute_regex_percent(text)
+        return percent, [] if is_verified else ["unverified_author"]
+
+    def tweet_llm(item):
+        # Imported here: groq_llm_fake_news builds its Groq client at import and needs the key
+        from groq_llm_fake_news import classify_with_groq_percentage
+
+        text, _ = item
+        _, percent, tags = compute_regex_percent(text)
+        prob, reason = classify_with_groq_percentage(text, percent, ",".join(tags))
+        return None if reason.startswith("Groq error") else float(prob)
+
+    # ---- URLs ----
+    url_df = pd.read_csv(args.url_csv)
+    url_items = list(zip(url_df["url"], url_df["label"]))
+    url_items = rng.sample(url_items, min(args.sample, len(url_items)))
+
+    def url_cheap(url):
+        features = url_classifier.extract_url_features(url)
+        score, _ = url_classifier.check_regex_patterns(url)
+        return score, url_classifier.check_url_red_flags(url, features)
+
+    def url_llm(url):
+        features = url_classifier.extract_url_features(url)
+        score, tags = url_classifier.check_regex_patterns(url)
+        flags = url_classifier.check_url_red_flags(url, features)
+        prob, _, reason = url_classifier.classify_with_groq(url, features, score, tags, flags, api_key)
+        return None if reason.startswith("LLM error") else float(prob)
+
+    # ---- Profiles ----
+    prof_df = pd.read_csv(args.profile_csv)
+    prof_df = prof_df.fillna({c: "" for c in ("username", "display_name", "bio", "url")})
+    prof_items = [(profile_classifier.normalize_profile(row), row["label"])
+                  for row in prof_df.to_dict("records")]
+    prof_items = rng.sample(prof_items, min(args.sample, len(prof_items)))
+
+    def profile_cheap(profile):
+        score, _ = profile_classifier.check_regex_patterns(profile)
+        return score, profile_classifier.check_behavioral_signals(profile)
+
+    def profile_llm(profile):
+        score, tags = profile_classifier.check_regex_patterns(profile)
+        flags = profile_classifier.check_behavioral_signals(profile)
+        prob, reason = profile_classifier.classify_with_groq(profile, score, tags, flags, api_key)
+        return None if reason.startswith("LLM error") else float(prob)
+
+    reports = [
+        evaluate_cascade(url_items, url_cheap, url_llm if use_llm else None, "url"),
+        evaluate_cascade(prof_items, profile_cheap, profile_llm if use_llm else None, "profile"),
+    ]
+    if tweet_items:
+        reports.insert(0, evaluate_cascade(tweet_items, tweet_cheap, tweet_llm if use_llm else None, "tweet"))
+    else:
+        print(f"[INFO] no valid tweet labels in {args.tweet_csv} (every row is a Groq error); tweets not evaluated")
+
+    for report in reports:
+        print(json.dumps(report, indent=2))
+    if not use_llm:
+        print("\n[INFO] LLM agreement skipped (no GROQ_API_KEY or --no-llm)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import time
+
+import pandas as pd
+
+# ========== CHUNKED CSV STREAMING ==========
+#
+# The batch scripts (regex scoring, profile regex scoring, the Groq scorers)
+# read a CSV, add a few score columns and write it back out. stream_csv() does
+# that one chunk at a time: read `chunksize` rows, score them, append them to
+# the output, drop them. Peak memory depends on the chunk size, not on the
+# length of the file.
+#
+# Input columns are read as text (empty cells as NaN) and written back
+# unchanged. Parsing each chunk separately would otherwise infer dtypes per
+# chunk, so e.g. a float column could print "2" in one chunk and "2.0" in the
+# next. Scorers convert the columns they compute on themselves. The output is
+# written to "<output>.part" and renamed when complete, so a failed run leaves
+# no half-written file under the output name.
+
+DEFAULT_CHUNKSIZE = 10_000
+
+# read_csv arguments that keep every cell as its original text ("" -> NaN)
+RAW_TEXT = {"dtype": str, "keep_default_na": False, "na_values": [""]}
+
+
+def csv_header(path):
+    """Column names of a CSV without reading its rows"""
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+    """
+    DataFrames of up to chunksize rows from path; chunksize 0 (or None) reads
+    the whole file as one chunk. kwargs go to pd.read_csv.
+    """
+    if not chunksize:
+        yield pd.read_csv(path, **kwargs)
+        return
+    with pd.read_csv(path, chunksize=chunksize, **kwargs) as reader:
+        yield from reader
+
+
+class ChunkWriter:
+    """
+    Appends DataFrames to one CSV, with the header from the first one.
+    Writes to "<path>.part" and renames it to path on a clean exit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.part_path = path + ".part"
+        self.rows = 0
+        self.chunks = 0
+
+    def __enter__(self):
+        self._file = open(self.part_path, "w", encoding="utf-8", newline="")
+        return self
+
+    def write(self, df):
+        df.to_csv(self._file, header=self.chunks == 0, index=False)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.part_path, self.path)
+        else:
+            os.remove(self.part_path)
+        return False
+
+
+def _with_defaults(chunk, defaults):
+    for col, value in (defaults or {}).items():
+        if col not in chunk.columns:
+            chunk[col] = value
+    return chunk
+
+
+def stream_csv(input_csv, output_csv, score_chunk, chunksize=DEFAULT_CHUNKSIZE, defaults=None):
+    """
+    Copy input_csv to output_csv chunk by chunk, adding the columns score_chunk returns.
+
+    Args:
+        score_chunk: function(chunk, offset) -> dict {new column: values aligned with chunk};
+                     offset is the index of the chunk's first row in the file
+        chunksize: rows per chunk (0 reads the whole file at once)
+        defaults: {column: value} for optional input columns; added when the input lacks them
+
+    Returns:
+        dict: rows, chunks, seconds
+    """
+    start = time.perf_counter()
+    offset = 0
+    with ChunkWriter(output_csv) as writer:
+        for chunk in read_chunks(input_csv, chunksize, **RAW_TEXT):
+            chunk = _with_defaults(chunk.reset_index(drop=True), defaults)
+            writer.write(chunk.assign(**score_chunk(chunk, offset)))
+            offset += len(chunk)
+        if writer.chunks == 0:
+            # Header-only input: write the header and the new (empty) columns
+            chunk = _with_defaults(pd.read_csv(input_csv, **RAW_TEXT), defaults)
+            writer.write(chunk.assign(**score_chunk(chunk, 0)))
+    return {"rows": offset, "chunks": writer.chunks, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def add_stream_args(parser, input_csv, output_csv):
+    """--input / --output / --chunksize for a batch script's argparse parser"""
+    parser.add_argument("--input", default=input_csv, help=f"input CSV (default: {input_csv})")
+    parser.add_argument("--output", default=output_csv, help=f"output CSV (default: {output_csv})")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="rows per chunk; memory stays flat whatever the file size (0: whole file at once)")
+    return parser
@@ -0,0 +1,389 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from csv_stream import DEFAULT_CHUNKSIZE, RAW_TEXT, csv_header, read_chunks, stream_csv
+from tweet_ingest import (
+    LIST_COLUMNS, PANDAS_DTYPES, TWEET_COLUMN_TYPES, ListColumn, parse_list_column, format_list_column,
+)
+
+# Optional: pyarrow for the Parquet / Arrow formats. Without it only CSV is
+# available, and asking for a .parquet / .arrow path raises a clear error.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# ========== COLUMNAR DATASETS ==========
+#
+# The scoring pipeline (tweets_extracted -> tweets_with_regex_scores ->
+# tweets_with_groq_percentage, and the profile equivalent) can keep its data
+# in Parquet or Arrow IPC files instead of CSV. The format is picked from the
+# file extension, so every stage reads and writes any of them:
+#
+#   .csv                 text; list columns as Python literals ("['a', 'b']")
+#   .parquet             compressed, typed columns, column projection on read
+#   .arrow / .feather    Arrow IPC file: uncompressed, memory-mapped reads
+#
+# Columns get the types below instead of whatever a CSV parse infers: list
+# columns are list<string>, the rule flags are bool, ids and counts int64
+# (nullable). A stage converts only the columns it reads (`columns=`) to
+# pandas; the rest pass through as Arrow data, untouched.
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+PARQUET_COMPRESSION = "zstd"
+
+# Declared column types (the tweet dataset's from tweet_ingest); columns not listed here are strings
+COLUMN_TYPES = {
+    **TWEET_COLUMN_TYPES,
+    # fake_profile_dataset.csv / profiles_extracted.csv
+    "id": "int64",
+    "followers": "int64",
+    "following": "int64",
+    "tweets": "int64",
+    "account_age_days": "int64",
+    "has_profile_image": "bool",
+    "has_banner": "bool",
+    "verified": "bool",
+    "label": "int64",
+    # Columns added by the pipeline stages
+    "regex_match_count": "int64",
+    "regex_fake_percent": "float64",
+    "groq_fake_percent": "float64",
+    "profile_regex_match_count": "int64",
+    "profile_fake_percent": "float64",
+    "llm_profile_fake_percent": "float64",
+    "malicious_probability": "float64",
+}
+
+# Flag spellings in CSV text (text_to_type)
+BOOL_TEXT = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+
+
+def dataset_format(path):
+    """"csv" | "parquet" | "arrow" from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PARQUET_EXTENSIONS:
+        return "parquet"
+    if ext in ARROW_EXTENSIONS:
+        return "arrow"
+    return "csv"
+
+
+def _require_pyarrow(path):
+    if pa is None:
+        raise ImportError(f"{path}: Parquet / Arrow files need pyarrow (pip install pyarrow), or use a .csv path")
+
+
+def arrow_type(column):
+    """pyarrow type of a column, from COLUMN_TYPES (string when not declared)"""
+    name = COLUMN_TYPES.get(column, "string")
+    if name == "list<string>":
+        return pa.list_(pa.string())
+    return {"int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_()}.get(name, pa.string())
+
+
+def dataset_columns(path):
+    """Column names of a dataset in any format, without reading its rows"""
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        return csv_header(path)
+    _require_pyarrow(path)
+    if fmt == "parquet":
+        return pq.read_schema(path).names
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+# ========== CSV IMPORT / EXPORT ==========
+
+
+def csv_chunk_to_table(chunk):
+    """Typed Arrow table from a CSV chunk read with csv_read_kwargs() (list columns: tweet_ingest parser)"""
+    lists = [c for c in chunk.columns if c in LIST_COLUMNS]
+    scalars = [c for c in chunk.columns if c not in lists]
+    schema = pa.schema([pa.field(c, arrow_type(c)) for c in scalars])
+    table = pa.Table.from_pandas(chunk[scalars], schema=schema, preserve_index=False)
+    for col in lists:
+        table = table.append_column(pa.field(col, arrow_type(col)), parse_list_column(chunk[col]).to_arrow())
+    return table.select(list(chunk.columns))
+
+
+def csv_read_kwargs(columns):
+    """pd.read_csv arguments giving the declared dtypes (text for undeclared columns)"""
+    dtypes = {c: PANDAS_DTYPES[COLUMN_TYPES.get(c, "string")] for c in columns}
+    # round_trip: the default parser can be 1 ulp off, and the float would not print back the same
+    return dict(RAW_TEXT, dtype=dtypes, float_precision="round_trip")
+
+
+def text_to_type(values, type_name):
+    """
+    A column read as raw text (RAW_TEXT) as a declared "int64" / "float64" / "bool" type:
+    numbers parsed exactly (nullable Int64 / Float64), flags from "True"/"false"/"1"/"0".
+    Cells that don't parse become missing, never a guess like bool("False").
+    """
+    if type_name == "bool":
+        return values.astype("string").str.strip().str.lower().map(BOOL_TEXT).astype("boolean")
+    numbers = pd.to_numeric(values, errors="coerce", dtype_backend="numpy_nullable")
+    return numbers.astype("Float64") if type_name == "float64" else numbers
+
+
+def typed_frame(frame, column_types=COLUMN_TYPES):
+    """
+    frame with its declared number and flag columns converted from raw CSV text;
+    columns already typed (a Parquet / Arrow read) are left as they are
+    """
+    frame = frame.copy()
+    for col in frame.columns:
+        type_name = column_types.get(col, "string")
+        if type_name in ("int64", "float64", "bool") and pd.api.types.is_string_dtype(frame[col]):
+            frame[col] = text_to_type(frame[col], type_name)
+    return frame
+
+
+def table_to_csv_frame(table):
+    """DataFrame to write as CSV: list columns back to Python literals, like the extractor wrote them"""
+    lists = [c for c in table.column_names if pa.types.is_list(table.schema.field(c).type)]
+    df = table.drop_columns(lists).to_pandas()
+    for col in lists:
+        df[col] = format_list_column(ListColumn.from_arrow(table[col]))
+    return df[table.column_names]
+
+
+# ========== READ / WRITE ==========
+
+
+def iter_tables(path, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """
+    Arrow tables of up to chunksize rows from a dataset in any format.
+    columns: projection (only these columns are read from Parquet / Arrow files)
+    """
+    _require_pyarrow(path)
+    fmt = dataset_format(path)
+    if fmt == "csv":
+        header = csv_header(path)
+        usecols = columns if columns is not None else header
+        for chunk in read_chunks(path, chunksize, usecols=usecols, **csv_read_kwargs(usecols)):
+            yield csv_chunk_to_table(chunk[list(usecols)])
+    elif fmt == "parquet":
+        parquet = pq.ParquetFile(path)
+        if parquet.metadata.num_rows == 0:
+            # No batches to iterate; one empty table carries the schema, as for a header-only CSV
+            yield _project(parquet.schema_arrow.empty_table(), columns)
+            return
+        for batch in parquet.iter_batches(batch_size=chunksize or parquet.metadata.num_rows, columns=columns):
+            yield pa.Table.from_batches([batch])
+    else:
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+            if not any(batch.num_rows for batch in batches):
+                yield _project(reader.schema.empty_table(), columns)
+                return
+            for batch in batches:
+                batch = batch.select(columns) if columns is not None else batch
+                # Batches are as the writer made them; slices (zero-copy) keep chunks to chunksize
+                step = chunksize or batch.num_rows or 1
+                for start in range(0, batch.num_rows, step):
+                    yield pa.Table.from_batches([batch.slice(start, step)])
+
+
+def _project(table, columns):
+    return table.select(columns) if columns is not None else table
+
+
+def read_dataset(path, columns=None):
+    """Whole dataset as a DataFrame (list columns as lists); columns: projection"""
+    fmt = dataset_format(path)
+    if fmt == "csv" and pa is None:
+        df = pd.read_csv(path, usecols=columns, float_precision="round_trip")
+        for col in LIST_COLUMNS:
+            if col in df.columns:
+                df[col] = parse_list_column(df[col]).to_lists()
+        return df
+    _require_pyarrow(path)
+    if fmt == "parquet":
+        return pq.read_table(path, columns=columns).to_pandas()
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        return (table.select(columns) if columns is not None else table).to_pandas()
+    return pa.concat_tables(iter_tables(path, 0, columns)).to_pandas()
+
+
+class DatasetWriter:
+    """
+    Appends Arrow tables to one dataset file (format from the extension).
+    Like csv_stream.ChunkWriter: writes "<path>.part", renamed on a clean exit.
+    The first table fixes the schema; later ones are cast to it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.part_path = path + ".part"
+        self.format = dataset_format(path)
+        self.rows = 0
+        self.chunks = 0
+        self.schema = None
+        self._writer = None
+        self._file = None
+
+    def __enter__(self):
+        if self.format == "csv":
+            self._file = open(self.part_path, "w", encoding="utf-8", newline="")
+        else:
+            _require_pyarrow(self.path)
+        return self
+
+    def write(self, table):
+        if self.schema is None:
+            # Columns that are all-null in the first chunk would be typed "null"; they are strings
+            self.schema = pa.schema([
+                f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema])
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.part_path, self.schema, compression=PARQUET_COMPRESSION)
+            elif self.format == "arrow":
+                self._writer = pa.ipc.new_file(self.part_path, self.schema)
+        table = table.cast(self.schema)
+        if self.format == "csv":
+            table_to_csv_frame(table).to_csv(self._file, header=self.chunks == 0, index=False)
+        else:
+            self._writer.write_table(table)
+        self.rows += table.num_rows
+        self.chunks += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            self._file.close()
+        if self._writer is not None:
+            self._writer.close()
+        if exc_type is None and os.path.exists(self.part_path):
+            os.replace(self.part_path, self.path)
+        elif os.path.exists(self.part_path):
+            os.remove(self.part_path)
+        return False
+
+
+def write_dataset(df, path):
+    """Write a DataFrame (list columns as lists) as CSV, Parquet or Arrow"""
+    if dataset_format(path) == "csv" and pa is None:
+        df = df.copy()
+        for col in LIST_COLUMNS:
+            if col in df.columns:
+                df[col] = format_list_column(ListColumn.from_lists(df[col].tolist()))
+        df.to_csv(path, index=False)
+        return
+    _require_pyarrow(path)
+    schema = pa.schema([pa.field(c, arrow_type(c)) if c in COLUMN_TYPES else pa.field(c, pa.array(df[c]).type)
+                        for c in df.columns])
+    with DatasetWriter(path) as writer:
+        writer.write(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+
+# ========== PIPELINE STAGES ==========
+
+
+def _as_frame(table):
+    """Projected columns for a scorer, with missing values as NaN like read_csv gives them"""
+    df = table.to_pandas()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _new_column(name, values, n):
+    values = list(values)
+    if len(values) != n:
+        raise ValueError(f"score column {name!r} has {len(values)} values for {n} rows")
+    typed = arrow_type(name) if name in COLUMN_TYPES else None
+    array = pa.array(values, type=typed, from_pandas=True)
+    return array.cast(pa.string()) if pa.types.is_null(array.type) else array
+
+
+def stream_dataset(input_path, output_path, score_chunk, chunksize=DEFAULT_CHUNKSIZE, columns=None, defaults=None):
+    """
+    A pipeline stage: copy input_path to output_path chunk by chunk, adding the
+    columns score_chunk returns. Input and output may each be CSV, Parquet or Arrow.
+
+    Args:
+        score_chunk: function(chunk, offset) -> dict {new column: values}, as for csv_stream.stream_csv
+        columns: input columns score_chunk reads; with a columnar input only these are
+                 converted to pandas, the others pass through as Arrow data
+        defaults: {column: value} for optional input columns; added when the input lacks them
+
+    Returns:
+        dict: rows, chunks, seconds
+    """
+    if dataset_format(input_path) == "csv" and dataset_format(output_path) == "csv":
+        return stream_csv(input_path, output_path, score_chunk, chunksize, defaults)
+
+    _require_pyarrow(input_path if dataset_format(input_path) != "csv" else output_path)
+    start = time.perf_counter()
+    offset = 0
+    with DatasetWriter(output_path) as writer:
+        for table in iter_tables(input_path, chunksize):
+            n = table.num_rows
+            for col, value in (defaults or {}).items():
+                if col not in table.column_names:
+                    table = table.append_column(col, pa.array([value] * n, type=arrow_type(col)))
+            wanted = [c for c in columns if c in table.column_names] if columns is not None else table.column_names
+            for name, values in score_chunk(_as_frame(table.select(wanted)), offset).items():
+                table = table.append_column(name, _new_column(name, values, n))
+            writer.write(table)
+            offset += n
+    return {"rows": offset, "chunks": writer.chunks, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def add_dataset_args(parser, input_path, output_path):
+    """--input / --output / --chunksize for a pipeline stage (any format, picked by extension)"""
+    parser.add_argument("--input", default=input_path,
+                        help=f"input .csv / .parquet / .arrow (default: {input_path})")
+    parser.add_argument("--output", default=output_path,
+                        help=f"output .csv / .parquet / .arrow (default: {output_path})")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="rows per chunk; memory stays flat whatever the file size (0: whole file at once)")
+    return parser
+
+
+def convert(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, columns=None):
+    """
+    Convert a dataset between CSV, Parquet and Arrow, chunk by chunk (columns: keep only these).
+
+    Returns:
+        dict: rows, chunks, seconds, input_mb, output_mb
+    """
+    start = time.perf_counter()
+    with DatasetWriter(output_path) as writer:
+        for table in iter_tables(input_path, chunksize, columns):
+            writer.write(table)
+    return {
+        "rows": writer.rows,
+        "chunks": writer.chunks,
+        "seconds": round(time.perf_counter() - start, 3),
+        "input_mb": round(os.path.getsize(input_path) / 1e6, 2),
+        "output_mb": round(os.path.getsize(output_path) / 1e6, 2),
+    }
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a pipeline dataset between CSV, Parquet and Arrow")
+    parser.add_argument("input", help=".csv / .parquet / .arrow")
+    parser.add_argument("output", help=".csv / .parquet / .arrow (format from the extension)")
+    parser.add_argument("--columns", nargs="+", help="keep only these columns")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    report = convert(args.input, args.output, args.chunksize, args.columns)
+    print(f"[DONE] {report['rows']} rows, {report['input_mb']} MB -> {report['output_mb']} MB "
+          f"in {report['seconds']} s: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
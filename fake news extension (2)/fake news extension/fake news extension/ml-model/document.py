@@ -0,0 +1,105 @@
+import re
+from urllib.parse import urlparse
+
+import text_features
+
+# ========== ANALYZED DOCUMENT ==========
+#
+# One request's tweet text and URLs, plus everything the scorers derive from
+# them: the lowercased text, words, text-model tokens, the uppercase count,
+# the heuristic feature dict, the regex rule-pack result and parsed URLs.
+# Each is computed on first use and then shared, so when the detector, the
+# text model and the LLM wrappers all look at the same tweet, nothing is done
+# twice. Create one per request and pass it to every analyzer.
+#
+# In the ASGI app the components of a request can read the same document from
+# different worker threads. A value may then be computed twice, but both
+# copies are identical and either one can be kept, so no locking is needed.
+
+# Text model tokenization: URLs collapse to one token, then lowercase words
+TWEET_URL_RE = re.compile(r"https?://\S+")
+TOKEN_RE = re.compile(r"[a-z0-9#@']+")
+
+
+def tokenize(lowered):
+    """Text-model tokens of already lowercased text"""
+    return TOKEN_RE.findall(TWEET_URL_RE.sub(" httpurl ", lowered))
+
+
+class AnalyzedDocument:
+    """Per-request text and URLs with lazily computed, shared derived forms"""
+
+    __slots__ = ("text", "urls", "_lowered", "_words", "_tokens", "_uppercase", "_features", "_regex", "_parsed")
+
+    def __init__(self, text="", urls=()):
+        if not isinstance(text, str):
+            text = "" if text is None else str(text)
+        self.text = text
+        self.urls = list(urls) if isinstance(urls, (list, tuple)) else [urls]
+        self._lowered = None
+        self._words = None
+        self._tokens = None
+        self._uppercase = None
+        self._features = None
+        self._regex = {}
+        self._parsed = {}
+
+    def __repr__(self):
+        return f"AnalyzedDocument(text={self.text[:40]!r}, urls={len(self.urls)})"
+
+    @property
+    def lowered(self):
+        """Lowercased text: what the case-insensitive scorers match against"""
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return self._lowered
+
+    @property
+    def words(self):
+        """Whitespace-separated words"""
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def tokens(self):
+        """Text-model tokens (see tokenize)"""
+        if self._tokens is None:
+            self._tokens = tokenize(self.lowered)
+        return self._tokens
+
+    @property
+    def uppercase_count(self):
+        """Number of uppercase characters (caps ratio numerator)"""
+        if self._uppercase is None:
+            self._uppercase = text_features.uppercase_count(self.text)
+        return self._uppercase
+
+    @property
+    def text_features(self):
+        """FakeNewsDetector heuristic feature dict (text_features.extract_text_features)"""
+        if self._features is None:
+            self._features = text_features.extract_text_features(
+                self.text, lowered=self.lowered, words=self.words, uppercase=self.uppercase_count)
+        return self._features
+
+    def regex(self, compute):
+        """
+        compute(text), memoized; compute is a rule-pack scorer such as compute_regex_percent.
+
+        Results are kept per function: a request that straddles a rule reload
+        recomputes with the new rules instead of mixing versions, and callers
+        still holding the old and the new scorer each reuse their own result.
+        """
+        result = self._regex.get(compute)
+        if result is None:
+            result = self._regex[compute] = compute(self.text)
+        return result
+
+    def parsed_url(self, url):
+        """urlparse(url), parsed once per document (raises like urlparse on invalid URLs)"""
+        parsed = self._parsed.get(url)
+        if parsed is None:
+            parsed = self._parsed[url] = urlparse(url)
+        return parsed
+
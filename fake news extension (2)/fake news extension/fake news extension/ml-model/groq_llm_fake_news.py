@@ -1,10 +1,15 @@
 import os
 import time
 import json
+import argparse
 import pandas as pd
 from groq import Groq
 from dotenv import load_dotenv
 
+from metrics import groq_call
+from verdict_cache import get_cache, text_key, request_source
+from dataset_io import add_dataset_args, dataset_columns, stream_dataset
+
 # Load environment variables from .env (if present)
 load_dotenv()
 
@@ -15,20 +20,16 @@ OUTPUT_CSV = "tweets_with_groq_percentage.csv"
 TEXT_COL = "text"
 MODEL_NAME = "llama3-8b-8192"
 
+# Pause between Groq calls, to be gentle with the API (0 against a local stand-in)
+REQUEST_DELAY = float(os.environ.get("GROQ_REQUEST_DELAY", "0.2"))
+
 client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
 
+# Verdicts per tweet text (whitespace-normalized); errors are not cached
+TWEET_VERDICT_CACHE = get_cache("tweet")
 
-def classify_with_groq_percentage(text: str, regex_percent: float, regex_tags: str):
-    """
-    Returns:
-        fake_percent: float (0-100)
-        reason: str
-    """
-
-    if not isinstance(text, str) or text.strip() == "":
-        return 0.0, "Empty or invalid text"
 
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are an AI system that detects fake or misleading news in short social media posts.
 
 You are given:
@@ -51,73 +52,132 @@ Guidelines:
 - 76 to 100 → highly fake
 """
 
+
+def build_groq_request(text: str, regex_percent: float, regex_tags: str):
+    """chat.completions.create() arguments for one tweet (shared by the sync and async clients)"""
     user_prompt = {
         "tweet": text,
         "regex_fake_percent": regex_percent,
         "regex_matched_tags": regex_tags
     }
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT.strip()},
+            {"role": "user", "content": json.dumps(user_prompt, ensure_ascii=False)},
+        ],
+        "temperature": 0.2,
+    }
+
+
+# Model and prompt behind this module's verdicts (cache_warmer loads only matching rows)
+VERDICT_SOURCE = request_source(build_groq_request("source_probe", 0.0, ""))
+
+
+def parse_groq_reply(chat_completion):
+    """(fake_percent, reason) from a chat completion; raises on invalid JSON"""
+    raw = chat_completion.choices[0].message.content.strip()
+    parsed = json.loads(raw)
+
+    fake_percent = parsed.get("fake_percent", 0)
+    reason = parsed.get("reason", "")
 
     try:
-        chat_completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system_prompt.strip()},
-                {"role": "user", "content": json.dumps(user_prompt, ensure_ascii=False)},
-            ],
-            temperature=0.2,
-        )
+        fake_percent = float(fake_percent)
+    except:
+        fake_percent = 0.0
 
-        raw = chat_completion.choices[0].message.content.strip()
-        parsed = json.loads(raw)
+    fake_percent = max(0, min(100, fake_percent))
 
-        fake_percent = parsed.get("fake_percent", 0)
-        reason = parsed.get("reason", "")
+    return fake_percent, reason
 
-        try:
-            fake_percent = float(fake_percent)
-        except:
-            fake_percent = 0.0
 
-        fake_percent = max(0, min(100, fake_percent))
+def classify_with_groq_percentage(text: str, regex_percent: float, regex_tags: str):
+    """
+    Returns:
+        fake_percent: float (0-100)
+        reason: str
+    """
 
-        return fake_percent, reason
+    if not isinstance(text, str) or text.strip() == "":
+        return 0.0, "Empty or invalid text"
+
+    key = text_key(text)
+    verdict = TWEET_VERDICT_CACHE.get(key)
+    if verdict is not None:
+        return verdict
+
+    try:
+        with groq_call("tweet"):
+            chat_completion = client.chat.completions.create(**build_groq_request(text, regex_percent, regex_tags))
+            verdict = parse_groq_reply(chat_completion)
 
     except Exception as e:
         return 0.0, f"Groq error: {e}"
 
+    TWEET_VERDICT_CACHE.put(key, verdict)
+    return verdict
 
-def main():
-    df = pd.read_csv(INPUT_CSV)
 
-    required_cols = [TEXT_COL, "regex_fake_percent", "regex_matched_tags"]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Column '{col}' not found. Available: {df.columns.tolist()}")
+async def classify_with_groq_percentage_async(text: str, regex_percent: float, regex_tags: str, async_client):
+    """classify_with_groq_percentage on a shared AsyncGroq client"""
+
+    if not isinstance(text, str) or text.strip() == "":
+        return 0.0, "Empty or invalid text"
+
+    key = text_key(text)
+    verdict = TWEET_VERDICT_CACHE.get(key)
+    if verdict is not None:
+        return verdict
+
+    try:
+        with groq_call("tweet"):
+            chat_completion = await async_client.chat.completions.create(
+                **build_groq_request(text, regex_percent, regex_tags))
+            verdict = parse_groq_reply(chat_completion)
+
+    except Exception as e:
+        return 0.0, f"Groq error: {e}"
+
+    TWEET_VERDICT_CACHE.put(key, verdict)
+    return verdict
+
 
+def groq_columns(chunk, offset=0):
+    """groq_fake_percent / groq_reason / groq_source for a chunk of regex-scored tweets"""
     groq_fake_percents = []
     groq_reasons = []
 
-    total = len(df)
+    # CSV cells arrive as text; the prompt gets the number, like a whole-file read_csv gave
+    regex_percents = pd.to_numeric(chunk["regex_fake_percent"], errors="coerce")
 
-    for i, row in df.iterrows():
-        print(f"[{i+1}/{total}] Processing tweet...")
+    for i, (text, regex_percent, regex_tags) in enumerate(zip(chunk[TEXT_COL], regex_percents, chunk["regex_matched_tags"])):
+        print(f"[{offset + i + 1}] Processing tweet...")
 
-        percent, reason = classify_with_groq_percentage(
-            row[TEXT_COL],
-            row["regex_fake_percent"],
-            row["regex_matched_tags"]
-        )
+        percent, reason = classify_with_groq_percentage(text, regex_percent, regex_tags)
 
         groq_fake_percents.append(percent)
         groq_reasons.append(reason)
 
-        time.sleep(0.2)
+        time.sleep(REQUEST_DELAY)
 
-    df["groq_fake_percent"] = groq_fake_percents
-    df["groq_reason"] = groq_reasons
+    return {"groq_fake_percent": groq_fake_percents, "groq_reason": groq_reasons,
+            "groq_source": [VERDICT_SOURCE] * len(groq_reasons)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add Groq fake-news percentages to regex-scored tweets")
+    args = add_dataset_args(parser, INPUT_CSV, OUTPUT_CSV).parse_args()
+
+    columns = dataset_columns(args.input)
+    required_cols = [TEXT_COL, "regex_fake_percent", "regex_matched_tags"]
+    for col in required_cols:
+        if col not in columns:
+            raise ValueError(f"Column '{col}' not found. Available: {columns}")
 
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"\n✅ DONE: Output saved to {OUTPUT_CSV}")
+    # Each chunk is appended as soon as it is scored, so memory stays flat on large files
+    stats = stream_dataset(args.input, args.output, groq_columns, args.chunksize, columns=required_cols)
+    print(f"\n✅ DONE: {stats['rows']} tweets, output saved to {args.output}")
 
 
 if __name__ == "__main__":
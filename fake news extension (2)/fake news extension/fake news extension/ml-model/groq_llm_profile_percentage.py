@@ -1,10 +1,14 @@
 import os
 import time
 import json
+import argparse
 import pandas as pd
 from groq import Groq
 from dotenv import load_dotenv
 
+from dataset_io import add_dataset_args, dataset_columns, stream_dataset, typed_frame
+from verdict_cache import request_source
+
 # Load environment variables from .env (if present)
 load_dotenv()
 
@@ -20,37 +24,13 @@ URL_COL = "url"
 
 MODEL_NAME = "llama3-8b-8192"
 
+# Pause between Groq calls, to be gentle with the API (0 against a local stand-in)
+REQUEST_DELAY = float(os.environ.get("GROQ_REQUEST_DELAY", "0.2"))
+
 # expects: GROQ_API_KEY in environment or passed here directly
 client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
 
-
-def classify_profile_with_groq(username: str,
-                               display_name: str,
-                               bio: str,
-                               url: str,
-                               regex_percent: float,
-                               regex_tags: str):
-    """
-    Returns:
-        fake_percent: float (0-100)
-        reason: str (short explanation)
-    """
-
-    def _safe(x):
-        return "" if pd.isna(x) else str(x)
-
-    username = _safe(username)
-    display_name = _safe(display_name)
-    bio = _safe(bio)
-    url = _safe(url)
-    regex_tags = _safe(regex_tags)
-
-    try:
-        regex_percent = float(regex_percent)
-    except Exception:
-        regex_percent = 0.0
-
-    system_prompt = """
+SYSTEM_PROMPT = """
 You are an AI system that detects fake, scammy, or bot-like social media profiles.
 
 You are given:
@@ -78,6 +58,50 @@ Guidelines (rough, not strict):
 - 76–100 → highly suspicious / scam profile
 """
 
+
+def build_groq_request(user_payload):
+    """chat.completions.create() arguments for one profile"""
+    return {
+        "model": MODEL_NAME,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT.strip()},
+            {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
+        ],
+        "temperature": 0.2,
+    }
+
+
+# Model and prompt behind this script's verdicts, written to llm_profile_source. They are not the
+# API's (profile_classifier), so the cache warmer skips these rows; --live-prompt scores with the API's.
+VERDICT_SOURCE = request_source(build_groq_request({"username": "source_probe"}))
+
+
+def classify_profile_with_groq(username: str,
+                               display_name: str,
+                               bio: str,
+                               url: str,
+                               regex_percent: float,
+                               regex_tags: str):
+    """
+    Returns:
+        fake_percent: float (0-100)
+        reason: str (short explanation)
+    """
+
+    def _safe(x):
+        return "" if pd.isna(x) else str(x)
+
+    username = _safe(username)
+    display_name = _safe(display_name)
+    bio = _safe(bio)
+    url = _safe(url)
+    regex_tags = _safe(regex_tags)
+
+    try:
+        regex_percent = float(regex_percent)
+    except Exception:
+        regex_percent = 0.0
+
     user_payload = {
         "username": username,
         "display_name": display_name,
@@ -88,14 +112,7 @@ Guidelines (rough, not strict):
     }
 
     try:
-        chat_completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system_prompt.strip()},
-                {"role": "user", "content": json.dumps(user_payload, ensure_ascii=False)},
-            ],
-            temperature=0.2,
-        )
+        chat_completion = client.chat.completions.create(**build_groq_request(user_payload))
 
         raw = chat_completion.choices[0].message.content.strip()
         parsed = json.loads(raw)
@@ -116,53 +133,94 @@ Guidelines (rough, not strict):
         return 0.0, f"Groq error: {e}"
 
 
-def main():
-    if not os.path.exists(INPUT_CSV):
-        raise FileNotFoundError(f"Input CSV not found: {INPUT_CSV}")
+def llm_profile_columns(chunk, offset=0):
+    """llm_profile_fake_percent / llm_profile_reason for a chunk of regex-scored profiles"""
+    llm_fake_percents = []
+    llm_reasons = []
 
-    df = pd.read_csv(INPUT_CSV)
+    rows = zip(chunk[USERNAME_COL], chunk[DISPLAY_NAME_COL], chunk[BIO_COL], chunk[URL_COL],
+               pd.to_numeric(chunk["profile_fake_percent"], errors="coerce"), chunk["profile_regex_tags"])
+    for i, (username, display_name, bio, url, regex_percent, regex_tags) in enumerate(rows):
+        print(f"[{offset + i + 1}] Classifying profile with Groq LLM...")
 
-    required_cols = [
-        USERNAME_COL,
-        DISPLAY_NAME_COL,
-        BIO_COL,
-        "profile_fake_percent",
-        "profile_regex_tags",
-    ]
-    for col in required_cols:
-        if col not in df.columns:
-            raise ValueError(f"Column '{col}' missing. Found: {df.columns.tolist()}")
+        fake_percent, reason = classify_profile_with_groq(
+            username=username,
+            display_name=display_name,
+            bio=bio,
+            url=url,
+            regex_percent=regex_percent,
+            regex_tags=regex_tags,
+        )
+
+        llm_fake_percents.append(fake_percent)
+        llm_reasons.append(reason)
+
+        time.sleep(REQUEST_DELAY)
+
+    return {"llm_profile_fake_percent": llm_fake_percents, "llm_profile_reason": llm_reasons,
+            "llm_profile_source": [VERDICT_SOURCE] * len(llm_reasons)}
 
-    # URL is optional, fill with "" if missing
-    if URL_COL not in df.columns:
-        df[URL_COL] = ""
 
+def live_profile_columns(chunk, offset=0):
+    """
+    The same columns from the API's own model and prompt (profile_classifier), with the
+    behavioral signals it sends along; these rows can warm the API's profile cache
+    """
+    import profile_classifier
+
+    api_key = os.environ.get("GROQ_API_KEY")
+    # Counts and flags from CSV text; a missing field is left out, so the scorer's default applies
+    frame = typed_frame(chunk).astype(object)
+    records = [{k: v for k, v in record.items() if v is not None}
+               for record in frame.where(frame.notna(), None).to_dict("records")]
     llm_fake_percents = []
     llm_reasons = []
+    for i, record in enumerate(records):
+        print(f"[{offset + i + 1}] Classifying profile with the API's Groq prompt...")
 
-    total = len(df)
-    for i, row in df.iterrows():
-        print(f"[{i+1}/{total}] Classifying profile with Groq LLM...")
-
-        fake_percent, reason = classify_profile_with_groq(
-            username=row[USERNAME_COL],
-            display_name=row[DISPLAY_NAME_COL],
-            bio=row[BIO_COL],
-            url=row[URL_COL],
-            regex_percent=row["profile_fake_percent"],
-            regex_tags=row["profile_regex_tags"],
-        )
+        profile, regex_score, tags, flags, _ = profile_classifier.score_profile_signals(record, cascade=False)
+        fake_percent, reason = profile_classifier.classify_with_groq(profile, regex_score, tags, flags, api_key)
 
         llm_fake_percents.append(fake_percent)
         llm_reasons.append(reason)
 
-        time.sleep(0.2)  # small delay to be gentle with API
+        time.sleep(REQUEST_DELAY)
 
-    df["llm_profile_fake_percent"] = llm_fake_percents
-    df["llm_profile_reason"] = llm_reasons
+    return {"llm_profile_fake_percent": llm_fake_percents, "llm_profile_reason": llm_reasons,
+            "llm_profile_source": [profile_classifier.VERDICT_SOURCE] * len(llm_reasons)}
 
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"\n✅ DONE: Saved LLM profile scores to {OUTPUT_CSV}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Add Groq LLM fake-profile percentages to regex-scored profiles")
+    parser.add_argument("--live-prompt", action="store_true",
+                        help="score with the API's model and prompt (profile_classifier), so the "
+                             "output can warm the API's profile cache")
+    args = add_dataset_args(parser, INPUT_CSV, OUTPUT_CSV).parse_args()
+
+    if not os.path.exists(args.input):
+        raise FileNotFoundError(f"Input CSV not found: {args.input}")
+
+    columns = dataset_columns(args.input)
+    required_cols = [
+        USERNAME_COL,
+        DISPLAY_NAME_COL,
+        BIO_COL,
+        "profile_fake_percent",
+        "profile_regex_tags",
+    ]
+    for col in required_cols:
+        if col not in columns:
+            raise ValueError(f"Column '{col}' missing. Found: {columns}")
+
+    # URL is optional, filled with "" if missing; chunks are appended as they are scored.
+    # The live prompt also reads the counts and flags behind the behavioral signals.
+    if args.live_prompt:
+        stats = stream_dataset(args.input, args.output, live_profile_columns, args.chunksize,
+                               defaults={URL_COL: ""})
+    else:
+        stats = stream_dataset(args.input, args.output, llm_profile_columns, args.chunksize,
+                               columns=required_cols + [URL_COL], defaults={URL_COL: ""})
+    print(f"\n✅ DONE: Saved LLM profile scores for {stats['rows']} profiles to {args.output}")
 
 
 if __name__ == "__main__":
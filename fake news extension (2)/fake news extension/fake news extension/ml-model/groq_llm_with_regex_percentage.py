@@ -1,7 +1,9 @@
 # regex_scoring.py
 
 import re
-import pandas as pd
+import argparse
+
+from dataset_io import add_dataset_args, dataset_columns, stream_dataset
 
 # ============================
 # 1. YOUR REGEX PATTERN DICT
@@ -119,6 +121,9 @@ FAKE_REGEX = {
 
 TOTAL_CATEGORIES = len(FAKE_REGEX)
 
+# Change this if your column is named differently (e.g., "Tweet")
+TEXT_COL = "text"
+
 
 def compute_regex_percent(text: str):
     """
@@ -140,33 +145,37 @@ def compute_regex_percent(text: str):
     return matched_count, round(percent, 2), matched_keys
 
 
-def main():
-    # Change this if your column is named differently (e.g., "Tweet")
-    TEXT_COL = "text"
-
-    # Load your extracted tweets
-    df = pd.read_csv("tweets_extracted.csv")
-
-    if TEXT_COL not in df.columns:
-        raise ValueError(f"Column '{TEXT_COL}' not found in CSV. Available columns: {df.columns.tolist()}")
-
+def regex_columns(chunk, offset=0):
+    """regex_match_count / regex_fake_percent / regex_matched_tags for a chunk of tweets"""
     regex_counts = []
     regex_percents = []
     regex_tags = []
 
-    for t in df[TEXT_COL]:
+    for t in chunk[TEXT_COL]:
         count, percent, tags = compute_regex_percent(t)
         regex_counts.append(count)
         regex_percents.append(percent)
         regex_tags.append(",".join(tags))
 
-    df["regex_match_count"] = regex_counts
-    df["regex_fake_percent"] = regex_percents
-    df["regex_matched_tags"] = regex_tags
+    return {
+        "regex_match_count": regex_counts,
+        "regex_fake_percent": regex_percents,
+        "regex_matched_tags": regex_tags,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add regex fake-news scores to extracted tweets")
+    args = add_dataset_args(parser, "tweets_extracted.csv", "tweets_with_regex_scores.csv").parse_args()
+
+    columns = dataset_columns(args.input)
+    if TEXT_COL not in columns:
+        raise ValueError(f"Column '{TEXT_COL}' not found in CSV. Available columns: {columns}")
 
-    out_file = "tweets_with_regex_scores.csv"
-    df.to_csv(out_file, index=False)
-    print(f"[DONE] Saved file with regex scores → {out_file}")
+    # Read, score and append one chunk at a time, so memory stays flat on large files;
+    # from Parquet / Arrow only the text column is read into pandas
+    stream_dataset(args.input, args.output, regex_columns, args.chunksize, columns=[TEXT_COL])
+    print(f"[DONE] Saved file with regex scores → {args.output}")
 
 
 if __name__ == "__main__":
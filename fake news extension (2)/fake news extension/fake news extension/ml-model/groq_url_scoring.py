@@ -0,0 +1,71 @@
+import os
+import time
+import argparse
+from dotenv import load_dotenv
+
+import url_classifier
+from dataset_io import add_dataset_args, dataset_columns, stream_dataset
+
+# Load environment variables from .env (if present)
+load_dotenv()
+
+# ============ CONFIG ============
+
+INPUT_CSV = "fake_url_dataset.csv"
+OUTPUT_CSV = "urls_with_groq_scores.csv"
+URL_COL = "url"
+
+# Pause between Groq calls, to be gentle with the API (0 against a local stand-in)
+REQUEST_DELAY = float(os.environ.get("GROQ_REQUEST_DELAY", "0.2"))
+
+# The API's own model and prompt (url_classifier), so the output can warm its exact-URL cache
+# (cache_warmer.py). The verdict's threat type gets its own column: datasets may already
+# have a threat_type label.
+
+
+def groq_url_columns(chunk, offset=0):
+    """malicious_probability / llm_threat_type / reason / llm_url_source for a chunk of URLs"""
+    api_key = os.environ.get("GROQ_API_KEY")
+    probabilities = []
+    threat_types = []
+    reasons = []
+
+    for i, url in enumerate(chunk[URL_COL].fillna("").astype(str)):
+        print(f"[{offset + i + 1}] Classifying URL with Groq LLM...")
+
+        features, regex_score, tags, red_flags, _ = url_classifier.score_url_signals(url, cascade=False)
+        mal_prob, threat_type, reason = url_classifier.classify_with_groq(
+            url, features, regex_score, tags, red_flags, api_key)
+
+        probabilities.append(mal_prob)
+        threat_types.append(threat_type)
+        reasons.append(reason)
+
+        time.sleep(REQUEST_DELAY)
+
+    return {
+        "malicious_probability": probabilities,
+        "llm_threat_type": threat_types,
+        "reason": reasons,
+        "llm_url_source": [url_classifier.VERDICT_SOURCE] * len(reasons),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add Groq LLM URL verdicts to a URL dataset")
+    args = add_dataset_args(parser, INPUT_CSV, OUTPUT_CSV).parse_args()
+
+    if not os.path.exists(args.input):
+        raise FileNotFoundError(f"Input CSV not found: {args.input}")
+
+    columns = dataset_columns(args.input)
+    if URL_COL not in columns:
+        raise ValueError(f"Column '{URL_COL}' missing. Found: {columns}")
+
+    # Each chunk is appended as soon as it is scored, so memory stays flat on large files
+    stats = stream_dataset(args.input, args.output, groq_url_columns, args.chunksize, columns=[URL_COL])
+    print(f"\n✅ DONE: Saved LLM verdicts for {stats['rows']} URLs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import json
 import base64
 from groq import Groq
 
+from metrics import groq_call
+
 # ========== CORE FUNCTIONS ==========
 
 def encode_image_to_base64(image_path):
@@ -35,27 +37,8 @@ def get_image_media_type(image_path):
     return media_types.get(ext, "image/jpeg")
 
 
-def analyze_image_with_vlm(image_path, api_key, context=""):
-    """
-    Analyze image using Groq's Vision Language Model
-    
-    Args:
-        image_path (str): Path to image file
-        api_key (str): Groq API key
-        context (str): Optional context (tweet text, caption, etc.)
-    
-    Returns:
-        tuple: (fake_probability, verdict, reason, details)
-    """
-    client = Groq(api_key=api_key)
-    
-    # Encode image
-    base64_image = encode_image_to_base64(image_path)
-    if not base64_image:
-        return 50, "error", "Failed to load image", {}
-    
-    media_type = get_image_media_type(image_path)
-    
+def build_vlm_request(base64_image, media_type, context=""):
+    """chat.completions.create() arguments for one image (shared by the sync and async clients)"""
     context_info = f"\nContext/Caption: {context}" if context else ""
     
     prompt = f"""You are an expert image forensic analyst. Analyze this image for signs of manipulation, AI generation, or misleading content.
@@ -77,65 +60,100 @@ Respond ONLY with JSON (no markdown, no extra text):
     "confidence": "<low|medium|high>"
 }}"""
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.2-11b-vision-preview",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{media_type};base64,{base64_image}"
-                            }
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            temperature=0.1,
-            max_tokens=500,
-        )
-        
-        result = response.choices[0].message.content.strip()
-        result = result.replace("```json", "").replace("```", "").strip()
-        data = json.loads(result)
-        
-        return (
-            data.get("fake_probability", 50),
-            data.get("verdict", "uncertain"),
-            data.get("reason", "No reason provided"),
+    return {
+        "model": "llama-3.2-11b-vision-preview",
+        "messages": [
             {
-                "detected_issues": data.get("detected_issues", []),
-                "confidence": data.get("confidence", "medium")
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{media_type};base64,{base64_image}"
+                        }
+                    },
+                    {
+                        "type": "text",
+                        "text": prompt
+                    }
+                ]
             }
-        )
+        ],
+        "temperature": 0.1,
+        "max_tokens": 500,
+    }
+
+
+def parse_vlm_reply(response):
+    """(fake_probability, verdict, reason, details) from a chat completion; raises on invalid JSON"""
+    result = response.choices[0].message.content.strip()
+    result = result.replace("```json", "").replace("```", "").strip()
+    data = json.loads(result)
     
-    except Exception as e:
-        print(f"[VLM ERROR] {e}")
-        return 50, "error", f"VLM analysis failed: {str(e)}", {}
+    return (
+        data.get("fake_probability", 50),
+        data.get("verdict", "uncertain"),
+        data.get("reason", "No reason provided"),
+        {
+            "detected_issues": data.get("detected_issues", []),
+            "confidence": data.get("confidence", "medium")
+        }
+    )
 
 
-def classify_image(image_path, api_key, context=""):
+def analyze_image_with_vlm(image_path, api_key, context=""):
     """
-    Main function - call this from your code
+    Analyze image using Groq's Vision Language Model
     
     Args:
-        image_path (str): Path to uploaded JPG/PNG file
+        image_path (str): Path to image file
         api_key (str): Groq API key
-        context (str): Optional context (tweet text, caption)
+        context (str): Optional context (tweet text, caption, etc.)
     
     Returns:
-        dict: classification result
+        tuple: (fake_probability, verdict, reason, details)
     """
-    # Analyze with VLM
-    fake_prob, verdict, reason, details = analyze_image_with_vlm(image_path, api_key, context)
+    client = Groq(api_key=api_key)
     
-    # Final classification
+    # Encode image
+    base64_image = encode_image_to_base64(image_path)
+    if not base64_image:
+        return 50, "error", "Failed to load image", {}
+    
+    request = build_vlm_request(base64_image, get_image_media_type(image_path), context)
+
+    try:
+        with groq_call("image", "vlm"):
+            response = client.chat.completions.create(**request)
+            return parse_vlm_reply(response)
+    
+    except Exception as e:
+        print(f"[VLM ERROR] {e}")
+        return 50, "error", f"VLM analysis failed: {str(e)}", {}
+
+
+async def analyze_image_bytes_with_vlm_async(image_bytes, client, context="", media_type="image/jpeg"):
+    """
+    analyze_image_with_vlm for asyncio servers: takes the decoded image
+    (no temp file) and awaits the VLM call on a shared AsyncGroq client.
+    
+    Returns:
+        tuple: (fake_probability, verdict, reason, details)
+    """
+    base64_image = base64.standard_b64encode(image_bytes).decode("utf-8")
+    request = build_vlm_request(base64_image, media_type, context)
+
+    try:
+        with groq_call("image", "vlm"):
+            response = await client.chat.completions.create(**request)
+            return parse_vlm_reply(response)
+    
+    except Exception as e:
+        print(f"[VLM ERROR] {e}")
+        return 50, "error", f"VLM analysis failed: {str(e)}", {}
+
+
+def build_image_result(image_path, fake_prob, verdict, reason, details):
     if fake_prob >= 70:
         classification = "FAKE"
     elif fake_prob >= 40:
@@ -151,4 +169,34 @@ def classify_image(image_path, api_key, context=""):
         "reason": reason,
         "detected_issues": details.get("detected_issues", []),
         "confidence": details.get("confidence", "medium")
-    }
\ No newline at end of file
+    }
+
+
+def classify_image(image_path, api_key, context=""):
+    """
+    Main function - call this from your code
+    
+    Args:
+        image_path (str): Path to uploaded JPG/PNG file
+        api_key (str): Groq API key
+        context (str): Optional context (tweet text, caption)
+    
+    Returns:
+        dict: classification result
+    """
+    # Analyze with VLM
+    fake_prob, verdict, reason, details = analyze_image_with_vlm(image_path, api_key, context)
+    
+    # Final classification
+    return build_image_result(image_path, fake_prob, verdict, reason, details)
+
+
+async def classify_image_bytes_async(image_bytes, client, context=""):
+    """
+    classify_image on an AsyncGroq client for an already decoded image
+    
+    Returns:
+        dict: same shape as classify_image ("image_path" is None: nothing is written to disk)
+    """
+    fake_prob, verdict, reason, details = await analyze_image_bytes_with_vlm_async(image_bytes, client, context)
+    return build_image_result(None, fake_prob, verdict, reason, details)
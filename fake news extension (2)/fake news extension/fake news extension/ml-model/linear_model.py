@@ -0,0 +1,170 @@
+import math
+import zlib
+import numpy as np
+
+# ========== SPARSE HASHED FEATURES ==========
+#
+# A batch of examples is kept as three flat arrays (COO layout):
+#   rows[k], cols[k], vals[k]  ->  X[rows[k], cols[k]] += vals[k]
+# Hashed n-grams take columns [0, 2**hash_bits); dense features are appended
+# after them at [2**hash_bits, 2**hash_bits + n_dense).
+
+
+def hash_features(grams, hash_bits):
+    """Stable (process-independent) hashed column ids for a list of string n-grams."""
+    mask = (1 << hash_bits) - 1
+    return [zlib.crc32(g.encode("utf-8")) & mask for g in grams]
+
+
+def word_ngrams(tokens, n_max=2):
+    grams = list(tokens)
+    for n in range(2, n_max + 1):
+        grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def char_ngrams(text, n_min=3, n_max=5):
+    grams = []
+    for n in range(n_min, n_max + 1):
+        grams.extend(text[i:i + n] for i in range(len(text) - n + 1))
+    return grams
+
+
+def build_batch(hashed_rows, dense_rows, hash_bits):
+    """
+    Assemble a COO batch from per-example hashed ids and dense feature vectors.
+
+    Args:
+        hashed_rows (list[list[int]]): hashed column ids per example (repeats add up)
+        dense_rows (np.ndarray): (n, n_dense) dense features, already scaled
+        hash_bits (int): size of the hashed space
+
+    Returns:
+        (rows, cols, vals, n_rows)
+    """
+    n = len(hashed_rows)
+    lengths = np.fromiter((len(h) for h in hashed_rows), dtype=np.int64, count=n)
+    hashed_cols = np.fromiter((c for h in hashed_rows for c in h), dtype=np.int64, count=int(lengths.sum()))
+    hashed_rows_idx = np.repeat(np.arange(n, dtype=np.int64), lengths)
+
+    # l2-normalise hashed counts per example so long texts don't dominate
+    norms = np.sqrt(np.maximum(lengths, 1)).astype(np.float32)
+    hashed_vals = (1.0 / norms)[hashed_rows_idx]
+
+    dense_rows = np.asarray(dense_rows, dtype=np.float32).reshape(n, -1)
+    n_dense = dense_rows.shape[1]
+    dense_idx = np.repeat(np.arange(n, dtype=np.int64), n_dense)
+    dense_cols = np.tile(np.arange(n_dense, dtype=np.int64) + (1 << hash_bits), n)
+
+    rows = np.concatenate([hashed_rows_idx, dense_idx])
+    cols = np.concatenate([hashed_cols, dense_cols])
+    vals = np.concatenate([hashed_vals, dense_rows.ravel()]).astype(np.float32)
+    return rows, cols, vals, n
+
+
+# ========== LOGISTIC REGRESSION ==========
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def _logits(weights, bias, rows, cols, vals, n_rows):
+    return np.bincount(rows, weights=weights[cols] * vals, minlength=n_rows) + bias
+
+
+def train_logistic_regression(batch, y, dim, epochs=300, lr=0.1, l2=1e-4, sample_weight=None):
+    """
+    Full-batch Adam on the log loss. Targets may be soft (0..1).
+
+    Returns:
+        (weights float32[dim], bias float)
+    """
+    rows, cols, vals, n_rows = batch
+    y = np.asarray(y, dtype=np.float64)
+    sw = np.ones(n_rows) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+    sw = sw / sw.sum()
+
+    w = np.zeros(dim)
+    b = 0.0
+    m_w, v_w = np.zeros(dim), np.zeros(dim)
+    m_b = v_b = 0.0
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    for t in range(1, epochs + 1):
+        err = (_sigmoid(_logits(w, b, rows, cols, vals, n_rows)) - y) * sw
+        g_w = np.bincount(cols, weights=err[rows] * vals, minlength=dim) + l2 * w
+        g_b = err.sum()
+
+        m_w = beta1 * m_w + (1 - beta1) * g_w
+        v_w = beta2 * v_w + (1 - beta2) * g_w * g_w
+        m_b = beta1 * m_b + (1 - beta1) * g_b
+        v_b = beta2 * v_b + (1 - beta2) * g_b * g_b
+        corr1, corr2 = 1 - beta1 ** t, 1 - beta2 ** t
+        w -= lr * (m_w / corr1) / (np.sqrt(v_w / corr2) + eps)
+        b -= lr * (m_b / corr1) / (np.sqrt(v_b / corr2) + eps)
+
+    return w.astype(np.float32), float(b)
+
+
+def log_loss(y, p):
+    p = np.clip(p, 1e-7, 1 - 1e-7)
+    y = np.asarray(y, dtype=np.float64)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+# ========== MODEL ARTIFACT ==========
+
+class LinearModel:
+    """Hashed-feature logistic regression loaded from the model registry."""
+
+    def __init__(self, weights, bias, dense_mean, dense_scale, meta):
+        self.weights = weights
+        self.bias = float(bias)
+        self.dense_mean = dense_mean
+        self.dense_scale = dense_scale
+        self.meta = meta
+        self.hash_bits = int(meta["hash_bits"])
+        # Fold the dense standardisation into the weights for single-example scoring
+        dense_w = weights[(1 << self.hash_bits):].astype(np.float64) / dense_scale
+        self._dense_w = dense_w.tolist()
+        self._dense_bias = self.bias - float(np.dot(dense_mean, dense_w))
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Build from registry arrays; weights may stay memory-mapped"""
+        return cls(
+            arrays["weights"],
+            float(arrays["bias"][0]),
+            np.asarray(arrays["dense_mean"]),
+            np.asarray(arrays["dense_scale"]),
+            meta,
+        )
+
+    def scale_dense(self, dense):
+        return (np.asarray(dense, dtype=np.float32) - self.dense_mean) / self.dense_scale
+
+    def predict_proba_batch(self, batch):
+        rows, cols, vals, n_rows = batch
+        return _sigmoid(_logits(self.weights, self.bias, rows, cols, vals, n_rows))
+
+    def predict_proba_dense(self, dense):
+        """Vectorized scoring for models without hashed features: (n, n_dense) -> (n,)"""
+        w = self.weights[(1 << self.hash_bits):]
+        return _sigmoid(self.scale_dense(dense) @ w + self.bias)
+
+    def predict_proba_one(self, hashed, dense):
+        """Single example without building a batch: returns P(fake/malicious)."""
+        z = self._dense_bias + sum(w * x for w, x in zip(self._dense_w, dense) if x)
+        if hashed:
+            z += float(self.weights[hashed].sum()) / math.sqrt(len(hashed))
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+
+def linear_model_arrays(weights, bias, dense_mean, dense_scale):
+    """Arrays to hand to model_registry.save_model"""
+    return {
+        "weights": np.asarray(weights, dtype=np.float32),
+        "bias": np.asarray([bias], dtype=np.float32),
+        "dense_mean": np.asarray(dense_mean, dtype=np.float32),
+        "dense_scale": np.asarray(dense_scale, dtype=np.float32),
+    }
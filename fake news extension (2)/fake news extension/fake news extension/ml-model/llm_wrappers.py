@@ -1,5 +1,6 @@
 import os
 import base64
+import asyncio
 import tempfile
 from dotenv import load_dotenv
 
@@ -7,30 +8,43 @@ from dotenv import load_dotenv
 load_dotenv()
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
 
+# ml-model is not an importable package (hyphenated name), so siblings are
+# imported by module name; app.py puts this directory on sys.path.
 try:
-    from .groq_llm_with_regex_percentage import compute_regex_percent
+    from groq_llm_with_regex_percentage import compute_regex_percent
 except Exception:
     compute_regex_percent = None
 
 try:
-    from .groq_llm_fake_news import classify_with_groq_percentage
+    from groq_llm_fake_news import classify_with_groq_percentage, classify_with_groq_percentage_async
 except Exception:
-    classify_with_groq_percentage = None
+    classify_with_groq_percentage = classify_with_groq_percentage_async = None
 
 try:
-    from .profile_classifier import classify_profile as profile_classify
+    from profile_classifier import classify_profile as profile_classify
+    from profile_classifier import classify_profile_async as profile_classify_async
 except Exception:
-    profile_classify = None
+    profile_classify = profile_classify_async = None
 
 try:
-    from .url_classifier import classify_url as url_classify
+    from url_classifier import classify_url as url_classify
+    from url_classifier import classify_url_async as url_classify_async
 except Exception:
-    url_classify = None
+    url_classify = url_classify_async = None
 
 try:
-    from .image_classifier import classify_image as image_classify
+    from image_classifier import classify_image as image_classify
+    from image_classifier import classify_image_bytes_async as image_classify_async
 except Exception:
-    image_classify = None
+    image_classify = image_classify_async = None
+
+from metrics import stage_timer
+
+try:
+    from cascade import CASCADE_ENABLED, cascade_decision, decided_score
+except Exception:
+    CASCADE_ENABLED = False
+    cascade_decision = decided_score = None
 
 
 def score_to_label(score: float):
@@ -41,34 +55,59 @@ def score_to_label(score: float):
     return 'REAL'
 
 
-def classify_tweet(text: str):
-    """Return dict: {'fake_percent', 'reason', 'classification'}"""
-    # Use regex percent if available
+def _tweet_regex(text: str, verified: bool, cascade, doc=None):
+    """Regex percent, tags and (with the cascade on) a finished result when the LLM can be skipped"""
     regex_percent = 0.0
     regex_tags = []
+    regex_ok = False
     if compute_regex_percent:
         try:
-            _, regex_percent, regex_tags = compute_regex_percent(text)
+            with stage_timer('tweet', 'regex'):
+                if doc is not None:
+                    _, regex_percent, regex_tags = doc.regex(compute_regex_percent)
+                else:
+                    _, regex_percent, regex_tags = compute_regex_percent(text)
+            regex_ok = True
         except Exception:
             regex_percent = 0.0
 
+    if regex_ok and cascade_decision and (CASCADE_ENABLED if cascade is None else cascade):
+        decision = cascade_decision('tweet', regex_percent, [] if verified else ['unverified_author'])
+        if decision is not None:
+            fake_percent = decided_score('tweet', decision, regex_percent)
+            return regex_percent, regex_tags, _tweet_result(fake_percent, f'regex_cascade_{decision}')
+    return regex_percent, regex_tags, None
+
+
+def _tweet_result(fake_percent, reason):
+    return {
+        'fake_percent': fake_percent,
+        'reason': reason,
+        'classification': score_to_label(fake_percent)
+    }
+
+
+def classify_tweet(text: str, verified: bool = False, cascade: bool = None, doc=None):
+    """Return dict: {'fake_percent', 'reason', 'classification'}
+
+    With the cascade on, a tweet with zero regex hits from a verified author or
+    a decisive regex percent is answered without calling the LLM. doc is the
+    request's AnalyzedDocument for text, if there is one; its regex result is reused.
+    """
+    # Use regex percent if available
+    regex_percent, regex_tags, decided = _tweet_regex(text, verified, cascade, doc)
+    if decided is not None:
+        return decided
+
     if classify_with_groq_percentage and GROQ_API_KEY:
         try:
             fake_percent, reason = classify_with_groq_percentage(text, regex_percent, ','.join(regex_tags))
-            return {
-                'fake_percent': fake_percent,
-                'reason': reason,
-                'classification': score_to_label(fake_percent)
-            }
+            return _tweet_result(fake_percent, reason)
         except Exception:
             pass
 
     # Fallback: use regex_percent
-    return {
-        'fake_percent': regex_percent,
-        'reason': 'regex_fallback',
-        'classification': score_to_label(regex_percent)
-    }
+    return _tweet_result(regex_percent, 'regex_fallback')
 
 
 def classify_profile(profile: dict):
@@ -90,11 +129,11 @@ def classify_profile(profile: dict):
     }
 
 
-def classify_url(url: str):
+def classify_url(url: str, doc=None):
     """Return dict from url classifier wrapper"""
     if url_classify and GROQ_API_KEY:
         try:
-            return url_classify(url, GROQ_API_KEY)
+            return url_classify(url, GROQ_API_KEY, doc=doc)
         except Exception:
             pass
 
@@ -120,7 +159,8 @@ def classify_image_base64(image_b64: str, context: str = ''):
         return {'classification': 'UNKNOWN', 'fake_probability': 50, 'reason': 'no_model_available'}
 
     try:
-        b = base64.b64decode(image_b64.split(',')[-1])
+        with stage_timer('image', 'decode'):
+            b = base64.b64decode(image_b64.split(',')[-1])
         with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tf:
             tf.write(b)
             temp_path = tf.name
@@ -133,3 +173,86 @@ def classify_image_base64(image_b64: str, context: str = ''):
         return res
     except Exception as e:
         return {'classification': 'ERROR', 'fake_probability': 50, 'reason': str(e)}
+
+
+# ========== ASYNC VARIANTS (asgi_app.py) ==========
+#
+# Same results and fallbacks as the functions above, for an asyncio server:
+# regex/feature work runs in the loop's default executor and the LLM calls are
+# awaited on one shared groq.AsyncGroq client (None means "no API key").
+
+
+async def classify_tweet_async(text: str, client, verified: bool = False, cascade: bool = None, doc=None):
+    """classify_tweet with the LLM call awaited on `client`"""
+    regex_percent, regex_tags, decided = await asyncio.to_thread(_tweet_regex, text, verified, cascade, doc)
+    if decided is not None:
+        return decided
+
+    if classify_with_groq_percentage_async and client is not None:
+        try:
+            fake_percent, reason = await classify_with_groq_percentage_async(
+                text, regex_percent, ','.join(regex_tags), client)
+            return _tweet_result(fake_percent, reason)
+        except Exception:
+            pass
+
+    return _tweet_result(regex_percent, 'regex_fallback')
+
+
+async def classify_profile_async(profile: dict, client):
+    """classify_profile with the LLM call awaited on `client`"""
+    if profile_classify_async and client is not None:
+        try:
+            return await profile_classify_async(profile, client)
+        except Exception:
+            pass
+
+    return {
+        'classification': 'UNKNOWN',
+        'fake_probability': 50,
+        'reason': 'no_model_available',
+        'regex_score': 0,
+        'matched_tags': [],
+        'behavioral_flags': []
+    }
+
+
+async def classify_url_async(url: str, client, doc=None):
+    """classify_url with the LLM call awaited on `client`"""
+    if url_classify_async and client is not None:
+        try:
+            return await url_classify_async(url, client, doc=doc)
+        except Exception:
+            pass
+
+    return {
+        'url': url,
+        'classification': 'UNKNOWN',
+        'malicious_probability': 50,
+        'threat_type': 'unknown',
+        'reason': 'no_model_available',
+        'regex_score': 0,
+        'matched_tags': [],
+        'red_flags': [],
+        'url_features': {}
+    }
+
+
+def _decode_image(image_b64: str):
+    with stage_timer('image', 'decode'):
+        return base64.b64decode(image_b64.split(',')[-1])
+
+
+async def classify_image_base64_async(image_b64: str, client, context: str = ''):
+    """classify_image_base64 without the temp file; the VLM call is awaited on `client`"""
+    if not image_b64:
+        return {'classification': 'UNKNOWN', 'fake_probability': 50, 'reason': 'no_image'}
+
+    if not image_classify_async or client is None:
+        return {'classification': 'UNKNOWN', 'fake_probability': 50, 'reason': 'no_model_available'}
+
+    try:
+        b = await asyncio.to_thread(_decode_image, image_b64)
+        return await image_classify_async(b, client, context)
+    except Exception as e:
+        return {'classification': 'ERROR', 'fake_probability': 50, 'reason': str(e)}
@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import tempfile
+import threading
+import numpy as np
+
+# ========== REGISTRY LAYOUT ==========
+#
+#   models/
+#     manifest.json                      <- small JSON index (atomically replaced)
+#     text_classifier/v3/weights.npy     <- one .npy per array, mmap-able
+#     text_classifier/v3/bias.npy
+#     ...
+#
+# manifest.json:
+#   {"format_version": 1, "version": 7,
+#    "models": {"text_classifier": {"version": 3, "path": "text_classifier/v3",
+#                                   "arrays": ["weights", ...], "meta": {...}}}}
+#
+# .npy files are opened with np.load(mmap_mode='r'): nothing is unpickled,
+# pages are only read when touched, and forked workers share them through
+# the OS page cache instead of each holding a private copy.
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+# MODEL_MMAP=0 reads arrays fully into private memory instead of mapping them
+MODEL_MMAP = os.environ.get("MODEL_MMAP", "1").lower() not in ("0", "false", "no", "off")
+
+# Older versions kept on disk after a save (for rollback / in-flight readers)
+KEEP_VERSIONS = 3
+
+# model name -> (module, wrapper class); the wrapper takes a LinearModel
+MODEL_WRAPPERS = {
+    "text_classifier": ("text_model", "TextModel"),
+    "url_classifier": ("url_model", "UrlModel"),
+    "profile_classifier": ("profile_model", "ProfileModel"),
+}
+
+
+def _read_manifest(model_dir):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"format_version": FORMAT_VERSION, "version": 0, "models": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model manifest format: {manifest.get('format_version')}")
+    return manifest
+
+
+def _write_manifest(model_dir, manifest):
+    fd, tmp = tempfile.mkstemp(prefix=".manifest-", suffix=".json", dir=model_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(model_dir, MANIFEST_NAME))
+
+
+def save_model(name, arrays, meta, model_dir=DEFAULT_MODEL_DIR):
+    """
+    Write a new version of a model and point the manifest at it.
+
+    Args:
+        name (str): registry name, e.g. "text_classifier"
+        arrays (dict[str, np.ndarray]): numeric arrays (no object dtype)
+        meta (dict): JSON-serializable metadata (feature names, training stats)
+
+    Returns:
+        int: the new model version
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    manifest = _read_manifest(model_dir)
+    entry = manifest["models"].get(name, {})
+    version = int(entry.get("version", 0)) + 1
+    rel_path = f"{name}/v{version}"
+    abs_path = os.path.join(model_dir, rel_path)
+    os.makedirs(abs_path, exist_ok=True)
+
+    for key, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype == object:
+            raise TypeError(f"Array '{key}' has object dtype; only numeric arrays are stored")
+        np.save(os.path.join(abs_path, f"{key}.npy"), arr, allow_pickle=False)
+
+    manifest["models"][name] = {
+        "version": version,
+        "path": rel_path,
+        "arrays": sorted(arrays),
+        "meta": meta,
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    manifest["version"] = int(manifest.get("version", 0)) + 1
+    _write_manifest(model_dir, manifest)
+    _prune_versions(model_dir, name, version)
+    return version
+
+
+def _prune_versions(model_dir, name, current):
+    import shutil
+
+    root = os.path.join(model_dir, name)
+    for entry in os.listdir(root):
+        if entry.startswith("v") and entry[1:].isdigit() and int(entry[1:]) <= current - KEEP_VERSIONS:
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+
+def load_arrays(entry, model_dir=DEFAULT_MODEL_DIR, mmap=None):
+    """Open every array of a manifest entry (memory-mapped, read-only by default)."""
+    mmap = MODEL_MMAP if mmap is None else mmap
+    base = os.path.join(model_dir, entry["path"])
+    return {
+        key: np.load(os.path.join(base, f"{key}.npy"), mmap_mode="r" if mmap else None, allow_pickle=False)
+        for key in entry["arrays"]
+    }
+
+
+class ModelRegistry:
+    """Lazy, thread-safe access to the models listed in manifest.json."""
+
+    def __init__(self, model_dir=DEFAULT_MODEL_DIR, mmap=None):
+        self.model_dir = model_dir
+        self.mmap = MODEL_MMAP if mmap is None else mmap
+        self.manifest = _read_manifest(model_dir)
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.manifest.get("version", 0)
+
+    def available(self, name):
+        return name in self.manifest["models"]
+
+    def loaded(self):
+        return sorted(self._models)
+
+    def get(self, name):
+        """Return the wrapped model, loading it on first use; None if not registered."""
+        model = self._models.get(name)
+        if model is not None or not self.available(name):
+            return model
+
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._build(name)
+            return self._models[name]
+
+    def _build(self, name):
+        from linear_model import LinearModel
+
+        entry = self.manifest["models"][name]
+        linear = LinearModel.from_arrays(load_arrays(entry, self.model_dir, self.mmap), entry["meta"])
+        module_name, class_name = MODEL_WRAPPERS.get(name, (None, None))
+        if module_name is None:
+            return linear
+        return getattr(importlib.import_module(module_name), class_name)(linear)
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "models": {k: v["version"] for k, v in self.manifest["models"].items()},
+            "loaded": self.loaded(),
+        }
+
+
+# ========== STARTUP / RSS REPORT ==========
+
+
+def _memory_kib():
+    """(rss, private, shared) in KiB from /proc; zeros where unavailable."""
+    rss = private = shared = 0
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                kib = int(rest.split()[0]) if rest.split() else 0
+                if key == "Rss":
+                    rss = kib
+                elif key in ("Private_Clean", "Private_Dirty"):
+                    private += kib
+                elif key in ("Shared_Clean", "Shared_Dirty"):
+                    shared += kib
+    except (OSError, ValueError, IndexError):
+        pass
+    return rss, private, shared
+
+
+def _report_child(mode):
+    """Runs in a subprocess: construct the detector and score one item per model."""
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, app_dir)
+    before = _memory_kib()
+
+    start = time.perf_counter()
+    import app  # noqa: F401  (module import constructs the detector)
+    detector = app.detector
+    if mode == "eager":
+        detector.load_models()
+    startup = time.perf_counter() - start
+    after_start = _memory_kib()
+
+    start = time.perf_counter()
+    detector.analyze_text("BREAKING: shocking truth revealed!!!")
+    detector.analyze_url("http://g00gle-login.xyz/signin/verify")
+    detector.analyze_profile({"username": "crypto_king123", "followers": 150, "following": 8000})
+    first_use = time.perf_counter() - start
+    after_use = _memory_kib()
+
+    print(json.dumps({
+        "mode": mode,
+        "startup_s": round(startup, 4),
+        "first_use_s": round(first_use, 4),
+        "rss_kib_baseline": before[0],
+        "rss_kib_after_startup": after_start[0],
+        "rss_kib_after_first_use": after_use[0],
+        "private_kib_after_first_use": after_use[1],
+        "shared_kib_after_first_use": after_use[2],
+    }))
+
+
+def report():
+    """Compare eager in-memory loading with lazy mmap loading in fresh processes."""
+    import subprocess
+
+    results = []
+    for mode, mmap in (("eager", "0"), ("lazy", "1")):
+        env = dict(os.environ, MODEL_MMAP=mmap)
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--report-child", mode],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    for r in results:
+        print(json.dumps(r, indent=2))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the model registry / report startup time and RSS")
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--report", action="store_true", help="eager vs lazy startup time and RSS")
+    parser.add_argument("--report-child", choices=["eager", "lazy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.report_child:
+        _report_child(args.report_child)
+    elif args.report:
+        report()
+    else:
+        print(json.dumps(_read_manifest(args.model_dir), indent=2))
+
+
+if __name__ == "__main__":
+    main()
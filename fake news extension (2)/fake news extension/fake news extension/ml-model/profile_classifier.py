@@ -1,8 +1,14 @@
 import re
 import os
 import json
+import math
+import asyncio
 from groq import Groq
 
+from cascade import CASCADE_ENABLED, cascade_decision, decided_score
+from metrics import stage_timer, groq_call
+from verdict_cache import get_cache, request_source
+
 # ========== REGEX PATTERNS ==========
 
 USERNAME_REGEX = {
@@ -53,8 +59,36 @@ URL_REGEX = {
     "url_fake_support_like": r"https?://[A-Za-z0-9\.\-]+/(support|helpdesk|customerservice|customer-support)",
 }
 
+# API / dataset keys -> keys used by the behavioral checks and the prompt
+PROFILE_KEY_ALIASES = {
+    "followers": "followers_count",
+    "following": "following_count",
+    "tweets": "tweet_count",
+}
+
+# ========== VERDICT CACHE ==========
+
+# The same author shows up on many tweets of a timeline. Results are cached
+# per username together with a fingerprint of everything that feeds the
+# analysis; while the fingerprint matches, the cached result is returned and
+# nothing is re-run. Counts are bucketed (one bucket per factor of about 1.4)
+# so a few new followers don't invalidate the entry, and the account age only
+# matters through the thresholds the behavioral checks use.
+PROFILE_VERDICT_CACHE = get_cache("profile")
+
+LLM_ERROR_REASON = "LLM error, using regex score"
+
 # ========== CORE FUNCTIONS ==========
 
+def normalize_profile(profile):
+    """Accept both API/dataset keys (followers, following, tweets) and *_count keys"""
+    profile = dict(profile)
+    for alias, key in PROFILE_KEY_ALIASES.items():
+        if key not in profile and alias in profile:
+            profile[key] = profile[alias]
+    return profile
+
+
 def check_regex_patterns(profile):
     """Run all regex patterns and return matched tags + score"""
     matched_tags = []
@@ -120,10 +154,8 @@ def check_behavioral_signals(profile):
     return flags
 
 
-def classify_with_groq(profile, regex_score, tags, behavioral_flags, api_key):
-    """Send to Groq LLM for final classification"""
-    client = Groq(api_key=api_key)
-    
+def build_groq_request(profile, regex_score, tags, behavioral_flags):
+    """chat.completions.create() arguments for one profile (shared by the sync and async clients)"""
     profile_summary = f"""
 Username: {profile.get('username', '')}
 Display Name: {profile.get('display_name', '')}
@@ -148,25 +180,178 @@ BEHAVIORAL FLAGS: {', '.join(behavioral_flags) if behavioral_flags else 'None'}
 Respond ONLY with JSON (no markdown):
 {{"fake_probability": <0-100>, "reason": "<1-2 sentence explanation>"}}"""
     
+    return {
+        "model": "llama-3.1-8b-instant",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.1,
+        "max_tokens": 200,
+    }
+
+
+# Model and prompt behind this module's LLM verdicts (cache_warmer loads only matching rows)
+VERDICT_SOURCE = request_source(build_groq_request({"username": "source_probe"}, 0.0, [], []))
+
+
+def parse_groq_reply(response):
+    """(fake_probability, reason) from a chat completion; raises on invalid JSON"""
+    result = response.choices[0].message.content.strip()
+    result = result.replace("```json", "").replace("```", "").strip()
+    data = json.loads(result)
+    return data.get("fake_probability", 50), data.get("reason", "No reason")
+
+
+def classify_with_groq(profile, regex_score, tags, behavioral_flags, api_key):
+    """Send to Groq LLM for final classification"""
+    client = Groq(api_key=api_key)
+    request = build_groq_request(profile, regex_score, tags, behavioral_flags)
+    
+    try:
+        with groq_call("profile"):
+            response = client.chat.completions.create(**request)
+            return parse_groq_reply(response)
+    
+    except Exception as e:
+        print(f"[LLM ERROR] {e}")
+        return regex_score, LLM_ERROR_REASON
+
+
+async def classify_with_groq_async(profile, regex_score, tags, behavioral_flags, client):
+    """classify_with_groq on a shared AsyncGroq client"""
+    request = build_groq_request(profile, regex_score, tags, behavioral_flags)
+    
     try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=200,
-        )
-        
-        result = response.choices[0].message.content.strip()
-        result = result.replace("```json", "").replace("```", "").strip()
-        data = json.loads(result)
-        return data.get("fake_probability", 50), data.get("reason", "No reason")
+        with groq_call("profile"):
+            response = await client.chat.completions.create(**request)
+            return parse_groq_reply(response)
     
     except Exception as e:
         print(f"[LLM ERROR] {e}")
-        return regex_score, "LLM error, using regex score"
+        return regex_score, LLM_ERROR_REASON
+
+
+def count_bucket(value):
+    """Coarse size class of a follower/following/tweet count (0 for none, then ~x1.4 steps)"""
+    try:
+        n = float(value or 0)
+    except (TypeError, ValueError):
+        return str(value)
+    if not math.isfinite(n):
+        return str(n)
+    return 0 if n < 1 else int(math.log2(n) * 2) + 1
+
+
+def _age_bucket(value):
+    try:
+        days = float(value or 365)
+    except (TypeError, ValueError):
+        return str(value)
+    if not math.isfinite(days):
+        return str(days)
+    if days < 30:
+        return "under_30"
+    if days < 90:
+        return "under_90"
+    return count_bucket(days)
+
+
+def profile_cache_key(profile, cascade=None):
+    """
+    Returns:
+        (username key, fingerprint) for the profile verdict cache, or (None, None) without a username
+    """
+    profile = normalize_profile(profile)
+    username = str(profile.get("username", "") or "").strip().lstrip("@").lower()
+    if not username:
+        return None, None
+    fingerprint = (
+        str(profile.get("display_name", "") or ""),
+        str(profile.get("bio", "") or ""),
+        str(profile.get("url", "") or ""),
+        count_bucket(profile.get("followers_count", 0)),
+        count_bucket(profile.get("following_count", 0)),
+        count_bucket(profile.get("tweet_count", 0)),
+        _age_bucket(profile.get("account_age_days", 365)),
+        bool(profile.get("verified", False)),
+        bool(profile.get("has_profile_image", True)),
+        bool(profile.get("has_banner", True)),
+        bool(CASCADE_ENABLED if cascade is None else cascade),
+    )
+    return username, fingerprint
+
+
+def _copy_result(result):
+    return dict(result, matched_tags=list(result["matched_tags"]), behavioral_flags=list(result["behavioral_flags"]))
+
+
+def cached_result(profile, cascade=None):
+    """
+    Returns:
+        tuple: (cached result copy or None, username key, fingerprint);
+        the key is None when the profile can't be fingerprinted (scored uncached)
+    """
+    try:
+        username, fingerprint = profile_cache_key(profile, cascade)
+    except Exception as e:
+        print(f"[CACHE] profile fingerprint failed, scoring uncached: {e}")
+        return None, None, None
+    if username is None:
+        return None, None, None
+    entry = PROFILE_VERDICT_CACHE.get(username, valid=lambda e: e[0] == fingerprint)
+    if entry is None:
+        return None, username, fingerprint
+    return _copy_result(entry[1]), username, fingerprint
+
+
+def store_result(username, fingerprint, result):
+    """Cache a result under the username (LLM errors are not cached)"""
+    if username is not None and result["reason"] != LLM_ERROR_REASON:
+        PROFILE_VERDICT_CACHE.put(username, (fingerprint, _copy_result(result)))
 
 
-def classify_profile(profile, api_key):
+def score_profile_signals(profile, cascade=None):
+    """
+    CPU half of classify_profile: normalization, regex, behavioral signals and
+    the cascade decision (no network)
+    
+    Returns:
+        tuple: (profile, regex_score, tags, behavioral_flags, decision) - decision is None when the LLM is needed
+    """
+    profile = normalize_profile(profile)
+
+    # Step 1: Regex analysis
+    with stage_timer("profile", "regex"):
+        regex_score, tags = check_regex_patterns(profile)
+    
+    # Step 2: Behavioral analysis
+    with stage_timer("profile", "features"):
+        behavioral_flags = check_behavioral_signals(profile)
+    
+    # Step 3: cascade - are the cheap signals decisive on their own?
+    decision = None
+    if CASCADE_ENABLED if cascade is None else cascade:
+        decision = cascade_decision("profile", regex_score, behavioral_flags)
+    return profile, regex_score, tags, behavioral_flags, decision
+
+
+def build_profile_result(regex_score, tags, behavioral_flags, fake_prob, reason):
+    if fake_prob >= 70:
+        classification = "FAKE"
+    elif fake_prob >= 40:
+        classification = "SUSPICIOUS"
+    else:
+        classification = "REAL"
+    
+    return {
+        "classification": classification,
+        "fake_probability": fake_prob,
+        "reason": reason,
+        "regex_score": round(regex_score, 1),
+        "matched_tags": tags,
+        "behavioral_flags": behavioral_flags,
+    }
+
+
+def classify_profile(profile, api_key, cascade=None):
     """
     Main classification function - call this from your code
     
@@ -176,6 +361,8 @@ def classify_profile(profile, api_key):
             - followers_count, following_count, tweet_count
             - account_age_days, has_profile_image, has_banner, verified
         api_key (str): Groq API key
+        cascade (bool): skip the LLM when regex + behavioral signals are decisive
+                        (defaults to the CASCADE_MODE env setting)
     
     Returns:
         dict: {
@@ -187,28 +374,48 @@ def classify_profile(profile, api_key):
             "behavioral_flags": [...]
         }
     """
-    # Step 1: Regex analysis
-    regex_score, tags = check_regex_patterns(profile)
-    
-    # Step 2: Behavioral analysis
-    behavioral_flags = check_behavioral_signals(profile)
+    cached, username, fingerprint = cached_result(profile, cascade)
+    if cached is not None:
+        return cached
+
+    profile, regex_score, tags, behavioral_flags, decision = score_profile_signals(profile, cascade)
+
+    # Step 4: LLM classification (skipped when the cascade finds the cheap signals decisive)
+    if decision is None:
+        fake_prob, reason = classify_with_groq(profile, regex_score, tags, behavioral_flags, api_key)
+    else:
+        fake_prob = decided_score("profile", decision, regex_score)
+        reason = f"Decided by regex cascade ({decision}), LLM skipped"
     
-    # Step 3: LLM classification
-    fake_prob, reason = classify_with_groq(profile, regex_score, tags, behavioral_flags, api_key)
+    result = build_profile_result(regex_score, tags, behavioral_flags, fake_prob, reason)
+    store_result(username, fingerprint, result)
+    return result
+
+
+async def classify_profile_async(profile, client, cascade=None, signals=None):
+    """
+    classify_profile for asyncio servers: the regex half runs in a worker
+    thread (the loop's default executor) and the LLM call is awaited on `client`.
+    signals: score_profile_signals(profile, cascade) computed beforehand
+    (e.g. in a worker process), so only the cache lookup and the LLM call are left.
     
-    # Step 4: Final classification
-    if fake_prob >= 70:
-        classification = "FAKE"
-    elif fake_prob >= 40:
-        classification = "SUSPICIOUS"
+    Returns:
+        dict: same shape as classify_profile
+    """
+    cached, username, fingerprint = cached_result(profile, cascade)
+    if cached is not None:
+        return cached
+
+    if signals is None:
+        signals = await asyncio.to_thread(score_profile_signals, profile, cascade)
+    profile, regex_score, tags, behavioral_flags, decision = signals
+
+    if decision is None:
+        fake_prob, reason = await classify_with_groq_async(profile, regex_score, tags, behavioral_flags, client)
     else:
-        classification = "REAL"
+        fake_prob = decided_score("profile", decision, regex_score)
+        reason = f"Decided by regex cascade ({decision}), LLM skipped"
     
-    return {
-        "classification": classification,
-        "fake_probability": fake_prob,
-        "reason": reason,
-        "regex_score": round(regex_score, 1),
-        "matched_tags": tags,
-        "behavioral_flags": behavioral_flags,
-    }
\ No newline at end of file
+    result = build_profile_result(regex_score, tags, behavioral_flags, fake_prob, reason)
+    store_result(username, fingerprint, result)
+    return result
@@ -0,0 +1,285 @@
+import os
+import math
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from profile_classifier import (
+    USERNAME_REGEX, DISPLAY_NAME_REGEX, BIO_REGEX, URL_REGEX,
+    normalize_profile, check_regex_patterns, check_behavioral_signals,
+)
+from model_registry import DEFAULT_MODEL_DIR, ModelRegistry, save_model
+from linear_model import (
+    LinearModel, build_batch, train_logistic_regression, log_loss,
+    linear_model_arrays,
+)
+
+# ============ CONFIG ============
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_CSV = os.path.join(BASE_DIR, "fake_profile_dataset.csv")
+MODEL_NAME = "profile_classifier"
+LABEL_COL = "label"
+TEST_FRACTION = 0.2
+
+# Dense-only model: no hashed text buckets
+HASH_BITS = 0
+
+COUNT_COLUMNS = ["followers_count", "following_count", "tweet_count", "account_age_days"]
+BOOL_COLUMNS = ["has_profile_image", "has_banner", "verified"]
+NUMERIC_FEATURES = (
+    [f"log_{c}" for c in COUNT_COLUMNS]
+    + ["log_follower_following_ratio", "log_tweets_per_day"]
+    + BOOL_COLUMNS
+    + ["regex_score"]
+)
+
+REGEX_TAGS = list(USERNAME_REGEX) + list(DISPLAY_NAME_REGEX) + list(BIO_REGEX) + list(URL_REGEX)
+BEHAVIORAL_FLAGS = [
+    "low_follower_ratio", "very_new_account", "new_account", "no_profile_image",
+    "no_banner", "low_activity", "mass_following",
+]
+
+
+def _rules_reloaded():
+    """
+    reloader hook: the profile_classifier rule packs were rebound. REGEX_TAGS is
+    only the tag list for the next training run; a loaded model keeps the one
+    it was trained on (meta["regex_tags"]).
+    """
+    global REGEX_TAGS
+    REGEX_TAGS = list(USERNAME_REGEX) + list(DISPLAY_NAME_REGEX) + list(BIO_REGEX) + list(URL_REGEX)
+
+# ========== FEATURES ==========
+
+
+def _as_bool(series, default):
+    if series.dtype == bool:
+        return series.to_numpy()
+    text = series.astype(str).str.strip().str.lower()
+    return np.where(series.isna(), default, text.isin(["true", "1", "yes"]))
+
+
+def profile_frame(profiles):
+    """Normalize a list of profile dicts or a DataFrame to the *_count column layout."""
+    if isinstance(profiles, pd.DataFrame):
+        df = profiles.rename(columns={"followers": "followers_count", "following": "following_count",
+                                      "tweets": "tweet_count"})
+    else:
+        df = pd.DataFrame([normalize_profile(p) for p in profiles])
+
+    for col in ("username", "display_name", "bio", "url"):
+        df[col] = df[col].fillna("").astype(str) if col in df.columns else ""
+    for col in COUNT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0) if col in df.columns else 0
+    for col, default in (("has_profile_image", True), ("has_banner", True), ("verified", False)):
+        df[col] = _as_bool(df[col], default) if col in df.columns else default
+    return df
+
+
+def _as_number(value):
+    """Scalar pd.to_numeric(errors="coerce").fillna(0), as profile_frame does per column"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(number) else number
+
+
+def _as_flag(value, default):
+    """Scalar _as_bool"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return default
+    return str(value).strip().lower() in ("true", "1", "yes")
+
+
+def profile_row(profile):
+    """One profile dict in profile_frame's layout and types, without building a DataFrame"""
+    row = normalize_profile(profile)
+    for col in ("username", "display_name", "bio", "url"):
+        value = row.get(col)
+        row[col] = "" if value is None or (isinstance(value, float) and math.isnan(value)) else str(value)
+    for col in COUNT_COLUMNS:
+        row[col] = _as_number(row.get(col))
+    for col, default in (("has_profile_image", True), ("has_banner", True), ("verified", False)):
+        row[col] = _as_flag(row.get(col), default)
+    return row
+
+
+def _numeric_features(counts, bools):
+    """NUMERIC_FEATURES except regex_score, for an (n, 4) count and (n, 3) flag array"""
+    followers, following, tweets, age = counts.T
+    return np.column_stack([
+        np.log1p(np.maximum(counts, 0)),
+        np.log1p(followers / np.maximum(following, 1)),
+        np.log1p(tweets / np.maximum(age, 1)),
+        bools,
+    ])
+
+
+def _signal_bits(record, tag_pos, flag_pos, tag_bits, flag_bits):
+    """Set one profile's regex tag and behavioral flag bits; returns its regex score (0-1)"""
+    score, tags = check_regex_patterns(record)
+    tag_bits[[tag_pos[t] for t in tags if t in tag_pos]] = 1.0
+    flag_bits[[flag_pos[f] for f in check_behavioral_signals(record) if f in flag_pos]] = 1.0
+    return score / 100.0
+
+
+def profile_feature_matrix(profiles, regex_tags=None, behavioral_flags=BEHAVIORAL_FLAGS):
+    """
+    Vectorized features for a batch of profiles.
+
+    Args:
+        regex_tags: tag columns of the bitmap; a trained model passes the list it was
+                    trained on (default: the current rule packs, for training)
+
+    Returns:
+        np.ndarray (n, len(regex_tags) + len(behavioral_flags) + len(NUMERIC_FEATURES))
+    """
+    regex_tags = REGEX_TAGS if regex_tags is None else regex_tags
+    df = profile_frame(profiles)
+    n = len(df)
+
+    numeric = _numeric_features(df[COUNT_COLUMNS].to_numpy(dtype=np.float64),
+                                df[BOOL_COLUMNS].to_numpy(dtype=np.float64))
+
+    # Regex + behavioral bitmaps (same rules the LLM prompt sees)
+    tag_pos = {t: i for i, t in enumerate(regex_tags)}
+    flag_pos = {f: i for i, f in enumerate(behavioral_flags)}
+    tag_bits = np.zeros((n, len(regex_tags)))
+    flag_bits = np.zeros((n, len(behavioral_flags)))
+    regex_scores = np.zeros(n)
+    for i, profile in enumerate(df.to_dict("records")):
+        regex_scores[i] = _signal_bits(profile, tag_pos, flag_pos, tag_bits[i], flag_bits[i])
+
+    return np.column_stack([tag_bits, flag_bits, numeric, regex_scores]).astype(np.float32)
+
+
+def _log1p(x):
+    # np.log1p without the exception: -inf at -1, NaN below
+    return math.log1p(x) if x > -1 else (-math.inf if x == -1 else math.nan)
+
+
+def _positions(names):
+    return {name: i for i, name in enumerate(names)}
+
+
+def _profile_vector(profile, tag_pos, flag_pos):
+    """profile_features with the bitmap positions prepared (ProfileModel keeps them)"""
+    row = profile_row(profile)
+    followers, following, tweets, age = (row[c] for c in COUNT_COLUMNS)
+    tag_bits = np.zeros(len(tag_pos))
+    flag_bits = np.zeros(len(flag_pos))
+    regex_score = _signal_bits(row, tag_pos, flag_pos, tag_bits, flag_bits)
+    numeric = (
+        [_log1p(max(row[c], 0.0)) for c in COUNT_COLUMNS]
+        + [_log1p(followers / max(following, 1.0)), _log1p(tweets / max(age, 1.0))]
+        + [float(row[c]) for c in BOOL_COLUMNS]
+        + [regex_score]
+    )
+    return np.concatenate([tag_bits, flag_bits, numeric]).astype(np.float32)
+
+
+def profile_features(profile, regex_tags=None, behavioral_flags=BEHAVIORAL_FLAGS):
+    """One row of profile_feature_matrix for a single profile dict, built without a DataFrame"""
+    regex_tags = REGEX_TAGS if regex_tags is None else regex_tags
+    return _profile_vector(profile, _positions(regex_tags), _positions(behavioral_flags))
+
+
+# ========== MODEL ==========
+
+class ProfileModel:
+    """Local profile classifier: P(fake) per profile, vectorized over batches."""
+
+    def __init__(self, linear: LinearModel):
+        self.linear = linear
+        # Bitmap layout the weights were trained on; rule reloads don't change it
+        self.regex_tags = linear.meta["regex_tags"]
+        self.behavioral_flags = linear.meta["behavioral_flags"]
+        self._tag_pos = _positions(self.regex_tags)
+        self._flag_pos = _positions(self.behavioral_flags)
+
+    def predict_proba_batch(self, profiles):
+        if len(profiles) == 0:
+            return np.zeros(0)
+        return self.linear.predict_proba_dense(
+            profile_feature_matrix(profiles, self.regex_tags, self.behavioral_flags))
+
+    def predict_proba(self, profile):
+        # Single profile on the request path: features straight into a vector, no DataFrame
+        return self.linear.predict_proba_one([], _profile_vector(profile, self._tag_pos, self._flag_pos))
+
+
+def load_profile_model(model_dir=DEFAULT_MODEL_DIR):
+    return ModelRegistry(model_dir).get(MODEL_NAME)
+
+
+# ========== TRAINING ==========
+
+
+def _fit(dense, y, epochs, l2):
+    dense_mean = dense.mean(axis=0)
+    dense_scale = dense.std(axis=0)
+    dense_scale[dense_scale == 0] = 1.0
+    batch = build_batch([[]] * len(dense), (dense - dense_mean) / dense_scale, HASH_BITS)
+    weights, bias = train_logistic_regression(batch, y, (1 << HASH_BITS) + dense.shape[1], epochs=epochs, l2=l2)
+    return weights, bias, dense_mean, dense_scale
+
+
+def train(input_csv=INPUT_CSV, model_dir=DEFAULT_MODEL_DIR, epochs=300, l2=1e-3, seed=0):
+    df = pd.read_csv(input_csv)
+    if LABEL_COL not in df.columns:
+        raise ValueError(f"Column '{LABEL_COL}' not found. Available: {df.columns.tolist()}")
+
+    dense = profile_feature_matrix(df)
+    y = df[LABEL_COL].astype(float).to_numpy()
+
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(df))
+    n_test = int(len(df) * TEST_FRACTION)
+    test_idx, train_idx = order[:n_test], order[n_test:]
+    w, b, mean, scale = _fit(dense[train_idx], y[train_idx], epochs, l2)
+    held_out = LinearModel(w, b, mean, scale, {"hash_bits": HASH_BITS})
+    test_probs = held_out.predict_proba_dense(dense[test_idx])
+    accuracy = float(np.mean((test_probs >= 0.5) == (y[test_idx] >= 0.5))) if n_test else float("nan")
+
+    weights, bias, dense_mean, dense_scale = _fit(dense, y, epochs, l2)
+    meta = {
+        "kind": "profile_classifier",
+        "hash_bits": HASH_BITS,
+        "regex_tags": REGEX_TAGS,
+        "behavioral_flags": BEHAVIORAL_FLAGS,
+        "numeric_features": NUMERIC_FEATURES,
+        "rows": len(df),
+        "holdout_accuracy": round(accuracy, 4),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    version = save_model(MODEL_NAME, linear_model_arrays(weights, bias, dense_mean, dense_scale), meta, model_dir)
+
+    model = load_profile_model(model_dir)
+    start = time.perf_counter()
+    probs = model.predict_proba_batch(df)
+    per_profile = (time.perf_counter() - start) / max(len(df), 1)
+    print(f"Rows: {len(df)}  held-out accuracy ({n_test} rows): {accuracy:.3f}")
+    print(f"Train log loss: {log_loss(y, probs):.4f}")
+    print(f"Batch inference: {per_profile * 1e6:.1f} µs/profile ({1 / per_profile:,.0f} profiles/s)")
+    print(f"[DONE] Saved profile model {MODEL_NAME} v{version} → {model_dir}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local profile classifier (numeric + regex/behavioral bitmaps)")
+    parser.add_argument("--input", default=INPUT_CSV)
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--l2", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    train(args.input, args.model_dir, args.epochs, args.l2, args.seed)
+
+
+if __name__ == "__main__":
+    main()
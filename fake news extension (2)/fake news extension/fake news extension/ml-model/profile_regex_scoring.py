@@ -1,7 +1,10 @@
 import re
 import os
+import argparse
 import pandas as pd
 
+from dataset_io import add_dataset_args, dataset_columns, stream_dataset
+
 # ========== 1. REGEX DICTS YOU GAVE ==========
 
 USERNAME_REGEX_EXTRA = {
@@ -173,51 +176,51 @@ def compute_profile_regex_score(username, display_name, bio, url):
     return matched_count, round(fake_percent, 2), matched
 
 
-def main():
-    # 👉 CHANGE THESE TO MATCH YOUR CSV COLUMN NAMES
-    INPUT_CSV = "profiles_extracted.csv"       # your input with profile info
-    OUTPUT_CSV = "profiles_with_regex_scores.csv"
-
-    USERNAME_COL = "username"
-    DISPLAY_NAME_COL = "display_name"
-    BIO_COL = "bio"
-    URL_COL = "url"        # can be profile link / website / first URL
+# 👉 CHANGE THESE TO MATCH YOUR CSV COLUMN NAMES
+INPUT_CSV = "profiles_extracted.csv"       # your input with profile info
+OUTPUT_CSV = "profiles_with_regex_scores.csv"
 
-    if not os.path.exists(INPUT_CSV):
-        raise FileNotFoundError(f"{INPUT_CSV} not found")
+USERNAME_COL = "username"
+DISPLAY_NAME_COL = "display_name"
+BIO_COL = "bio"
+URL_COL = "url"        # can be profile link / website / first URL
 
-    df = pd.read_csv(INPUT_CSV)
-
-    for col in [USERNAME_COL, DISPLAY_NAME_COL, BIO_COL]:
-        if col not in df.columns:
-            raise ValueError(f"Column '{col}' missing in CSV. Found: {df.columns.tolist()}")
-
-    # URL column is optional
-    if URL_COL not in df.columns:
-        df[URL_COL] = ""
 
+def profile_regex_columns(chunk, offset=0):
+    """profile_regex_match_count / profile_fake_percent / profile_regex_tags for a chunk of profiles"""
     match_counts = []
     fake_percents = []
     match_tags_list = []
-    
-
-    for _, row in df.iterrows():
-        username = row[USERNAME_COL]
-        display = row[DISPLAY_NAME_COL]
-        bio = row[BIO_COL]
-        url = row[URL_COL]
 
+    for username, display, bio, url in zip(chunk[USERNAME_COL], chunk[DISPLAY_NAME_COL], chunk[BIO_COL], chunk[URL_COL]):
         count, percent, tags = compute_profile_regex_score(username, display, bio, url)
         match_counts.append(count)
         fake_percents.append(percent)
         match_tags_list.append(",".join(tags))
 
-    df["profile_regex_match_count"] = match_counts
-    df["profile_fake_percent"] = fake_percents
-    df["profile_regex_tags"] = match_tags_list
+    return {
+        "profile_regex_match_count": match_counts,
+        "profile_fake_percent": fake_percents,
+        "profile_regex_tags": match_tags_list,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add regex fake-profile scores to extracted profiles")
+    args = add_dataset_args(parser, INPUT_CSV, OUTPUT_CSV).parse_args()
+
+    if not os.path.exists(args.input):
+        raise FileNotFoundError(f"{args.input} not found")
+
+    columns = dataset_columns(args.input)
+    for col in [USERNAME_COL, DISPLAY_NAME_COL, BIO_COL]:
+        if col not in columns:
+            raise ValueError(f"Column '{col}' missing in CSV. Found: {columns}")
 
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"[DONE] Saved: {OUTPUT_CSV}")
+    # URL column is optional; streamed chunk by chunk, so memory stays flat on large files
+    stream_dataset(args.input, args.output, profile_regex_columns, args.chunksize,
+                   columns=[USERNAME_COL, DISPLAY_NAME_COL, BIO_COL, URL_COL], defaults={URL_COL: ""})
+    print(f"[DONE] Saved: {args.output}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,232 @@
+import os
+import re
+import sys
+import time
+import types
+import hashlib
+import builtins
+import threading
+import importlib.util
+
+from verdict_cache import clear_caches
+
+ML_MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scorer modules holding rule packs (regex dicts) and prompts, in import
+# dependency order. cascade.py is left out on purpose: it owns the running
+# escalation counters, which should survive a rule reload. verdict_cache.py
+# too: the caches stay, but their entries came from the old prompts and are
+# dropped when a new set with a different rules version is published.
+SCORER_MODULES = [
+    "groq_llm_with_regex_percentage",
+    "groq_llm_fake_news",
+    "profile_classifier",
+    "url_classifier",
+    "image_classifier",
+    "llm_wrappers",
+]
+
+# The rest are optional: groq_llm_fake_news builds a Groq client at import and
+# fails without GROQ_API_KEY, which llm_wrappers already treats as "not available".
+REQUIRED_MODULES = {"groq_llm_with_regex_percentage", "profile_classifier", "url_classifier", "llm_wrappers"}
+
+# Modules that import rule functions and tables from the scorer modules by name
+# ("from url_classifier import check_regex_patterns") but aren't re-executed on
+# reload: they hold loaded models and batch state. Publishing a set rebinds
+# those names to the new modules, then calls the consumer's _rules_reloaded()
+# hook, if it has one, to rebuild what it derived from the rules at import.
+RULE_CONSUMERS = ["url_batch", "text_model", "url_model", "profile_model"]
+
+_MISSING = object()
+
+
+def rules_fingerprint(names=SCORER_MODULES):
+    """Short content hash of the scorer sources: the active rules version."""
+    h = hashlib.sha1()
+    for name in names:
+        path = os.path.join(ML_MODEL_DIR, f"{name}.py")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+def _source_mtimes(names=SCORER_MODULES):
+    mtimes = {}
+    for name in names:
+        path = os.path.join(ML_MODEL_DIR, f"{name}.py")
+        if os.path.exists(path):
+            mtimes[path] = os.path.getmtime(path)
+    return mtimes
+
+
+def load_scorer_set(names=SCORER_MODULES):
+    """
+    Execute a fresh, private copy of every scorer module.
+
+    The new modules import each other (not the live ones) through their own
+    __import__, so sys.modules is never touched: code already running, and
+    imports on other threads, keep the old version until the caller decides
+    to publish the new set.
+    """
+    fresh = {}
+
+    def private_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in fresh:
+            return fresh[name]
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    private_builtins = dict(vars(builtins), __import__=private_import)
+    for name in names:
+        path = os.path.join(ML_MODEL_DIR, f"{name}.py")
+        if not os.path.exists(path):
+            continue
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        module.__builtins__ = private_builtins
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            if name in REQUIRED_MODULES:
+                raise
+            continue
+        fresh[name] = module
+    return fresh
+
+
+def publish_scorer_set(modules, consumers=RULE_CONSUMERS):
+    """
+    Make a loaded set the live one: sys.modules entries are replaced in one
+    update, then the rule consumers are rebound to the new modules.
+    """
+    previous = {name: sys.modules.get(name) for name in modules}
+    sys.modules.update(modules)
+    for consumer_name in consumers:
+        consumer = sys.modules.get(consumer_name)
+        if consumer is not None:
+            rebind_consumer(consumer, previous, modules)
+
+
+def rebind_consumer(consumer, previous, modules):
+    """
+    Point every global of consumer that is a name imported from a previous
+    scorer module (same name, same object) at that name in the new module.
+    """
+    for attr, value in list(vars(consumer).items()):
+        if attr.startswith("__") or isinstance(value, types.ModuleType):
+            continue
+        for name, old in previous.items():
+            if old is not None and getattr(old, attr, _MISSING) is value and hasattr(modules[name], attr):
+                setattr(consumer, attr, getattr(modules[name], attr))
+                break
+    hook = getattr(consumer, "_rules_reloaded", None)
+    if callable(hook):
+        hook()
+
+
+def validate_scorer_set(modules):
+    """Compile every rule pattern and run each regex scorer once; raises on failure."""
+    for name, module in modules.items():
+        for attr, value in vars(module).items():
+            if isinstance(value, dict) and "REGEX" in attr:
+                for tag, pattern in value.items():
+                    if isinstance(pattern, str):
+                        try:
+                            re.compile(pattern)
+                        except re.error as e:
+                            raise ValueError(f"{name}.{attr}[{tag}]: {e}")
+
+    if "groq_llm_with_regex_percentage" in modules:
+        modules["groq_llm_with_regex_percentage"].compute_regex_percent("BREAKING: rule pack check")
+    if "url_classifier" in modules:
+        modules["url_classifier"].check_regex_patterns("https://example.com/login")
+    if "profile_classifier" in modules:
+        modules["profile_classifier"].check_regex_patterns({"username": "rule_check", "bio": "", "url": ""})
+    missing = REQUIRED_MODULES - set(modules)
+    if missing:
+        raise ValueError(f"missing scorer modules: {sorted(missing)}")
+
+
+class ScorerState:
+    """
+    Holds the active scorer module set. Readers take `current` once per
+    request; reload() builds and validates a new set off to the side, then
+    replaces `current` with a single assignment.
+    """
+
+    def __init__(self):
+        self._reload_lock = threading.Lock()
+        self.current = None
+        self.last_error = None
+        self.reload()
+
+    def reload(self, check=None):
+        """
+        Returns (ok, message). On failure the previous set stays active.
+
+        check: optional callable run once the new set is published (e.g. a model probe,
+               which scores through the rebound rule consumers); if it raises, the
+               previous set is published again
+        """
+        with self._reload_lock:
+            try:
+                modules = load_scorer_set()
+                validate_scorer_set(modules)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False, self.last_error
+
+            # Publish: later imports by name resolve to the new rules too
+            publish_scorer_set(modules)
+            if check is not None:
+                try:
+                    check()
+                except Exception as e:
+                    if self.current is not None:
+                        publish_scorer_set(self.current["modules"])
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    return False, self.last_error
+            rules_version = rules_fingerprint()
+            if self.current is not None and self.current["rules_version"] != rules_version:
+                clear_caches()
+            self.current = {
+                "modules": modules,
+                "rules_version": rules_version,
+                "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self.last_error = None
+            return True, self.current["rules_version"]
+
+    def module(self, name):
+        return (self.current or {}).get("modules", {}).get(name)
+
+
+class ReloadWatcher(threading.Thread):
+    """Polls scorer sources and models/manifest.json; calls on_change when they move."""
+
+    def __init__(self, manifest_path, on_change, interval=5.0):
+        super().__init__(name="reload-watcher", daemon=True)
+        self.manifest_path = manifest_path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._seen = self._snapshot()
+
+    def _snapshot(self):
+        snap = _source_mtimes()
+        if os.path.exists(self.manifest_path):
+            snap[self.manifest_path] = os.path.getmtime(self.manifest_path)
+        return snap
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            snap = self._snapshot()
+            if snap != self._seen:
+                self._seen = snap
+                try:
+                    self.on_change()
+                except Exception as e:
+                    print(f"[RELOAD] watcher reload failed: {e}")
+
+    def stop(self):
+        self._stop_event.set()
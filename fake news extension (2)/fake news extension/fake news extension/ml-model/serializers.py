@@ -0,0 +1,129 @@
+import os
+import json
+
+import numpy as np
+
+# Optional fast encoders: orjson for JSON (native NumPy support), msgpack for
+# binary responses. Without them, JSON falls back to the stdlib encoder and
+# MessagePack is simply not offered during content negotiation.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# ========== RESPONSE SERIALIZERS ==========
+#
+# One place that turns an analysis payload (nested dicts with lists, NumPy
+# scalars and arrays) into response bytes, shared by app.py and asgi_app.py.
+# Each serializer is a media type plus an encode(payload) -> bytes function;
+# the client picks one with the Accept header.
+
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPE = "application/msgpack"
+# Older / vendor names clients send for MessagePack
+MSGPACK_ALIASES = ("application/x-msgpack", "application/vnd.msgpack")
+
+# JSON_ENCODER=stdlib forces the stdlib encoder even when orjson is installed
+JSON_ENCODER = os.environ.get("JSON_ENCODER", "orjson" if orjson else "stdlib").lower()
+
+
+def to_builtin(obj):
+    """default= hook: NumPy scalars/arrays and sets to plain Python values"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def dumps_json_stdlib(payload):
+    # Same layout as Flask's jsonify: sorted keys, compact separators, trailing newline
+    return (json.dumps(payload, default=to_builtin, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE
+
+    def dumps_json_orjson(payload):
+        # Unlike the stdlib encoder, orjson writes NaN/Infinity as null (valid JSON) and non-ASCII as UTF-8
+        return orjson.dumps(payload, default=to_builtin, option=_ORJSON_OPTIONS)
+else:
+    dumps_json_orjson = None
+
+
+if msgpack is not None:
+    def dumps_msgpack(payload):
+        return msgpack.packb(payload, default=to_builtin, use_bin_type=True)
+else:
+    dumps_msgpack = None
+
+
+dumps_json = dumps_json_orjson if JSON_ENCODER == "orjson" and dumps_json_orjson else dumps_json_stdlib
+
+# media type -> encode function, in server preference order for Accept ties
+SERIALIZERS = {JSON_MIMETYPE: dumps_json}
+if dumps_msgpack is not None:
+    SERIALIZERS[MSGPACK_MIMETYPE] = dumps_msgpack
+
+
+def register_serializer(mimetype, encode, aliases=()):
+    """Add (or replace) a response format; encode(payload) -> bytes"""
+    SERIALIZERS[mimetype] = encode
+    for alias in aliases:
+        _ALIASES[alias] = mimetype
+
+
+_ALIASES = {alias: MSGPACK_MIMETYPE for alias in MSGPACK_ALIASES}
+
+
+def _parse_accept(accept):
+    """[(media_type, q)] from an Accept header, highest q first (stable for ties)"""
+    ranges = []
+    for i, part in enumerate(accept.split(",")):
+        fields = part.strip().split(";")
+        media = fields[0].strip().lower()
+        if not media:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranges.append((-q, i, _ALIASES.get(media, media)))
+    return [(media, -neg_q) for neg_q, _, media in sorted(ranges)]
+
+
+def negotiate(accept):
+    """Media type to answer with for an Accept header; JSON unless something else is preferred"""
+    if not accept:
+        return JSON_MIMETYPE
+    for media, q in _parse_accept(accept):
+        if q <= 0:
+            continue
+        if media in SERIALIZERS:
+            return media
+        if media in ("*/*", "application/*"):
+            return JSON_MIMETYPE
+    # Nothing acceptable: answer JSON anyway rather than 406, as before
+    return JSON_MIMETYPE
+
+
+def encode_response(payload, accept=None):
+    """
+    Serialize a response payload for the client's Accept header
+
+    Returns:
+        tuple: (media_type, body bytes)
+    """
+    mimetype = negotiate(accept)
+    return mimetype, SERIALIZERS[mimetype](payload)
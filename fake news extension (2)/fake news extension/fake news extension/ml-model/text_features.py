@@ -0,0 +1,281 @@
+import re
+import numpy as np
+
+# ========== TEXT FEATURE PATTERNS ==========
+#
+# Heuristic features for FakeNewsDetector.analyze_text, computed from one
+# lowercased copy of the text. Case-insensitive matching in `re` is several
+# times slower than exact matching, and a single alternation of all phrase
+# patterns is slower still (re has no multi-pattern search), so instead:
+#   - the lowered text is matched with case-sensitive patterns, which gives
+#     the same counts as IGNORECASE unless the text contains one of
+#     _LOWER_UNSAFE (the only characters where lower() and re's case folding
+#     disagree about ASCII letters; checked over all of Unicode), and
+#   - a phrase pattern only runs when one of its literal keywords occurs in
+#     the lowered text (a C-level substring test), which for most texts
+#     skips nearly all of them.
+
+PHRASE_PATTERNS = {
+    "urgency": r"\b(URGENT|BREAKING|ALERT|NOW|MUST SEE|SHOCKING)\b",
+    "clickbait": r"\b(you won't believe|doctors hate|one weird trick|what happens next)\b",
+    "conspiracy": r"\b(wake up|sheeple|they don't want you to know|cover-?up|deep state)\b",
+    "unverified": r"\b(reportedly|allegedly|rumored|unconfirmed|sources say)\b",
+    "emotional": r"\b(outrageous|disgusting|terrifying|devastating|horrifying)\b",
+    "missing_context": r"\b(study shows|research proves|scientists say|experts claim)\b",
+}
+# Substrings (lowercase) at least one of which must occur for the pattern to match
+PHRASE_KEYWORDS = {
+    "urgency": ("urgent", "breaking", "alert", "now", "must see", "shocking"),
+    "clickbait": ("you won't believe", "doctors hate", "one weird trick", "what happens next"),
+    "conspiracy": ("wake up", "sheeple", "they don't want you to know", "cover", "deep state"),
+    "unverified": ("reportedly", "allegedly", "rumored", "unconfirmed", "sources say"),
+    "emotional": ("outrageous", "disgusting", "terrifying", "devastating", "horrifying"),
+    "missing_context": ("study shows", "research proves", "scientists say", "experts claim"),
+}
+# With IGNORECASE this counts every word of 5+ ASCII letters, as it always has
+ALL_CAPS_PATTERN = r"\b[A-Z]{5,}\b"
+URL_PATTERN = r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+
+# dotless i and long s match "i"/"s" under IGNORECASE but lower() leaves them
+# as they are; capital I with dot lowers to two characters
+_LOWER_UNSAFE = ("\u0131", "\u017f", "\u0130")
+
+_PHRASE_RE = {name: re.compile(p.lower()) for name, p in PHRASE_PATTERNS.items()}
+_PHRASE_RE_IGNORECASE = {name: re.compile(p, re.IGNORECASE) for name, p in PHRASE_PATTERNS.items()}
+_ALL_CAPS_RE = re.compile(ALL_CAPS_PATTERN.lower())
+_ALL_CAPS_RE_IGNORECASE = re.compile(ALL_CAPS_PATTERN, re.IGNORECASE)
+_URL_RE = re.compile(URL_PATTERN)
+
+_ASCII_UPPER = bytes(range(ord("A"), ord("Z") + 1))
+# Texts shorter than this count uppercase letters in Python; longer ones use the table
+_UPPER_TABLE_MIN_LENGTH = 2000
+_upper_table = None
+
+# Column order of text_feature_matrix(); also the key order of extract_text_features()
+TEXT_FEATURE_COLUMNS = (
+    "urgency_count", "all_caps_count", "clickbait_count", "conspiracy_count", "unverified_count",
+    "emotional_count", "missing_context_count", "text_length", "caps_ratio", "exclamation_count",
+    "question_count", "hashtag_count", "mention_count", "url_count", "word_count", "avg_word_length",
+)
+_COLUMN_INDEX = {name: i for i, name in enumerate(TEXT_FEATURE_COLUMNS)}
+
+# ========== EXTRACTION ==========
+
+
+def uppercase_count(text):
+    """Number of characters with str.isupper(), without a Python-level loop for long texts"""
+    if text.isascii():
+        # Delete A-Z in C and compare lengths
+        return len(text) - len(text.encode("ascii").translate(None, _ASCII_UPPER))
+    if len(text) < _UPPER_TABLE_MIN_LENGTH:
+        return sum(map(str.isupper, text))
+
+    global _upper_table
+    if _upper_table is None:
+        # isupper for the Basic Multilingual Plane, built on first use (~10 ms, 64 KB)
+        _upper_table = np.array([chr(i).isupper() for i in range(0x10000)], dtype=np.bool_)
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    bmp = codepoints < 0x10000
+    count = int(np.count_nonzero(_upper_table[codepoints[bmp]]))
+    # Emoji etc.; only a few math/historic alphabets up there are uppercase
+    return count + sum(chr(c).isupper() for c in codepoints[~bmp].tolist())
+
+
+def extract_text_features(text, lowered=None, words=None, uppercase=None):
+    """
+    Feature dict for one text: lowercase once, then count phrases, capitalized
+    words and URLs with compiled patterns, and everything else with C-level
+    string methods and a single split into words.
+
+    Args:
+        text (str): tweet text
+        lowered, words, uppercase: text.lower(), text.split() and
+            uppercase_count(text) when the caller already has them
+            (document.AnalyzedDocument)
+
+    Returns:
+        dict: TEXT_FEATURE_COLUMNS -> value (counts are int, ratios float)
+    """
+    if any(c in text for c in _LOWER_UNSAFE):
+        # Rare: fall back to case-insensitive matching of every pattern
+        haystack, phrase_res, all_caps_re = text, _PHRASE_RE_IGNORECASE, _ALL_CAPS_RE_IGNORECASE
+        counts = {name: len(phrase_res[name].findall(text)) for name in PHRASE_PATTERNS}
+    else:
+        haystack, all_caps_re = text.lower() if lowered is None else lowered, _ALL_CAPS_RE
+        counts = {}
+        for name, keywords in PHRASE_KEYWORDS.items():
+            if any(k in haystack for k in keywords):
+                counts[name] = len(_PHRASE_RE[name].findall(haystack))
+            else:
+                counts[name] = 0
+
+    length = len(text)
+    if words is None:
+        words = text.split()
+    if uppercase is None:
+        uppercase = uppercase_count(text)
+    return {
+        "urgency_count": counts["urgency"],
+        "all_caps_count": len(all_caps_re.findall(haystack)),
+        "clickbait_count": counts["clickbait"],
+        "conspiracy_count": counts["conspiracy"],
+        "unverified_count": counts["unverified"],
+        "emotional_count": counts["emotional"],
+        "missing_context_count": counts["missing_context"],
+        "text_length": length,
+        "caps_ratio": uppercase / max(length, 1),
+        "exclamation_count": text.count("!"),
+        "question_count": text.count("?"),
+        "hashtag_count": text.count("#"),
+        "mention_count": text.count("@"),
+        "url_count": len(_URL_RE.findall(text)),
+        "word_count": len(words),
+        "avg_word_length": sum(map(len, words)) / len(words) if words else 0,
+    }
+
+
+def text_feature_matrix(texts):
+    """
+    Features of many texts as one float64 matrix, columns in TEXT_FEATURE_COLUMNS order
+
+    Args:
+        texts (list[str]): N texts (None / non-str values count as empty)
+
+    Returns:
+        np.ndarray: shape (N, len(TEXT_FEATURE_COLUMNS))
+    """
+    matrix = np.zeros((len(texts), len(TEXT_FEATURE_COLUMNS)), dtype=np.float64)
+    for i, text in enumerate(texts):
+        features = extract_text_features(text if isinstance(text, str) else "")
+        matrix[i] = [features[name] for name in TEXT_FEATURE_COLUMNS]
+    return matrix
+
+
+def matrix_row_features(row):
+    """Feature dict back from one matrix row (counts as int, like extract_text_features)"""
+    features = {name: int(v) for name, v in zip(TEXT_FEATURE_COLUMNS, row.tolist())}
+    features["caps_ratio"] = float(row[_COLUMN_INDEX["caps_ratio"]])
+    avg = float(row[_COLUMN_INDEX["avg_word_length"]])
+    features["avg_word_length"] = avg if features["word_count"] else 0
+    return features
+
+
+# ========== RULE SCORING ==========
+#
+# Credibility score from the features when no text model is loaded. The
+# scalar and vectorized versions must agree; running this module
+# compares them on the committed tweets.
+
+
+def rule_score(features):
+    """Credibility 0-100 for one feature dict"""
+    score = 70  # Start neutral-positive
+
+    # Deduct for suspicious patterns
+    score -= features['urgency_count'] * 5
+    score -= features['clickbait_count'] * 8
+    score -= features['conspiracy_count'] * 10
+    score -= features['unverified_count'] * 3
+    score -= features['emotional_count'] * 4
+
+    # Deduct for formatting issues
+    if features['caps_ratio'] > 0.5:
+        score -= 10
+    if features['exclamation_count'] > 2:
+        score -= features['exclamation_count'] * 2
+
+    # Add for quality indicators
+    if features['text_length'] > 100:
+        score += 5
+    if features['url_count'] > 0:
+        score += 3
+
+    return max(0, min(100, score))
+
+
+def rule_scores(matrix):
+    """rule_score for every row of a text_feature_matrix, as an int64 array"""
+    col = {name: matrix[:, i] for name, i in _COLUMN_INDEX.items()}
+    score = (
+        70
+        - col["urgency_count"] * 5
+        - col["clickbait_count"] * 8
+        - col["conspiracy_count"] * 10
+        - col["unverified_count"] * 3
+        - col["emotional_count"] * 4
+        - np.where(col["caps_ratio"] > 0.5, 10, 0)
+        - np.where(col["exclamation_count"] > 2, col["exclamation_count"] * 2, 0)
+        + np.where(col["text_length"] > 100, 5, 0)
+        + np.where(col["url_count"] > 0, 3, 0)
+    )
+    return np.clip(score, 0, 100).astype(np.int64)
+
+
+# ========== EQUIVALENCE CHECK ==========
+
+# Texts the tweet dataset may not cover
+EDGE_CASES = [
+    "", "   ", "BREAKING NOW!!! MUST SEE", "Ünïcödé ÀÉÎ text with CAPS", "wake up sheeple, cover-up!",
+    "http://a.b/c?d=1 and https://x.y", "you won't believe what happens next",
+    "ALLEGEDLY \u0130STANBUL d\u0131sgusting \u017fources \u017fay", "\u212aNOW BREA\u212aING",
+    "Long text " * 300 + "\u00c9\u00c9 \U0001d400\U0001d401 \U0001f600 SHOCKING",
+]
+
+
+def _reference_features(text):
+    """The original multi-pass extractor, kept only to check the single-pass one"""
+    features = {}
+    patterns = {"urgency": PHRASE_PATTERNS["urgency"], "all_caps": ALL_CAPS_PATTERN}
+    patterns.update({k: v for k, v in PHRASE_PATTERNS.items() if k != "urgency"})
+    for pattern_name, pattern in patterns.items():
+        features[f"{pattern_name}_count"] = len(re.findall(pattern, text, re.IGNORECASE))
+    features["text_length"] = len(text)
+    features["caps_ratio"] = sum(1 for c in text if c.isupper()) / max(len(text), 1)
+    features["exclamation_count"] = text.count("!")
+    features["question_count"] = text.count("?")
+    features["hashtag_count"] = text.count("#")
+    features["mention_count"] = text.count("@")
+    features["url_count"] = len(re.findall(URL_PATTERN, text))
+    features["word_count"] = len(text.split())
+    features["avg_word_length"] = np.mean([len(word) for word in text.split()]) if text.split() else 0
+    return features
+
+
+def check_equivalence(texts):
+    """Mismatches between single-pass, reference, batch and vectorized scoring (empty list = all agree)"""
+    problems = []
+    matrix = text_feature_matrix(texts)
+    vector = rule_scores(matrix)
+    for i, text in enumerate(texts):
+        fast, ref = extract_text_features(text), _reference_features(text)
+        if fast != ref:
+            diff = {k: (fast.get(k), ref.get(k)) for k in ref if fast.get(k) != ref.get(k)}
+            problems.append(f"row {i}: features differ {diff}")
+        if matrix_row_features(matrix[i]) != fast:
+            problems.append(f"row {i}: matrix row differs")
+        if int(vector[i]) != rule_score(fast):
+            problems.append(f"row {i}: vectorized score {vector[i]} != {rule_score(fast)}")
+    return problems
+
+
+def main():
+    import os
+    import argparse
+    import pandas as pd
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Check the single-pass and batch text features against the reference")
+    parser.add_argument("--csv", default=os.path.join(base_dir, "tweets_extracted.csv"))
+    parser.add_argument("--column", default="text")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv)[args.column].fillna("").astype(str).tolist() + EDGE_CASES
+    problems = check_equivalence(texts)
+    for p in problems[:20]:
+        print(p)
+    print(f"[DONE] {len(texts)} texts, {len(problems)} mismatches")
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import os
+import math
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from groq_llm_with_regex_percentage import FAKE_REGEX, compute_regex_percent
+from document import TWEET_URL_RE, tokenize
+from model_registry import DEFAULT_MODEL_DIR, ModelRegistry, save_model
+from linear_model import (
+    LinearModel, build_batch, hash_features, word_ngrams,
+    train_logistic_regression, log_loss, linear_model_arrays,
+)
+
+# ============ CONFIG ============
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_CSV = os.path.join(BASE_DIR, "tweets_with_groq_percentage.csv")
+MODEL_NAME = "text_classifier"
+TEXT_COL = "text"
+
+HASH_BITS = 16          # 65,536 hashed word uni/bigram buckets
+NGRAM_MAX = 2
+
+# Heuristic flag columns from the extraction step, used as a weak label when
+# a row has no usable Groq verdict (e.g. "Groq error: ..." rows)
+WEAK_LABEL_COLS = [
+    "clickbait", "anonymous_source", "urgent_share", "all_caps_headline", "repeated_punct",
+    "conspiracy_phrase", "vague_confirm", "sensational_verb_claim", "extreme_percent",
+    "misinfo_invite", "numeric_rounding", "fake_referral", "emoji_plus_sens",
+]
+WEAK_LABEL_SATURATION = 4   # this many flags -> weak label of 1.0
+
+NUMERIC_FEATURES = [
+    "log_length", "caps_ratio", "log_exclamations", "log_questions",
+    "url_count", "hashtag_count", "mention_count", "regex_percent",
+]
+
+# ========== FEATURES ==========
+
+
+def _numeric_features(text, regex_percent, caps=None):
+    length = len(text)
+    if caps is None:
+        caps = sum(map(str.isupper, text))
+    return [
+        math.log1p(length),
+        caps / max(length, 1),
+        math.log1p(text.count("!")),
+        math.log1p(text.count("?")),
+        len(TWEET_URL_RE.findall(text)),
+        text.count("#"),
+        text.count("@"),
+        regex_percent / 100.0,
+    ]
+
+
+def text_features(text, tag_names, hash_bits=HASH_BITS, regex_result=None, doc=None):
+    """
+    Args:
+        text (str): tweet text
+        tag_names (list[str]): regex tag order of the bitmap
+        regex_result (tuple): optional precomputed compute_regex_percent(text)
+        doc (AnalyzedDocument): optional request document for text; its
+            tokens, uppercase count and regex result are reused
+
+    Returns:
+        (hashed column ids, dense feature list)
+    """
+    if doc is not None:
+        text = doc.text
+        regex_result = regex_result or doc.regex(compute_regex_percent)
+        tokens, caps = doc.tokens, doc.uppercase_count
+    else:
+        if not isinstance(text, str):
+            text = "" if pd.isna(text) else str(text)
+        tokens, caps = tokenize(text.lower()), None
+
+    _, regex_percent, matched = regex_result or compute_regex_percent(text)
+    matched = set(matched)
+
+    hashed = hash_features(word_ngrams(tokens, NGRAM_MAX), hash_bits)
+    dense = [1.0 if t in matched else 0.0 for t in tag_names] + _numeric_features(text, regex_percent, caps)
+    return hashed, dense
+
+
+# ========== MODEL ==========
+
+class TextModel:
+    """Local text classifier: P(fake) for a tweet, no network I/O."""
+
+    # predict_proba accepts doc= (a request AnalyzedDocument) to reuse its tokens and regex result
+    uses_document = True
+
+    def __init__(self, linear: LinearModel):
+        self.linear = linear
+        self.tag_names = linear.meta["tag_names"]
+
+    def predict_proba(self, text, regex_result=None, doc=None):
+        hashed, dense = text_features(text, self.tag_names, self.linear.hash_bits, regex_result, doc)
+        return self.linear.predict_proba_one(hashed, dense)
+
+    def predict_proba_batch(self, texts):
+        hashed_rows, dense_rows = [], []
+        for t in texts:
+            h, d = text_features(t, self.tag_names, self.linear.hash_bits)
+            hashed_rows.append(h)
+            dense_rows.append(d)
+        dense = self.linear.scale_dense(np.asarray(dense_rows, dtype=np.float32).reshape(len(texts), -1))
+        batch = build_batch(hashed_rows, dense, self.linear.hash_bits)
+        return self.linear.predict_proba_batch(batch)
+
+
+def load_text_model(model_dir=DEFAULT_MODEL_DIR):
+    return ModelRegistry(model_dir).get(MODEL_NAME)
+
+
+# ========== TRAINING ==========
+
+
+def build_labels(df):
+    """Groq verdicts where valid, otherwise the weak heuristic label. Returns (y, is_llm_label)."""
+    n = len(df)
+    weak_cols = [c for c in WEAK_LABEL_COLS if c in df.columns]
+    if weak_cols:
+        flags = df[weak_cols].astype(str).apply(lambda s: s.str.lower() == "true").sum(axis=1).to_numpy()
+        weak = np.minimum(flags / WEAK_LABEL_SATURATION, 1.0)
+    else:
+        weak = np.zeros(n)
+
+    if "groq_fake_percent" in df.columns and "groq_reason" in df.columns:
+        reasons = df["groq_reason"].fillna("").astype(str)
+        llm_ok = (~reasons.str.startswith("Groq error")) & df["groq_fake_percent"].notna()
+        llm_ok = llm_ok.to_numpy()
+        llm = pd.to_numeric(df["groq_fake_percent"], errors="coerce").fillna(0).to_numpy() / 100.0
+    else:
+        llm_ok = np.zeros(n, dtype=bool)
+        llm = np.zeros(n)
+
+    return np.where(llm_ok, llm, weak), llm_ok
+
+
+def _regex_from_row(text, tags_cell):
+    """Reuse the regex_matched_tags column from the regex stage when present."""
+    if isinstance(tags_cell, str) or (tags_cell is not None and pd.isna(tags_cell)):
+        tags = [t for t in str(tags_cell).split(",") if t and t != "nan"]
+        percent = round(len(tags) / len(FAKE_REGEX) * 100, 2)
+        return len(tags), percent, tags
+    return compute_regex_percent(text)
+
+
+def train(input_csv=INPUT_CSV, model_dir=DEFAULT_MODEL_DIR, hash_bits=HASH_BITS, epochs=300, l2=1e-4):
+    df = pd.read_csv(input_csv)
+    if TEXT_COL not in df.columns:
+        raise ValueError(f"Column '{TEXT_COL}' not found. Available: {df.columns.tolist()}")
+
+    texts = df[TEXT_COL].fillna("").astype(str).tolist()
+    tag_cells = df["regex_matched_tags"].tolist() if "regex_matched_tags" in df.columns else [None] * len(df)
+    tag_names = list(FAKE_REGEX.keys())
+
+    hashed_rows, dense_rows = [], []
+    for text, cell in zip(texts, tag_cells):
+        h, d = text_features(text, tag_names, hash_bits, _regex_from_row(text, cell))
+        hashed_rows.append(h)
+        dense_rows.append(d)
+
+    dense = np.asarray(dense_rows, dtype=np.float32)
+    dense_mean = dense.mean(axis=0)
+    dense_scale = dense.std(axis=0)
+    dense_scale[dense_scale == 0] = 1.0
+
+    y, llm_ok = build_labels(df)
+    batch = build_batch(hashed_rows, (dense - dense_mean) / dense_scale, hash_bits)
+    dim = (1 << hash_bits) + dense.shape[1]
+    # Groq verdicts count more than weak heuristic labels
+    sample_weight = np.where(llm_ok, 3.0, 1.0)
+    weights, bias = train_logistic_regression(batch, y, dim, epochs=epochs, l2=l2, sample_weight=sample_weight)
+
+    meta = {
+        "kind": "text_classifier",
+        "hash_bits": hash_bits,
+        "ngram_max": NGRAM_MAX,
+        "tag_names": tag_names,
+        "numeric_features": NUMERIC_FEATURES,
+        "rows": len(df),
+        "llm_labeled_rows": int(llm_ok.sum()),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    version = save_model(MODEL_NAME, linear_model_arrays(weights, bias, dense_mean, dense_scale), meta, model_dir)
+
+    model = load_text_model(model_dir)
+    probs = model.predict_proba_batch(texts)
+    print(f"Rows: {len(df)} (Groq-labeled: {int(llm_ok.sum())}, weak-labeled: {int((~llm_ok).sum())})")
+    print(f"Train log loss: {log_loss(y, probs):.4f}")
+
+    start = time.perf_counter()
+    regex_results = [compute_regex_percent(t) for t in texts]
+    mid = time.perf_counter()
+    for t, r in zip(texts, regex_results):
+        model.predict_proba(t, r)
+    end = time.perf_counter()
+    n = max(len(texts), 1)
+    print(f"Inference: {(end - mid) / n * 1e6:.1f} µs/tweet model + {(mid - start) / n * 1e6:.1f} µs/tweet regex stage")
+    print(f"[DONE] Saved text model {MODEL_NAME} v{version} → {model_dir}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local text classifier (hashed n-grams + logistic regression)")
+    parser.add_argument("--input", default=INPUT_CSV)
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--hash-bits", type=int, default=HASH_BITS)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    args = parser.parse_args()
+    train(args.input, args.model_dir, args.hash_bits, args.epochs, args.l2)
+
+
+if __name__ == "__main__":
+    main()
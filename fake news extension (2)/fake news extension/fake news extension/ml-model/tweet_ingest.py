@@ -0,0 +1,408 @@
+import re
+import ast
+import importlib
+
+import numpy as np
+import pandas as pd
+
+# ========== TWEET DATASET INGEST ==========
+#
+# tweets_extracted.csv keeps `urls`, `mentions` and `hashtags` as Python list
+# literals ("['https://t.co/x', 'https://t.co/y']") and the rule flags as
+# True / False text. This module turns them into typed arrays for batch runs:
+#
+#   - list columns become a ListColumn: one flat array of values plus row
+#     offsets (row i is values[offsets[i]:offsets[i + 1]]), the layout Arrow
+#     uses for list<string>. The cells of a chunk are joined into one string
+#     and one regex scan (re.findall) tokenizes every string literal in it;
+#     a separator token between cells gives the offsets. Only values with
+#     backslash escapes, and cells that aren't a plain list of string
+#     literals, go through ast.literal_eval.
+#   - flags are read as bool, ids and counts as int64, by explicit dtypes.
+#
+# The scorers (tweet regex, batch URL signals / URL model, profile regex) take
+# a TweetBatch directly; URL scores map back to tweets through the offsets.
+
+# Stringified Python lists in tweets_extracted.csv
+LIST_COLUMNS = ("urls", "mentions", "hashtags")
+
+# Rule flags written by the extractor (True / False)
+FLAG_COLUMNS = (
+    "shortener_url_present", "clickbait", "anonymous_source", "urgent_share", "all_caps_headline",
+    "repeated_punct", "conspiracy_phrase", "vague_confirm", "sensational_verb_claim", "extreme_percent",
+    "misinfo_invite", "numeric_rounding", "fake_referral", "emoji_plus_sens", "username_official",
+    "username_real", "username_name_plus_numbers", "username_many_digits", "username_multi_underscore",
+    "username_fake_support", "username_crypto_scam",
+)
+
+# Declared types of the tweet dataset's columns; columns not listed are strings
+TWEET_COLUMN_TYPES = {
+    "tweet_id": "int64",
+    "urls": "list<string>",
+    "mentions": "list<string>",
+    "hashtags": "list<string>",
+    "mentioned_followers_count": "float64",
+    "mentioned_following_count": "float64",
+    "mentioned_growth": "float64",
+    "mentioned_rate": "float64",
+    "followers_count": "int64",
+    "following_count": "int64",
+    "followers_following_ratio": "float64",
+    **{col: "bool" for col in FLAG_COLUMNS},
+}
+
+# pandas dtypes for typed CSV reads (nullable, so empty cells stay missing)
+PANDAS_DTYPES = {"int64": "Int64", "float64": "float64", "bool": "boolean", "string": str, "list<string>": str}
+
+# One Python string literal, without prefixes, raw newlines or line continuations
+_LITERAL = r"'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\""
+# A cell that is a plain list of string literals ("[]", "['a']", "['a', \"b\",]")
+_WS = r"[ \t\n\r\f]*"
+LIST_CELL_RE = re.compile(rf"\[{_WS}(?:(?:{_LITERAL}){_WS}(?:,{_WS}(?:{_LITERAL}){_WS})*,?{_WS})?\]")
+# Cells are joined with NUL; the token scan yields each literal and one NUL per cell boundary
+_SEPARATOR = "\x00"
+_TOKEN_RE = re.compile(rf"{_SEPARATOR}|{_LITERAL}")
+
+# ========== LIST COLUMNS ==========
+
+
+class ListColumn:
+    """
+    A column of string lists as flat values + offsets: row i is
+    values[offsets[i]:offsets[i + 1]].
+    """
+
+    __slots__ = ("offsets", "values")
+
+    def __init__(self, offsets, values):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.values = np.asarray(values, dtype=object)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def lengths(self):
+        """Values per row"""
+        return np.diff(self.offsets)
+
+    def row_ids(self):
+        """Row of each value (len(values) entries), e.g. to map per-URL scores back to tweets"""
+        return np.repeat(np.arange(len(self)), self.lengths())
+
+    def to_lists(self):
+        values = self.values.tolist()
+        return [values[a:b] for a, b in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+
+    def to_arrow(self):
+        """pyarrow list<string> array with the same offsets and values (needs pyarrow)"""
+        import pyarrow as pa
+
+        return pa.ListArray.from_arrays(pa.array(self.offsets, type=pa.int32()), pa.array(self.values, type=pa.string()))
+
+    @classmethod
+    def from_arrow(cls, array):
+        """ListColumn from a pyarrow list array (null rows become empty lists)"""
+        import pyarrow as pa
+
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        lengths = array.value_lengths().fill_null(0).to_numpy(zero_copy_only=False)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        return cls(offsets, array.flatten().to_numpy(zero_copy_only=False))
+
+    @classmethod
+    def from_lists(cls, lists):
+        lengths = [len(v) if v is not None else 0 for v in lists]
+        offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        return cls(offsets, [x for v in lists if v is not None for x in v])
+
+
+def parse_list_cell(value):
+    """A stringified Python list ("['a', 'b']") as a list of str; missing / malformed cells are []"""
+    if not isinstance(value, str) or not value.startswith("["):
+        return []
+    try:
+        return [str(v) for v in ast.literal_eval(value)]
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return []
+
+
+def _literal_value(token):
+    # Escapes ("\\'", "\\n", "\\u00e9", ...) need the real string parser
+    return ast.literal_eval(token) if "\\" in token else token[1:-1]
+
+
+def parse_list_column(cells, fallback=parse_list_cell):
+    """
+    Parse a column of list cells into a ListColumn, same values as fallback per cell.
+
+    Args:
+        cells (list | np.ndarray | pd.Series): cells as read from CSV (str, NaN, ...)
+        fallback: parser for cells that aren't a plain list of string literals
+                  (parse_list_cell: malformed and missing cells are [])
+    """
+    cells = cells.tolist() if isinstance(cells, (pd.Series, np.ndarray)) else list(cells)
+    n = len(cells)
+    plain = np.fromiter(
+        (isinstance(c, str) and _SEPARATOR not in c and LIST_CELL_RE.fullmatch(c) is not None for c in cells),
+        dtype=bool, count=n)
+    plain_rows = np.flatnonzero(plain)
+
+    lengths = np.zeros(n, dtype=np.int64)
+    values = []
+    if len(plain_rows):
+        tokens = _TOKEN_RE.findall(_SEPARATOR.join([cells[i] for i in plain_rows.tolist()]))
+        is_separator = np.fromiter((t == _SEPARATOR for t in tokens), dtype=bool, count=len(tokens))
+        # Row (among the plain cells) of each literal = separators before it
+        literal_rows = np.cumsum(is_separator)[~is_separator]
+        lengths[plain_rows] = np.bincount(literal_rows, minlength=len(plain_rows))
+        values = [_literal_value(t) for t in tokens if t != _SEPARATOR]
+
+    other_rows = np.flatnonzero(~plain)
+    if len(other_rows) == 0:
+        return ListColumn(np.concatenate([[0], np.cumsum(lengths)]), values)
+
+    # Cells parsed one by one are spliced in at their rows
+    parsed = {i: fallback(cells[i]) for i in other_rows.tolist()}
+    for i, v in parsed.items():
+        lengths[i] = len(v)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    merged = np.empty(offsets[-1], dtype=object)
+    plain_positions = np.ones(offsets[-1], dtype=bool)
+    for i, v in parsed.items():
+        merged[offsets[i]:offsets[i + 1]] = v
+        plain_positions[offsets[i]:offsets[i + 1]] = False
+    merged[plain_positions] = np.asarray(values, dtype=object)
+    return ListColumn(offsets, merged)
+
+
+def format_list_column(column):
+    """Cells as the extractor writes them: str(list) per row ("['a', 'b']")"""
+    reprs = [repr(v) for v in column.values.tolist()]
+    return ["[" + ", ".join(reprs[a:b]) + "]" for a, b in zip(column.offsets[:-1].tolist(), column.offsets[1:].tolist())]
+
+
+# ========== TWEET BATCHES ==========
+
+
+class TweetBatch:
+    """
+    Typed tweets: scalar columns in `frame` (bool flags, Int64 counts, str text),
+    list columns as ListColumns in `lists`.
+    """
+
+    __slots__ = ("frame", "lists", "columns")
+
+    def __init__(self, frame, lists, columns=None):
+        self.frame = frame
+        self.lists = lists
+        self.columns = list(columns) if columns is not None else list(frame.columns) + list(lists)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def texts(self):
+        """Tweet texts with missing ones as "" """
+        return self.frame["text"].fillna("").astype(str).tolist()
+
+    def flags(self, columns=FLAG_COLUMNS):
+        """bool matrix (N, len(columns)) of the rule flags present in the batch (missing -> False)"""
+        present = [c for c in columns if c in self.frame.columns]
+        return self.frame[present].fillna(False).to_numpy(dtype=bool)
+
+    def to_frame(self):
+        """Plain DataFrame with the list columns as Python lists, in the original column order"""
+        df = self.frame.copy()
+        for name, column in self.lists.items():
+            df[name] = column.to_lists()
+        return df[self.columns]
+
+
+def pandas_dtypes(columns, column_types=TWEET_COLUMN_TYPES):
+    """Explicit pd.read_csv dtypes for columns (list columns stay text for parse_list_column)"""
+    return {c: PANDAS_DTYPES[column_types.get(c, "string")] for c in columns}
+
+
+def _boolean_flags(frame):
+    # Flags from read_csv defaults (bool / "True" text) or Arrow (object with None) -> nullable boolean
+    for col in FLAG_COLUMNS:
+        if col in frame.columns and frame[col].dtype != "boolean":
+            frame[col] = frame[col].map({True: True, False: False, "True": True, "False": False}).astype("boolean")
+    return frame
+
+
+def ingest_frame(df):
+    """
+    TweetBatch from a tweets DataFrame read with pandas_dtypes() (or read_csv defaults):
+    list columns parsed in one pass each, flags made bool.
+    """
+    lists = {col: parse_list_column(df[col]) for col in LIST_COLUMNS if col in df.columns}
+    return TweetBatch(_boolean_flags(df.drop(columns=list(lists))), lists, df.columns)
+
+
+def iter_tweet_batches(path, chunksize=None, columns=None):
+    """
+    TweetBatches of up to chunksize rows (None / 0: the whole file) from a
+    .csv, .parquet or .arrow tweets dataset. columns: projection.
+    """
+    if not path.lower().endswith(".csv"):
+        # Columnar files already hold typed lists; no parsing needed
+        dataset_io = importlib.import_module("dataset_io")
+        for table in dataset_io.iter_tables(path, chunksize, columns):
+            lists = {c: ListColumn.from_arrow(table[c]) for c in LIST_COLUMNS if c in table.column_names}
+            frame = _boolean_flags(table.drop_columns(list(lists)).to_pandas())
+            # Same dtypes as a typed CSV read: nullable Int64 for the declared int columns
+            ints = {c: "Int64" for c in frame.columns if TWEET_COLUMN_TYPES.get(c) == "int64"}
+            frame = frame.astype(ints)
+            yield TweetBatch(frame, lists, table.column_names)
+        return
+
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    usecols = columns if columns is not None else header
+    kwargs = dict(usecols=usecols, dtype=pandas_dtypes(usecols), keep_default_na=False, na_values=[""],
+                  float_precision="round_trip")
+    if not chunksize:
+        yield ingest_frame(pd.read_csv(path, **kwargs))
+        return
+    with pd.read_csv(path, chunksize=chunksize, **kwargs) as reader:
+        for chunk in reader:
+            yield ingest_frame(chunk.reset_index(drop=True))
+
+
+def read_tweets(path, columns=None):
+    """The whole tweets dataset as one TweetBatch"""
+    return next(iter_tweet_batches(path, 0, columns))
+
+
+# ========== SCORER ADAPTERS ==========
+#
+# Scorer modules are imported on use (like cache_warmer does), so reading a
+# dataset doesn't load every rule pack.
+
+
+def tweet_regex_scores(batch):
+    """regex_match_count / regex_fake_percent / regex_matched_tags per tweet (compute_regex_percent)"""
+    regex_scoring = importlib.import_module("groq_llm_with_regex_percentage")
+    return regex_scoring.regex_columns(batch.frame)
+
+
+def url_signals(batch, column="urls", strings=False):
+    """
+    url_batch.url_signals_batch over every URL in the batch at once.
+
+    Returns:
+        tuple: (row_ids, table, tags, red_flags) - row_ids[k] is the tweet of URL k
+    """
+    url_batch = importlib.import_module("url_batch")
+    urls = batch.lists[column]
+    table, tags, red_flags = url_batch.url_signals_batch(urls.values, strings=strings)
+    return urls.row_ids(), table, tags, red_flags
+
+
+def max_per_row(column, scores, empty=np.nan):
+    """Largest per-value score of each row of a ListColumn (empty rows get `empty`)"""
+    scores = np.asarray(scores, dtype=np.float64)
+    out = np.full(len(column), empty, dtype=np.float64)
+    lengths = column.lengths()
+    rows = np.flatnonzero(lengths > 0)
+    if len(rows):
+        out[rows] = np.maximum.reduceat(scores, column.offsets[rows])
+    return out
+
+
+def url_model_scores(batch, url_model, column="urls"):
+    """
+    url_model.predict_proba_batch on every URL of the batch in one call.
+
+    Returns:
+        tuple: (per-URL probabilities, per-tweet maximum (NaN for tweets without URLs))
+    """
+    urls = batch.lists[column]
+    probs = url_model.predict_proba_batch(urls.values.tolist()) if len(urls.values) else np.zeros(0)
+    return probs, max_per_row(urls, probs)
+
+
+def profile_records(batch):
+    """Author profile dicts for the profile scorers, from the columns the tweets dataset has"""
+    keys = [c for c in ("username", "display_name", "bio", "url", "followers_count", "following_count",
+                        "verified") if c in batch.frame.columns]
+    frame = batch.frame[keys].astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+def profile_regex_scores(batch):
+    """profile_regex_scoring columns for the tweet authors (bio / url empty when the dataset lacks them)"""
+    profile_regex_scoring = importlib.import_module("profile_regex_scoring")
+    frame = batch.frame
+    authors = pd.DataFrame({
+        col: frame[col] if col in frame.columns else np.nan
+        for col in (profile_regex_scoring.USERNAME_COL, profile_regex_scoring.DISPLAY_NAME_COL,
+                    profile_regex_scoring.BIO_COL, profile_regex_scoring.URL_COL)
+    })
+    return profile_regex_scoring.profile_regex_columns(authors)
+
+
+# ========== CHECK ==========
+
+
+EDGE_CASES = [
+    "[]", "['a']", "['a', 'b']", '["it\'s"]', "['a\\'b']", "['tab\\there']", "['\\u00e9t\\xe9']",
+    "[ 'spaced' , \"double\" , ]", "['a',\n 'b']", "['x'] ", " ['x']", "['a' 'b']", "['a', 1]",
+    "[['nested']]", "[,]", "['unterminated]", "not a list", "", None, float("nan"), "['émoji \U0001F600']",
+    "[u'prefixed']", "['''triple''']", "['back\\\\slash']", "['new\nline']", "['nul\x00']", "['']", "['', '']",
+]
+
+
+def check_equivalence(cells):
+    """Cells where parse_list_column differs from parse_list_cell (the ast.literal_eval reference)"""
+    column = parse_list_column(cells)
+    problems = []
+    if len(column) != len(cells):
+        return [f"{len(column)} rows for {len(cells)} cells"]
+    for i, cell in enumerate(cells):
+        expected, got = parse_list_cell(cell), column[i]
+        if expected != got:
+            problems.append(f"row {i} {cell!r}: {expected} != {got}")
+    if format_list_column(column) != [str(parse_list_cell(c)) for c in cells]:
+        problems.append("format_list_column differs from str(list)")
+    return problems
+
+
+def main():
+    import os
+    import time
+    import argparse
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Check the vectorized list parsing against ast.literal_eval")
+    parser.add_argument("--csv", default=os.path.join(base_dir, "tweets_extracted.csv"))
+    parser.add_argument("--repeat", type=int, default=2000, help="times the CSV's cells are repeated for timing")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, dtype=str, keep_default_na=False, na_values=[""])
+    problems = []
+    for col in LIST_COLUMNS:
+        if col in df.columns:
+            problems += check_equivalence(df[col].tolist())
+    problems += check_equivalence(EDGE_CASES)
+    for p in problems[:20]:
+        print(p)
+
+    cells = [c for col in LIST_COLUMNS if col in df.columns for c in df[col].tolist()] * args.repeat
+    start = time.perf_counter()
+    [parse_list_cell(c) for c in cells]
+    reference = time.perf_counter() - start
+    start = time.perf_counter()
+    parse_list_column(cells)
+    vectorized = time.perf_counter() - start
+    print(f"{len(cells)} cells: literal_eval {reference:.2f} s, parse_list_column {vectorized:.2f} s "
+          f"({reference / vectorized:.1f}x)")
+    print(f"[DONE] {sum(len(df) for _ in LIST_COLUMNS) + len(EDGE_CASES)} cells, {len(problems)} mismatches")
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+import re
+import numpy as np
+import pandas as pd
+
+from url_classifier import URL_TAGS, URL_REGEX_COMPILED, extract_url_features, check_regex_patterns, check_url_red_flags
+
+# ========== BATCH URL SIGNALS ==========
+#
+# Columnar versions of url_classifier.extract_url_features,
+# check_regex_patterns and check_url_red_flags for large URL lists (crawl
+# dumps, offline scoring, url_model batches), with the same results per URL.
+#
+# URLs are processed in chunks. Each chunk is joined into one "\n"-separated
+# string:
+#   - urlparse is reproduced with NumPy on the bytes of that string: the
+#     offsets of ':', '/', '?', '#', '@', '.', '-' and digits, searched with
+#     np.searchsorted against the row start/end offsets, give every row's
+#     scheme / netloc / path / query span and character counts at once.
+#   - each tag pattern scans the whole chunk string once (MULTILINE, so "$"
+#     ends a row, and negated classes also exclude "\n", so no match spans
+#     two rows); match offsets map back to rows.
+#
+# The byte arithmetic only covers URLs where urlparse is plain splitting:
+# printable ASCII without "[", "]" (IPv6 netlocs, which urlparse validates)
+# or ";" (path params). Anything else (whitespace, control characters,
+# non-ASCII, IPv6, params) goes through the scalar functions. Non-string
+# values (None, NaN) are scored as "" like url_model does.
+
+# Red flags in check_url_red_flags order
+RED_FLAGS = (
+    "no_https", "very_long_url", "too_many_subdomains", "too_many_hyphens",
+    "many_digits_in_domain", "very_long_domain", "has_custom_port",
+)
+# Columns of the feature table, after the scalar features (error rows keep
+# url_length and regex_score; their parsed columns are empty / zero)
+STRING_COLUMNS = ("scheme", "domain", "path", "query")
+NUMERIC_COLUMNS = (
+    "has_https", "url_length", "domain_length", "path_length",
+    "num_subdomains", "num_hyphens", "num_digits_domain", "has_port",
+)
+CHUNK_SIZE = 100_000
+
+_FAST_ROW_RE = re.compile(r"[\x21-\x7e]*")
+_FAST_ROW_EXCLUDED = re.compile(r"[\[\];]")
+_SCHEME_CHARS = np.zeros(256, dtype=bool)
+for _c in b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+-.":
+    _SCHEME_CHARS[_c] = True
+_ALPHA = np.zeros(256, dtype=bool)
+for _c in b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ":
+    _ALPHA[_c] = True
+
+
+# Constructs that could see across the row separator; a pattern using one is
+# searched row by row instead (rule packs are editable and hot-reloaded)
+_BLOB_UNSAFE = re.compile(r"\(\?<[=!]|\\[sWDAZ]")
+
+
+# Case-insensitive matching is several times slower in `re` than exact
+# matching. On printable-ASCII rows, a (?i) pattern without uppercase
+# characters in its source (no \D, [A-Z], ...) matches the same rows as the
+# exact pattern matches in the lowercased chunk.
+_LEADING_IGNORECASE = "(?i)"
+_INLINE_FLAGS = re.compile(r"\(\?(?!:)")
+
+
+def _blob_pattern(pattern):
+    """
+    (pattern for a whole chunk, match it against the lowercased chunk?), or
+    (None, False) when the pattern can't safely scan one
+    """
+    source = pattern.pattern
+    if pattern.flags & re.DOTALL or _BLOB_UNSAFE.search(source):
+        return None, False
+    # A negated class must not match the row separator
+    source = source.replace("[^", "[^\\n")
+    flags = pattern.flags | re.MULTILINE
+    if flags & re.IGNORECASE:
+        rest = source[len(_LEADING_IGNORECASE):] if source.startswith(_LEADING_IGNORECASE) else source
+        if rest == rest.lower() and not _INLINE_FLAGS.search(rest):
+            return re.compile(rest, flags & ~re.IGNORECASE), True
+    return re.compile(source, flags), False
+
+
+_TAG_BLOB_RE = [(*_blob_pattern(p), p) for _, p in URL_REGEX_COMPILED]
+
+
+def _rules_reloaded():
+    """reloader hook: URL_REGEX_COMPILED was rebound to a new rule pack"""
+    global _TAG_BLOB_RE
+    _TAG_BLOB_RE = [(*_blob_pattern(p), p) for _, p in URL_REGEX_COMPILED]
+
+
+def _is_fast(url):
+    return _FAST_ROW_RE.fullmatch(url) is not None and _FAST_ROW_EXCLUDED.search(url) is None
+
+
+def _positions(buf, chars):
+    """Sorted offsets in buf of any byte in chars"""
+    mask = np.zeros(len(buf), dtype=bool)
+    for c in chars.encode("ascii"):
+        mask |= buf == c
+    return np.flatnonzero(mask)
+
+
+def _first_at_or_after(positions, lo, hi):
+    """Per row: first offset in positions that is >= lo and < hi, else hi"""
+    idx = np.searchsorted(positions, lo)
+    cand = np.append(positions, np.iinfo(np.int64).max)[idx]
+    return np.where(cand < hi, cand, hi)
+
+
+def _count_between(positions, lo, hi):
+    """Per row: how many offsets in positions fall in [lo, hi)"""
+    return np.searchsorted(positions, hi) - np.searchsorted(positions, lo)
+
+
+def _parse_chunk(urls, strings):
+    """Feature columns and tag bitmap for a list of fast-path URLs"""
+    n = len(urls)
+    blob = "\n".join(urls)
+    # Two spare separators so lookups one past a row's end stay in bounds
+    buf = np.frombuffer((blob + "\n\n").encode("ascii"), dtype=np.uint8)
+    lengths = np.fromiter(map(len, urls), dtype=np.int64, count=n)
+    starts = np.zeros(n, dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=starts[1:])
+    ends = starts + lengths
+
+    # scheme: up to the first ':' if it starts with a letter and is all scheme characters
+    colons = _positions(buf, ":")
+    colon = _first_at_or_after(colons, starts, ends)
+    non_scheme = np.flatnonzero(~_SCHEME_CHARS[buf])
+    has_scheme = ((colon < ends) & (colon > starts) & _ALPHA[buf[starts]]
+                  & (_count_between(non_scheme, starts, colon) == 0))
+    rest = np.where(has_scheme, colon + 1, starts)
+
+    # netloc: after "//", up to the first '/', '?' or '#'
+    has_netloc = (buf[rest] == ord("/")) & (buf[rest + 1] == ord("/"))
+    netloc_end = _first_at_or_after(_positions(buf, "/?#"), rest + 2, ends)
+    netloc_start = np.where(has_netloc, rest + 2, rest)
+    netloc_end = np.where(has_netloc, netloc_end, rest)
+
+    # path up to the first '?' or '#'; the query runs from a '?' to the first '#'
+    path_end = _first_at_or_after(_positions(buf, "?#"), netloc_end, ends)
+    has_query = (path_end < ends) & (buf[path_end] == ord("?"))
+    query_start = np.where(has_query, path_end + 1, path_end)
+    query_end = np.where(has_query, _first_at_or_after(_positions(buf, "#"), query_start, ends), path_end)
+
+    # port: a ':' in the netloc after its last '@'
+    at = _positions(buf, "@")
+    last_at_idx = np.searchsorted(at, netloc_end) - 1
+    last_at = np.where(last_at_idx >= 0, np.append(at, -1)[last_at_idx], -1)
+    host_start = np.where(last_at >= netloc_start, last_at + 1, netloc_start)
+
+    lowered = buf | 0x20  # only compared against lowercase letters below
+    is_https = (colon - starts == 5) & has_scheme
+    for k, c in enumerate(b"https"):
+        is_https &= lowered[np.minimum(starts + k, len(buf) - 1)] == c
+
+    columns = {
+        "has_https": is_https,
+        "url_length": lengths,
+        "domain_length": netloc_end - netloc_start,
+        "path_length": path_end - netloc_end,
+        "num_subdomains": _count_between(_positions(buf, "."), netloc_start, netloc_end),
+        "num_hyphens": _count_between(_positions(buf, "-"), netloc_start, netloc_end),
+        "num_digits_domain": _count_between(_positions(buf, "0123456789"), netloc_start, netloc_end),
+        "has_port": _count_between(colons, host_start, netloc_end) > 0,
+        "has_query": query_end > query_start,
+    }
+    if strings:
+        def spans(lo, hi):
+            return [blob[a:b] for a, b in zip(lo.tolist(), hi.tolist())]
+        # urlparse lowercases the scheme
+        columns["scheme"] = [s.lower() for s in spans(starts, np.where(has_scheme, colon, starts))]
+        columns["domain"] = spans(netloc_start, netloc_end)
+        columns["path"] = spans(netloc_end, path_end)
+        columns["query"] = spans(query_start, query_end)
+
+    tags = np.zeros((n, len(_TAG_BLOB_RE)), dtype=bool)
+    lowered_blob = blob.lower()
+    for j, (blob_pattern, on_lowered, pattern) in enumerate(_TAG_BLOB_RE):
+        if blob_pattern is None:
+            tags[:, j] = [pattern.search(u) is not None for u in urls]
+            continue
+        text = lowered_blob if on_lowered else blob
+        hits = np.fromiter((m.start() for m in blob_pattern.finditer(text)), dtype=np.int64)
+        if len(hits):
+            tags[np.searchsorted(starts, hits, side="right") - 1, j] = True
+    return columns, tags
+
+
+def _scalar_rows(urls, strings):
+    """The same columns via the scalar functions (rows the byte path doesn't cover)"""
+    n = len(urls)
+    columns = {name: np.zeros(n, dtype=np.int64) for name in NUMERIC_COLUMNS}
+    for name in ("has_https", "has_port", "has_query", "error"):
+        columns[name] = np.zeros(n, dtype=bool)
+    if strings:
+        for name in STRING_COLUMNS:
+            columns[name] = [""] * n
+    tags = np.zeros((n, len(URL_TAGS)), dtype=bool)
+    tag_index = {t: j for j, t in enumerate(URL_TAGS)}
+
+    for i, url in enumerate(urls):
+        features = extract_url_features(url)
+        columns["url_length"][i] = len(url)
+        if "error" in features:
+            columns["error"][i] = True
+        else:
+            for name in NUMERIC_COLUMNS:
+                columns[name][i] = features[name]
+            columns["has_query"][i] = bool(features["query"])
+            if strings:
+                for name, key in zip(STRING_COLUMNS, ("scheme", "domain", "path", "query")):
+                    columns[name][i] = features[key]
+        for tag in check_regex_patterns(url)[1]:
+            tags[i, tag_index[tag]] = True
+    return columns, tags
+
+
+def url_signals_batch(urls, strings=True, chunk_size=CHUNK_SIZE):
+    """
+    Features, tag bitmap and red flags for many URLs
+
+    Args:
+        urls (list[str] | np.ndarray | pd.Series): URLs (non-strings count as "")
+        strings (bool): include the scheme/domain/path/query text columns
+                        (the numeric columns are enough for scoring and much cheaper)
+        chunk_size (int): URLs per vectorized chunk (bounds peak memory)
+
+    Returns:
+        tuple: (table, tags, red_flags)
+            table (pd.DataFrame): one row per URL: STRING_COLUMNS (if strings),
+                NUMERIC_COLUMNS, has_query, error and regex_score
+            tags (np.ndarray): bool (N, len(URL_TAGS)), columns in URL_TAGS order
+            red_flags (np.ndarray): bool (N, len(RED_FLAGS)), columns in RED_FLAGS order
+    """
+    if isinstance(urls, pd.Series):
+        urls = urls.tolist()
+    urls = [u if isinstance(u, str) else "" for u in urls]
+    n = len(urls)
+
+    fast = np.fromiter(map(_is_fast, urls), dtype=bool, count=n)
+    parts = []
+    for lo in range(0, n, chunk_size):
+        chunk = urls[lo:lo + chunk_size]
+        chunk_fast = fast[lo:lo + chunk_size]
+        rows = np.arange(lo, lo + len(chunk))
+        fast_rows, slow_rows = rows[chunk_fast], rows[~chunk_fast]
+        if len(fast_rows):
+            columns, tags = _parse_chunk([urls[i] for i in fast_rows], strings)
+            columns["error"] = np.zeros(len(fast_rows), dtype=bool)
+            parts.append((fast_rows, columns, tags))
+        if len(slow_rows):
+            parts.append((slow_rows, *_scalar_rows([urls[i] for i in slow_rows], strings)))
+
+    # Reassemble in input order
+    order = np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int64)
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[order] = np.arange(n)
+    names = (STRING_COLUMNS if strings else ()) + NUMERIC_COLUMNS + ("has_query", "error")
+    data = {}
+    for name in names:
+        if name in STRING_COLUMNS:
+            merged = np.array([v for p in parts for v in p[1][name]], dtype=object)
+        else:
+            merged = np.concatenate([np.asarray(p[1][name]) for p in parts]) if parts else np.zeros(0)
+        data[name] = merged[inverse]
+    for name in ("has_https", "has_port", "has_query", "error"):
+        data[name] = data[name].astype(bool)
+    tags = (np.concatenate([p[2] for p in parts]) if parts else np.zeros((0, len(URL_TAGS)), dtype=bool))[inverse]
+
+    # Same arithmetic as check_regex_patterns
+    data["regex_score"] = np.minimum(100, (tags.sum(axis=1) / len(URL_TAGS)) * 100 * 4)
+    table = pd.DataFrame(data)
+    return table, tags, red_flags_batch(table)
+
+
+def red_flags_batch(table):
+    """check_url_red_flags for every row of a url_signals_batch table (invalid URLs have none)"""
+    valid = ~table["error"].to_numpy()
+    checks = (
+        ~table["has_https"].to_numpy(),
+        table["url_length"].to_numpy() > 100,
+        table["num_subdomains"].to_numpy() > 3,
+        table["num_hyphens"].to_numpy() > 3,
+        table["num_digits_domain"].to_numpy() > 3,
+        table["domain_length"].to_numpy() > 30,
+        table["has_port"].to_numpy(),
+    )
+    return np.column_stack(checks) & valid[:, None] if len(table) else np.zeros((0, len(RED_FLAGS)), dtype=bool)
+
+
+# ========== ROW ACCESS ==========
+
+
+def row_features(table, i):
+    """extract_url_features(url) rebuilt from row i (needs strings=True)"""
+    row = table.iloc[i]
+    if row["error"]:
+        return {"error": "Invalid URL"}
+    features = {
+        "scheme": row["scheme"],
+        "domain": row["domain"],
+        "path": row["path"],
+        "query": row["query"],
+    }
+    for name in NUMERIC_COLUMNS:
+        features[name] = bool(row[name]) if name in ("has_https", "has_port") else int(row[name])
+    return features
+
+
+def row_tags(tags, i):
+    """Matched tag names of row i, in check_regex_patterns order"""
+    return [URL_TAGS[j] for j in np.flatnonzero(tags[i])]
+
+
+def row_red_flags(red_flags, i):
+    return [RED_FLAGS[j] for j in np.flatnonzero(red_flags[i])]
+
+
+# URLs the URL dataset may not cover: each one exercises a urlparse rule or the scalar fallback
+EDGE_CASES = [
+    "", "example.com", "//cdn.example.com/x", "HTTPS://Example.COM:8443/a?b=1#c", "https://a@b@c.com:80/",
+    "https://user:pw@host.com/p", "http://x.com#frag?notquery", "http://x.com?q=1?r=2#f", "mailto:a@b.c",
+    "1http://bad.scheme/", "h ttp://space.com/", "http://[::1]:8080/", "http://[::1/", "http://x.com/a;b?c",
+    "https://bücher.de/login", "https://x.com/\tlogin\n", " https://lead.space/", "https://paypa1.com/verify.php",
+    "http://192.168.0.1:8080/login", "https://bit.ly/abc", "https://a.b.c.d.e.f.com/x.pdf.exe", None,
+]
+
+
+def check_equivalence(urls):
+    """Mismatches between url_signals_batch and the scalar functions (empty list = all agree)"""
+    table, tags, red_flags = url_signals_batch(urls)
+    problems = []
+    for i, url in enumerate(urls):
+        url = url if isinstance(url, str) else ""
+        features = extract_url_features(url)
+        regex_score, matched = check_regex_patterns(url)
+        expected = (features, regex_score, matched, check_url_red_flags(url, features))
+        got = (row_features(table, i), float(table["regex_score"].iloc[i]), row_tags(tags, i), row_red_flags(red_flags, i))
+        if expected != got:
+            problems.append(f"row {i} {url!r}: {expected} != {got}")
+    return problems
+
+
+def main():
+    import os
+    import argparse
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Check the batch URL signals against the scalar url_classifier functions")
+    parser.add_argument("--csv", default=os.path.join(base_dir, "fake_url_dataset.csv"))
+    parser.add_argument("--column", default="url")
+    args = parser.parse_args()
+
+    urls = pd.read_csv(args.csv)[args.column].tolist() + EDGE_CASES
+    problems = check_equivalence(urls)
+    for p in problems[:20]:
+        print(p)
+    print(f"[DONE] {len(urls)} URLs, {len(problems)} mismatches")
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
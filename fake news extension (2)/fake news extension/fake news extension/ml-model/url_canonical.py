@@ -0,0 +1,166 @@
+import os
+import re
+import sys
+import argparse
+from urllib.parse import urlsplit, urlunsplit
+
+# Optional: the Public Suffix List (publicsuffixlist bundles a snapshot of both
+# the ICANN and the private section, so github.io, herokuapp.com and co.uk are
+# all suffixes). Without it there is no registered domain, and the verdict
+# cache only uses its exact-URL level.
+try:
+    from publicsuffixlist import PublicSuffixList
+    PUBLIC_SUFFIXES = PublicSuffixList()
+except ImportError:
+    PUBLIC_SUFFIXES = None
+
+# ============ CONFIG ============
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only identify where a click came from. Links shared on
+# a timeline carry them (?utm_source=twitter, ?ref=..., ?fbclid=...), but
+# they never change the page the URL points to.
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok", "ref", "ref_src", "ref_url", "referrer", "si",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+UNRESERVED = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+ESCAPE_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+IPV4_RE = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
+
+# ========== CANONICALIZATION ==========
+
+
+def _normalize_escapes(part):
+    """Decode percent-escapes of unreserved characters (%7E -> ~), uppercase the rest (%2f -> %2F)"""
+    def fix(m):
+        ch = chr(int(m.group(1), 16))
+        return ch if ch in UNRESERVED else "%" + m.group(1).upper()
+    return ESCAPE_RE.sub(fix, part)
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url):
+    """
+    One spelling for URLs that point to the same page:
+    lowercase scheme and host, no default port, no trailing dot on the host,
+    "/" for an empty path, tracking parameters and the fragment dropped,
+    percent-escapes of unreserved characters decoded.
+
+    Non-http(s) and unparseable URLs come back unchanged (stripped).
+    """
+    if not isinstance(url, str):
+        return url
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname
+    if scheme not in DEFAULT_PORTS or not host:
+        return url
+
+    host = host.rstrip(".")
+    netloc = f"[{host}]" if ":" in host else host
+    userinfo = parts.netloc.rpartition("@")[0]
+    if userinfo:
+        netloc = f"{userinfo}@{netloc}"
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    path = _normalize_escapes(parts.path) or "/"
+    params = [p for p in parts.query.split("&") if p and not _is_tracking(p.split("=", 1)[0])]
+    query = "&".join(_normalize_escapes(p) for p in params)
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def registered_domain(host):
+    """
+    Registrable part of a host name by the Public Suffix List, private section
+    included (login.secure.example.co.uk -> example.co.uk,
+    a.evil.github.io -> evil.github.io). IP addresses come back whole; a host
+    that is itself a public suffix (github.io), or any host when the list is
+    not installed, gives None.
+    """
+    host = (host or "").lower().rstrip(".")
+    if not host:
+        return None
+    if ":" in host or IPV4_RE.match(host):
+        return host
+    if PUBLIC_SUFFIXES is None:
+        return None
+    return PUBLIC_SUFFIXES.privatesuffix(host)
+
+
+def url_cache_keys(url):
+    """
+    Returns:
+        (canonical URL, registered domain or None) - the two verdict cache levels
+    """
+    canonical = canonicalize_url(url)
+    try:
+        host = urlsplit(canonical).hostname
+    except (ValueError, AttributeError, TypeError):
+        host = None
+    return canonical, registered_domain(host) if host else None
+
+
+# ========== CHECK ==========
+
+EDGE_CASES = [
+    ("https://X.com/a?utm_source=twitter", "https://x.com/a"),
+    ("HTTPS://Example.COM:443/%7Euser/?ref=home&id=7#top", "https://example.com/~user/?id=7"),
+    ("http://example.com:80", "http://example.com/"),
+    ("http://example.com:8080/a%2fb", "http://example.com:8080/a%2Fb"),
+    ("https://news.example.co.uk./story?fbclid=abc&utm_medium=social&page=2", "https://news.example.co.uk/story?page=2"),
+    ("http://user@192.168.1.1/login", "http://user@192.168.1.1/login"),
+    ("ftp://Example.com/file", "ftp://Example.com/file"),
+    ("not a url", "not a url"),
+    ("http://[::1", "http://[::1"),
+]
+
+
+def check_canonicalization(urls):
+    """Failures: wrong results on EDGE_CASES, and URLs whose canonical form is not a fixed point"""
+    failures = [(u, canonicalize_url(u), want) for u, want in EDGE_CASES if canonicalize_url(u) != want]
+    for u in urls:
+        once = canonicalize_url(u)
+        if canonicalize_url(once) != once:
+            failures.append((u, canonicalize_url(once), once))
+    return failures
+
+
+def main():
+    import pandas as pd
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="Check URL canonicalization on the URL dataset and edge cases")
+    parser.add_argument("--csv", default=os.path.join(base_dir, "fake_url_dataset.csv"))
+    parser.add_argument("--column", default="url")
+    args = parser.parse_args()
+
+    urls = pd.read_csv(args.csv)[args.column].astype(str).tolist()
+    failures = check_canonicalization(urls)
+    for url, got, want in failures[:20]:
+        print(f"[MISMATCH] {url!r}: {got!r} != {want!r}")
+
+    canonical = {canonicalize_url(u) for u in urls}
+    domains = {url_cache_keys(u)[1] for u in urls}
+    print(f"URLs: {len(urls)}, canonical URLs: {len(canonical)}, registered domains: {len(domains)}")
+    print(f"[DONE] {len(urls) + len(EDGE_CASES)} URLs, {len(failures)} mismatches")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 import re
 import json
+import asyncio
 from urllib.parse import urlparse
 from groq import Groq
 
+from cascade import CASCADE_ENABLED, cascade_decision, decided_score
+from metrics import stage_timer, groq_call
+from url_canonical import url_cache_keys
+from verdict_cache import get_cache, request_source
+
 # ========== URL REGEX PATTERNS ==========
 
 URL_STRUCTURE_REGEX = {
@@ -44,12 +50,53 @@ URL_PLATFORM_REGEX = {
     "paste_site": r"https?://(pastebin\.com|ghostbin\.com|paste\.ee|hastebin\.com)/",
 }
 
+# All URL patterns in tag order (structure, content, platform), compiled once
+URL_TAGS = list(URL_STRUCTURE_REGEX) + list(URL_CONTENT_REGEX) + list(URL_PLATFORM_REGEX)
+URL_REGEX_COMPILED = [
+    (tag, re.compile(pattern))
+    for group in (URL_STRUCTURE_REGEX, URL_CONTENT_REGEX, URL_PLATFORM_REGEX)
+    for tag, pattern in group.items()
+]
+
+# ========== VERDICT CACHE ==========
+
+# Two levels: the exact canonical URL, then the registered domain (by the
+# Public Suffix List, see url_canonical). A domain entry answers for every URL
+# on the domain, so it is only written when the threat is the domain itself:
+# a confident phishing/scam/malware verdict for a host that a domain rule
+# (typosquat, suspicious TLD, IDN lookalike) matches. Phishing found in a path
+# says nothing about the rest of the site. Shorteners and sites serving
+# user content from one domain never get a domain entry.
+URL_VERDICT_CACHE = get_cache("url_exact")
+DOMAIN_VERDICT_CACHE = get_cache("url_domain")
+DOMAIN_THREAT_TYPES = ("phishing", "scam", "malware")
+DOMAIN_MIN_PROBABILITY = 70
+SHARED_HOST_TAGS = {"url_shortener"} | set(URL_PLATFORM_REGEX)
+# Registered domains hosting user content under paths or subdomains. Hosting
+# suffixes in the list's private section (github.io, herokuapp.com,
+# netlify.app, ...) already give each tenant its own registered domain.
+SHARED_HOST_DOMAINS = frozenset({
+    "google.com", "googleusercontent.com", "forms.gle", "microsoft.com", "office.com", "live.com",
+    "sharepoint.com", "1drv.ms", "dropbox.com", "dropboxusercontent.com", "box.com", "wetransfer.com",
+    "amazonaws.com", "github.com", "gitlab.com", "bitbucket.org", "typeform.com", "jotform.com",
+    "surveymonkey.com", "wix.com", "weebly.com", "weeblysite.com", "wordpress.com", "squarespace.com",
+    "godaddysites.com", "000webhostapp.com", "glitch.me", "canva.com", "canva.site", "start.page",
+    "medium.com", "substack.com", "blogger.com", "tumblr.com", "ipfs.io",
+    "twitter.com", "x.com", "facebook.com", "fb.com", "instagram.com", "youtube.com", "youtu.be",
+    "tiktok.com", "reddit.com", "linkedin.com", "discord.com", "discord.gg",
+})
+# Rules about the host name itself (a domain entry needs one of them to match the host)
+DOMAIN_RULE_TAGS = ["tld_suspicious"] + [t for t in URL_CONTENT_REGEX if t.startswith("typosquat_")]
+DOMAIN_RULES = [(tag, pattern) for tag, pattern in URL_REGEX_COMPILED if tag in DOMAIN_RULE_TAGS]
+
+LLM_ERROR_REASON = "LLM error, using regex score"
+
 # ========== CORE FUNCTIONS ==========
 
-def extract_url_features(url):
+def extract_url_features(url, doc=None):
     features = {}
     try:
-        parsed = urlparse(url)
+        parsed = doc.parsed_url(url) if doc is not None else urlparse(url)
         features["scheme"] = parsed.scheme
         features["domain"] = parsed.netloc
         features["path"] = parsed.path
@@ -68,21 +115,9 @@ def extract_url_features(url):
 
 
 def check_regex_patterns(url):
-    matched_tags = []
+    matched_tags = [tag for tag, pattern in URL_REGEX_COMPILED if pattern.search(url)]
     
-    for tag, pattern in URL_STRUCTURE_REGEX.items():
-        if re.search(pattern, url):
-            matched_tags.append(tag)
-    
-    for tag, pattern in URL_CONTENT_REGEX.items():
-        if re.search(pattern, url):
-            matched_tags.append(tag)
-    
-    for tag, pattern in URL_PLATFORM_REGEX.items():
-        if re.search(pattern, url):
-            matched_tags.append(tag)
-    
-    total_patterns = len(URL_STRUCTURE_REGEX) + len(URL_CONTENT_REGEX) + len(URL_PLATFORM_REGEX)
+    total_patterns = len(URL_REGEX_COMPILED)
     regex_score = min(100, (len(matched_tags) / total_patterns) * 100 * 4)
     
     return regex_score, matched_tags
@@ -109,9 +144,8 @@ def check_url_red_flags(url, features):
     return flags
 
 
-def classify_with_groq(url, features, regex_score, tags, red_flags, api_key):
-    client = Groq(api_key=api_key)
-    
+def build_groq_request(url, features, regex_score, tags, red_flags):
+    """chat.completions.create() arguments for one URL (shared by the sync and async clients)"""
     url_summary = f"""
 URL: {url}
 Domain: {features.get('domain', 'N/A')}
@@ -132,43 +166,118 @@ RED FLAGS: {', '.join(red_flags) if red_flags else 'None'}
 Respond ONLY with JSON (no markdown):
 {{"malicious_probability": <0-100>, "threat_type": "<phishing|scam|malware|spam|safe>", "reason": "<1-2 sentence explanation>"}}"""
     
+    return {
+        "model": "llama-3.1-8b-instant",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.1,
+        "max_tokens": 200,
+    }
+
+
+# Model and prompt behind this module's LLM verdicts (cache_warmer loads only matching rows)
+VERDICT_SOURCE = request_source(build_groq_request("https://source-probe.example/", {}, 0.0, [], []))
+
+
+def parse_groq_reply(response):
+    """(malicious_probability, threat_type, reason) from a chat completion; raises on invalid JSON"""
+    result = response.choices[0].message.content.strip()
+    result = result.replace("```json", "").replace("```", "").strip()
+    data = json.loads(result)
+    return (
+        data.get("malicious_probability", 50),
+        data.get("threat_type", "unknown"),
+        data.get("reason", "No reason")
+    )
+
+
+def classify_with_groq(url, features, regex_score, tags, red_flags, api_key):
+    client = Groq(api_key=api_key)
+    request = build_groq_request(url, features, regex_score, tags, red_flags)
+    
     try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=200,
-        )
-        
-        result = response.choices[0].message.content.strip()
-        result = result.replace("```json", "").replace("```", "").strip()
-        data = json.loads(result)
-        return (
-            data.get("malicious_probability", 50),
-            data.get("threat_type", "unknown"),
-            data.get("reason", "No reason")
-        )
+        with groq_call("url"):
+            response = client.chat.completions.create(**request)
+            return parse_groq_reply(response)
     except Exception as e:
         print(f"[LLM ERROR] {e}")
-        return regex_score, "unknown", "LLM error, using regex score"
+        return regex_score, "unknown", LLM_ERROR_REASON
 
 
-def classify_url(url, api_key):
-    """
-    Main function - call this from your code
+async def classify_with_groq_async(url, features, regex_score, tags, red_flags, client):
+    """classify_with_groq on a shared AsyncGroq client"""
+    request = build_groq_request(url, features, regex_score, tags, red_flags)
     
-    Args:
-        url (str): URL to analyze
-        api_key (str): Groq API key
+    try:
+        with groq_call("url"):
+            response = await client.chat.completions.create(**request)
+            return parse_groq_reply(response)
+    except Exception as e:
+        print(f"[LLM ERROR] {e}")
+        return regex_score, "unknown", LLM_ERROR_REASON
+
+
+def domain_cacheable(domain, tags):
+    """Can the registered domain have a domain-level cache entry at all?"""
+    return bool(domain) and domain not in SHARED_HOST_DOMAINS and not SHARED_HOST_TAGS.intersection(tags)
+
+
+def domain_threat_tags(host):
+    """Domain rules matching the host name itself; a punycode (xn--) label counts as a lookalike"""
+    host = (host or "").lower()
+    tags = [tag for tag, pattern in DOMAIN_RULES if pattern.search(host)]
+    if any(label.startswith("xn--") for label in host.split(".")):
+        tags.append("idn_lookalike")
+    return tags
+
+
+def cached_verdict(url, tags):
+    """(malicious_probability, threat_type, reason) from the verdict cache, or None"""
+    canonical, domain = url_cache_keys(url)
+    verdict = URL_VERDICT_CACHE.get(canonical)
+    if verdict is None and domain_cacheable(domain, tags):
+        verdict = DOMAIN_VERDICT_CACHE.get(domain)
+    return verdict
+
+
+def store_verdict(url, tags, verdict):
+    """Cache an LLM verdict (LLM errors are not cached); per domain only for domain-level threats"""
+    mal_prob, threat_type, reason = verdict
+    if reason == LLM_ERROR_REASON:
+        return
+    canonical, domain = url_cache_keys(url)
+    URL_VERDICT_CACHE.put(canonical, verdict)
+    if (threat_type in DOMAIN_THREAT_TYPES and mal_prob >= DOMAIN_MIN_PROBABILITY
+            and domain_cacheable(domain, tags) and domain_threat_tags(urlparse(canonical).hostname)):
+        DOMAIN_VERDICT_CACHE.put(domain, verdict)
+
+
+def score_url_signals(url, cascade=None, doc=None):
+    """
+    CPU half of classify_url: features, regex, red flags and the cascade decision (no network)
+    (doc: optional request AnalyzedDocument, so the URL is parsed once per request)
     
     Returns:
-        dict: classification result
+        tuple: (features, regex_score, tags, red_flags, decision) - decision is None when the LLM is needed
     """
-    features = extract_url_features(url)
-    regex_score, tags = check_regex_patterns(url)
-    red_flags = check_url_red_flags(url, features)
-    mal_prob, threat_type, reason = classify_with_groq(url, features, regex_score, tags, red_flags, api_key)
-    
+    with stage_timer("url", "features"):
+        features = extract_url_features(url, doc)
+    with stage_timer("url", "regex"):
+        regex_score, tags = check_regex_patterns(url)
+        red_flags = check_url_red_flags(url, features)
+
+    decision = None
+    if CASCADE_ENABLED if cascade is None else cascade:
+        decision = cascade_decision("url", regex_score, red_flags)
+    return features, regex_score, tags, red_flags, decision
+
+
+def cascade_verdict(decision, regex_score):
+    mal_prob = decided_score("url", decision, regex_score)
+    threat_type = "unknown" if decision == "high" else "safe"
+    return mal_prob, threat_type, f"Decided by regex cascade ({decision}), LLM skipped"
+
+
+def build_url_result(url, features, regex_score, tags, red_flags, mal_prob, threat_type, reason):
     if mal_prob >= 70:
         classification = "MALICIOUS"
     elif mal_prob >= 40:
@@ -186,4 +295,60 @@ def classify_url(url, api_key):
         "matched_tags": tags,
         "red_flags": red_flags,
         "url_features": features,
-    }
\ No newline at end of file
+    }
+
+
+def classify_url(url, api_key, cascade=None, doc=None):
+    """
+    Main function - call this from your code
+    
+    Args:
+        url (str): URL to analyze
+        api_key (str): Groq API key
+        cascade (bool): skip the LLM when the regex score is decisive
+                        (defaults to the CASCADE_MODE env setting)
+        doc (AnalyzedDocument): optional request document the URL belongs to
+    
+    Returns:
+        dict: classification result
+    """
+    features, regex_score, tags, red_flags, decision = score_url_signals(url, cascade, doc)
+
+    if decision is None:
+        verdict = cached_verdict(url, tags)
+        if verdict is None:
+            verdict = classify_with_groq(url, features, regex_score, tags, red_flags, api_key)
+            store_verdict(url, tags, verdict)
+    else:
+        verdict = cascade_verdict(decision, regex_score)
+    return build_url_result(url, features, regex_score, tags, red_flags, *verdict)
+
+
+async def classify_url_async(url, client, cascade=None, doc=None, signals=None):
+    """
+    classify_url for asyncio servers: the regex half runs in a worker thread
+    (the loop's default executor) and the LLM call is awaited on `client`.
+    
+    Args:
+        url (str): URL to analyze
+        client (groq.AsyncGroq): shared async client
+        cascade (bool): as in classify_url
+        doc (AnalyzedDocument): as in classify_url
+        signals (tuple): score_url_signals(url, cascade, doc) computed beforehand
+                         (e.g. in a worker process); skips the regex half
+    
+    Returns:
+        dict: same shape as classify_url
+    """
+    if signals is None:
+        signals = await asyncio.to_thread(score_url_signals, url, cascade, doc)
+    features, regex_score, tags, red_flags, decision = signals
+
+    if decision is None:
+        verdict = cached_verdict(url, tags)
+        if verdict is None:
+            verdict = await classify_with_groq_async(url, features, regex_score, tags, red_flags, client)
+            store_verdict(url, tags, verdict)
+    else:
+        verdict = cascade_verdict(decision, regex_score)
+    return build_url_result(url, features, regex_score, tags, red_flags, *verdict)
@@ -0,0 +1,207 @@
+import os
+import math
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from url_classifier import (
+    URL_STRUCTURE_REGEX, URL_CONTENT_REGEX, URL_PLATFORM_REGEX,
+    extract_url_features, check_regex_patterns,
+)
+from url_batch import url_signals_batch, URL_TAGS
+from model_registry import DEFAULT_MODEL_DIR, ModelRegistry, save_model
+from linear_model import (
+    LinearModel, build_batch, hash_features, char_ngrams,
+    train_logistic_regression, log_loss, linear_model_arrays,
+)
+
+# ============ CONFIG ============
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_CSV = os.path.join(BASE_DIR, "fake_url_dataset.csv")
+MODEL_NAME = "url_classifier"
+URL_COL = "url"
+LABEL_COL = "label"
+
+HASH_BITS = 18          # 262,144 hashed character n-gram buckets
+CHAR_NGRAMS = (3, 5)
+TEST_FRACTION = 0.2
+
+NUMERIC_FEATURES = [
+    "has_https", "log_url_length", "log_domain_length", "log_path_length",
+    "num_subdomains", "num_hyphens", "num_digits_domain", "has_port", "has_query", "regex_score",
+]
+
+ALL_URL_TAGS = list(URL_STRUCTURE_REGEX) + list(URL_CONTENT_REGEX) + list(URL_PLATFORM_REGEX)
+
+
+def _rules_reloaded():
+    """reloader hook: the url_classifier rule packs were rebound"""
+    global ALL_URL_TAGS
+    ALL_URL_TAGS = list(URL_STRUCTURE_REGEX) + list(URL_CONTENT_REGEX) + list(URL_PLATFORM_REGEX)
+
+# ========== FEATURES ==========
+
+
+def url_features(url, tag_names, hash_bits=HASH_BITS):
+    """
+    Returns:
+        (hashed char n-gram ids, dense feature list) for one URL
+    """
+    url = "" if not isinstance(url, str) else url
+    f = extract_url_features(url)
+    regex_score, tags = check_regex_patterns(url)
+    tags = set(tags)
+
+    numeric = [
+        float(bool(f.get("has_https", False))),
+        math.log1p(f.get("url_length", len(url))),
+        math.log1p(f.get("domain_length", 0)),
+        math.log1p(f.get("path_length", 0)),
+        f.get("num_subdomains", 0),
+        f.get("num_hyphens", 0),
+        f.get("num_digits_domain", 0),
+        float(bool(f.get("has_port", False))),
+        float(bool(f.get("query"))),
+        regex_score / 100.0,
+    ]
+    hashed = hash_features(char_ngrams(url.lower(), *CHAR_NGRAMS), hash_bits)
+    dense = [1.0 if t in tags else 0.0 for t in tag_names] + numeric
+    return hashed, dense
+
+
+def url_features_batch(urls, tag_names, hash_bits=HASH_BITS):
+    """
+    url_features for many URLs; the dense part comes from one vectorized url_signals_batch
+
+    Returns:
+        (list of hashed char n-gram id lists, float32 dense matrix (N, len(tag_names) + numeric))
+    """
+    urls = [u if isinstance(u, str) else "" for u in urls]
+    table, tags, _ = url_signals_batch(urls, strings=False)
+    tag_index = {t: j for j, t in enumerate(URL_TAGS)}
+    tag_bits = np.zeros((len(urls), len(tag_names)), dtype=np.float64)
+    for k, t in enumerate(tag_names):
+        if t in tag_index:
+            tag_bits[:, k] = tags[:, tag_index[t]]
+
+    col = {name: table[name].to_numpy(dtype=np.float64) for name in table.columns}
+    numeric = np.column_stack([
+        col["has_https"],
+        np.log1p(col["url_length"]),
+        np.log1p(col["domain_length"]),
+        np.log1p(col["path_length"]),
+        col["num_subdomains"],
+        col["num_hyphens"],
+        col["num_digits_domain"],
+        col["has_port"],
+        col["has_query"],
+        col["regex_score"] / 100.0,
+    ]) if len(urls) else np.zeros((0, len(NUMERIC_FEATURES)))
+    hashed = [hash_features(char_ngrams(u.lower(), *CHAR_NGRAMS), hash_bits) for u in urls]
+    return hashed, np.hstack([tag_bits, numeric]).astype(np.float32)
+
+
+# ========== MODEL ==========
+
+class UrlModel:
+    """Local URL classifier: P(malicious) per URL, scored in vectorized batches."""
+
+    def __init__(self, linear: LinearModel):
+        self.linear = linear
+        self.tag_names = linear.meta["tag_names"]
+
+    def predict_proba(self, url):
+        hashed, dense = url_features(url, self.tag_names, self.linear.hash_bits)
+        return self.linear.predict_proba_one(hashed, dense)
+
+    def predict_proba_batch(self, urls):
+        if len(urls) == 0:
+            return np.zeros(0)
+        hashed_rows, dense = url_features_batch(urls, self.tag_names, self.linear.hash_bits)
+        dense = self.linear.scale_dense(dense)
+        return self.linear.predict_proba_batch(build_batch(hashed_rows, dense, self.linear.hash_bits))
+
+
+def load_url_model(model_dir=DEFAULT_MODEL_DIR):
+    return ModelRegistry(model_dir).get(MODEL_NAME)
+
+
+# ========== TRAINING ==========
+
+
+def _featurize(urls, tag_names, hash_bits):
+    return url_features_batch(urls, tag_names, hash_bits)
+
+
+def _fit(hashed_rows, dense, y, hash_bits, epochs, l2):
+    dense_mean = dense.mean(axis=0)
+    dense_scale = dense.std(axis=0)
+    dense_scale[dense_scale == 0] = 1.0
+    batch = build_batch(hashed_rows, (dense - dense_mean) / dense_scale, hash_bits)
+    weights, bias = train_logistic_regression(batch, y, (1 << hash_bits) + dense.shape[1], epochs=epochs, l2=l2)
+    return weights, bias, dense_mean, dense_scale
+
+
+def train(input_csv=INPUT_CSV, model_dir=DEFAULT_MODEL_DIR, hash_bits=HASH_BITS, epochs=200, l2=1e-4, seed=0):
+    df = pd.read_csv(input_csv)
+    for col in (URL_COL, LABEL_COL):
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found. Available: {df.columns.tolist()}")
+
+    urls = df[URL_COL].fillna("").astype(str).tolist()
+    y = df[LABEL_COL].astype(float).to_numpy()
+    hashed_rows, dense = _featurize(urls, ALL_URL_TAGS, hash_bits)
+
+    # Held-out accuracy first, then refit on everything for the shipped model
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(urls))
+    n_test = int(len(urls) * TEST_FRACTION)
+    test_idx, train_idx = order[:n_test], order[n_test:]
+    w, b, mean, scale = _fit([hashed_rows[i] for i in train_idx], dense[train_idx], y[train_idx], hash_bits, epochs, l2)
+    held_out = LinearModel(w, b, mean, scale, {"hash_bits": hash_bits})
+    test_batch = build_batch([hashed_rows[i] for i in test_idx], held_out.scale_dense(dense[test_idx]), hash_bits)
+    test_probs = held_out.predict_proba_batch(test_batch)
+    accuracy = float(np.mean((test_probs >= 0.5) == (y[test_idx] >= 0.5))) if n_test else float("nan")
+
+    weights, bias, dense_mean, dense_scale = _fit(hashed_rows, dense, y, hash_bits, epochs, l2)
+    meta = {
+        "kind": "url_classifier",
+        "hash_bits": hash_bits,
+        "char_ngrams": list(CHAR_NGRAMS),
+        "tag_names": ALL_URL_TAGS,
+        "numeric_features": NUMERIC_FEATURES,
+        "rows": len(df),
+        "holdout_accuracy": round(accuracy, 4),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    version = save_model(MODEL_NAME, linear_model_arrays(weights, bias, dense_mean, dense_scale), meta, model_dir)
+
+    model = load_url_model(model_dir)
+    probs = model.predict_proba_batch(urls)
+    print(f"Rows: {len(df)}  held-out accuracy ({n_test} rows): {accuracy:.3f}")
+    print(f"Train log loss: {log_loss(y, probs):.4f}")
+
+    start = time.perf_counter()
+    model.predict_proba_batch(urls)
+    per_url = (time.perf_counter() - start) / max(len(urls), 1)
+    print(f"Batch inference: {per_url * 1e6:.1f} µs/URL ({1 / per_url:,.0f} URLs/s)")
+    print(f"[DONE] Saved URL model {MODEL_NAME} v{version} → {model_dir}")
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local URL classifier (char n-gram hashing + logistic regression)")
+    parser.add_argument("--input", default=INPUT_CSV)
+    parser.add_argument("--model-dir", default=DEFAULT_MODEL_DIR)
+    parser.add_argument("--hash-bits", type=int, default=HASH_BITS)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    train(args.input, args.model_dir, args.hash_bits, args.epochs, args.l2, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from metrics import record_cache
+
+# ========== VERDICT CACHE CONFIG ==========
+
+# LLM verdicts are kept in bounded in-process caches, so an equivalent input
+# (same canonical URL, same profile, ...) is answered without another Groq call.
+# VERDICT_CACHE=0 disables every cache. Size (entries) and TTL (seconds) apply
+# to each cache separately. Caches are per process, like the metrics.
+
+
+def _env_number(name, default, cast):
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        print(f"[CACHE] Ignoring invalid {name}={raw!r}")
+        return default
+
+
+VERDICT_CACHE_ENABLED = os.environ.get("VERDICT_CACHE", "1").lower() in ("1", "true", "yes", "on")
+VERDICT_CACHE_SIZE = _env_number("VERDICT_CACHE_SIZE", 50_000, int)
+VERDICT_CACHE_TTL = _env_number("VERDICT_CACHE_TTL", 24 * 3600.0, float)
+
+# ========== TTL LRU CACHE ==========
+
+
+class VerdictCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Every get() is counted in the fakenews_cache_lookups_total metric under
+    `name`, so /metrics reports the hit ratio of each cache.
+    """
+
+    def __init__(self, name, maxsize=None, ttl=None, enabled=None):
+        self.name = name
+        self.maxsize = VERDICT_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = VERDICT_CACHE_TTL if ttl is None else ttl
+        self.enabled = VERDICT_CACHE_ENABLED if enabled is None else enabled
+        self._data = OrderedDict()      # key -> (expires_at, value), least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, valid=None):
+        """
+        Cached value for key, or None (missing or expired).
+        valid: optional predicate on the value; a value it rejects (stale) counts as a miss.
+        """
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[0] <= now or (valid is not None and not valid(entry[1]))):
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+        record_cache(self.name, entry is not None)
+        return None if entry is None else entry[1]
+
+    def put(self, key, value, ttl=None):
+        """Store value for key (ttl overrides the cache TTL), evicting the least recently used entries"""
+        if not self.enabled or self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def put_many(self, items, ttl=None):
+        """
+        put() for many (key, value) pairs under one lock, e.g. when warming from a file.
+        Only the last maxsize pairs can survive, so earlier ones are not stored at all.
+
+        Returns:
+            int: pairs stored
+        """
+        if not self.enabled or self.maxsize <= 0:
+            return 0
+        items = list(items)[-self.maxsize:]
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            data = self._data
+            for key, value in items:
+                data[key] = (expires_at, value)
+                data.move_to_end(key)
+            while len(data) > self.maxsize:
+                data.popitem(last=False)
+        return len(items)
+
+    def clear(self):
+        """Drop every entry (hit/miss counts are kept: they cover the whole process lifetime)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._data)
+        lookups = hits + misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def text_key(text):
+    """Cache key for a free text (tweet): whitespace-normalized, hashed to 16 bytes"""
+    normalized = " ".join(text.split()) if isinstance(text, str) else str(text)
+    return hashlib.blake2b(normalized.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def request_source(request):
+    """
+    "model:hash" naming the model and prompt behind a verdict, from the
+    chat.completions request a scorer builds for a fixed probe item. Files of
+    verdicts record it, and warming only loads rows whose source matches the
+    live scorer's (a different model or an edited prompt gives another hash).
+    """
+    encoded = json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return f"{request['model']}:{hashlib.blake2b(encoded, digest_size=6).hexdigest()}"
+
+
+# ========== NAMED CACHES ==========
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name, **kwargs):
+    """The process-wide VerdictCache called name (created with kwargs on first use)"""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = VerdictCache(name, **kwargs)
+        return cache
+
+
+def cache_stats():
+    """Per-cache size and hit rate since process start"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {c.name: c.stats() for c in caches}
+
+
+def clear_caches():
+    """Drop the entries of every cache, e.g. after a rule reload changed the prompts"""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for c in caches:
+        c.clear()
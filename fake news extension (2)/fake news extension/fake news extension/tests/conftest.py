@@ -0,0 +1,15 @@
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ML_MODEL_DIR = os.path.join(BASE_DIR, "ml-model")
+
+# ml-model is not an importable package (hyphenated name): its modules import
+# each other by module name, as they do under app.py
+sys.path.insert(0, ML_MODEL_DIR)
+
+# Scorer modules build Groq clients at import. Give them a key, and a base URL
+# nothing listens on, so a test that reaches the LLM by mistake fails fast
+# instead of calling the real API.
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ["GROQ_BASE_URL"] = "http://127.0.0.1:9"
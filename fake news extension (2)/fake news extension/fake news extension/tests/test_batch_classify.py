@@ -0,0 +1,100 @@
+import sys
+import asyncio
+
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+
+sys.path.insert(0, BASE_DIR)
+
+# Raw CSV cells: 64-bit ids, counts with gaps, flags as text
+ID_ROWS = [{"tweet_id": str(1790000000000000000 + i * 7 + 3), "text": f"Breaking: miracle cure #{i}", "urls": "[]",
+            "username": f"user{i}", "followers_count": "" if i % 2 else "1200", "following_count": "35",
+            "verified": "False" if i % 3 else "True"} for i in range(6)]
+
+
+@pytest.fixture
+def stage(monkeypatch):
+    import batch_classify
+
+    stage = batch_classify.LLMStage(client=None, concurrency=4)
+    calls = []
+
+    def counted(kind, result):
+        async def call(item, *args, **kwargs):
+            calls.append((kind, item))
+            await asyncio.sleep(0.01)
+            return result
+        return call
+
+    monkeypatch.setattr(stage.wrappers, "classify_with_groq_percentage_async", counted("tweet", (70, "stub")))
+    monkeypatch.setattr(stage.profile_scorer, "classify_profile_async", counted("profile", {"fake_probability": 60}))
+    monkeypatch.setattr(stage.url_scorer, "classify_url_async", counted("url", {"malicious_probability": 80}))
+    stage.calls = calls
+    return stage
+
+
+def _plans(rows):
+    return [(("llm", text, 10.0, ""), ("llm", profile, None), [("llm", u, None) for u in urls])
+            for text, profile, urls in rows]
+
+
+def test_repeats_in_a_chunk_share_one_call(stage):
+    rows = [("Breaking: aliens  land", {"username": "@Desk"}, ["https://ex.com/a?utm_source=x", "https://ex.com/a"])] * 20
+    scores = asyncio.run(stage.resolve(_plans(rows)))
+
+    assert scores == [[70, 60, [80, 80]]] * 20
+    assert sorted(kind for kind, _ in stage.calls) == ["profile", "tweet", "url"]
+    assert stage.inflight == {}
+
+
+def test_distinct_items_are_asked_separately(stage):
+    rows = [(f"tweet {i}", {"username": f"user{i}"}, [f"https://ex.com/{i}"]) for i in range(3)]
+    rows.append(("no author", {}, []))
+    rows.append(("no author either", {}, []))
+    asyncio.run(stage.resolve(_plans(rows)))
+
+    counts = {kind: sum(k == kind for k, _ in stage.calls) for kind in ("tweet", "profile", "url")}
+    # Profiles without a username have no cache key, so they are never shared
+    assert counts == {"tweet": 5, "profile": 5, "url": 3}
+
+
+def test_a_failed_call_falls_back_for_every_sharer(stage, monkeypatch):
+    async def broken(*args, **kwargs):
+        stage.calls.append(("tweet", args[0]))
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(stage.wrappers, "classify_with_groq_percentage_async", broken)
+    scores = asyncio.run(stage.resolve(_plans([("same text", {}, [])] * 5)))
+    assert [tweet for tweet, _, _ in scores] == [10.0] * 5
+    assert [kind for kind, _ in stage.calls].count("tweet") == 1
+
+
+def test_profile_fields_are_typed_explicitly():
+    import batch_classify
+
+    chunk = pd.DataFrame(ID_ROWS[:2]).astype(str).replace("", float("nan"))
+    mapping = batch_classify.column_mapping(chunk.columns)
+    (_, first, _), (_, second, _) = batch_classify.chunk_inputs(chunk, mapping)
+    assert first == {"username": "user0", "followers_count": 1200, "following_count": 35, "verified": True}
+    # "False" is False, not bool("False"); an empty count is left out
+    assert second == {"username": "user1", "following_count": 35, "verified": False}
+
+
+def test_output_does_not_depend_on_chunksize(tmp_path):
+    import batch_classify
+
+    source = tmp_path / "in.csv"
+    pd.DataFrame(ID_ROWS).to_csv(source, index=False)
+    outputs = []
+    for chunksize in (1, 4, 0):
+        out = tmp_path / f"out_{chunksize}.csv"
+        batch_classify.run(str(source), str(out), chunksize=chunksize, workers=1, use_llm=False)
+        outputs.append(out.read_text(encoding="utf-8"))
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    # 64-bit ids and counts are written back as they were read
+    written = pd.read_csv(tmp_path / "out_0.csv", dtype=str, keep_default_na=False)
+    assert written["tweet_id"].tolist() == [r["tweet_id"] for r in ID_ROWS]
+    assert written["followers_count"].tolist() == [r["followers_count"] for r in ID_ROWS]
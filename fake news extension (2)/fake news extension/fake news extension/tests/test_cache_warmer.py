@@ -0,0 +1,168 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+import cache_warmer
+from conftest import BASE_DIR
+from verdict_cache import clear_caches
+
+sys.path.insert(0, BASE_DIR)
+
+PROFILE = {"username": "news_desk", "display_name": "News Desk", "bio": "Daily headlines", "url": "",
+           "followers": 1200, "following": 300, "tweets": 5400, "account_age_days": 800,
+           "has_profile_image": True, "has_banner": True, "verified": False}
+
+
+@pytest.fixture
+def scorers(monkeypatch):
+    # The live scorer modules: a rule reload in another test may have replaced them
+    import profile_classifier  # noqa: F401
+    import url_classifier  # noqa: F401
+
+    profiles, urls = sys.modules["profile_classifier"], sys.modules["url_classifier"]
+    calls = []
+    monkeypatch.setattr(profiles, "classify_with_groq", lambda *args: calls.append(args) or (5, "live verdict"))
+    monkeypatch.setattr(urls, "classify_with_groq", lambda *args: calls.append(args) or (5, "safe", "live verdict"))
+    clear_caches()
+    yield profiles, urls, calls
+    clear_caches()
+
+
+def _profile_csv(path, source, **overrides):
+    row = dict(PROFILE, llm_profile_fake_percent=80, llm_profile_reason="Warmed verdict.",
+               llm_profile_source=source, **overrides)
+    pd.DataFrame([row]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_profile_rows_from_the_live_prompt_are_hits(scorers, tmp_path):
+    profiles, _, calls = scorers
+    report = cache_warmer.warm_file(_profile_csv(tmp_path / "p.csv", profiles.VERDICT_SOURCE))
+    assert (report["kind"], report["rejected"], report["loaded"]) == ("profile", 0, 1)
+
+    result = profiles.classify_profile(dict(PROFILE), "key", cascade=False)
+    assert (result["fake_probability"], result["reason"]) == (80, "Warmed verdict.")
+    assert calls == []
+
+
+@pytest.mark.parametrize("source", ["llama3-8b-8192:0123456789ab", None])
+def test_profile_rows_from_another_prompt_are_rejected(scorers, tmp_path, source):
+    profiles, _, calls = scorers
+    report = cache_warmer.warm_file(_profile_csv(tmp_path / "p.csv", source))
+    assert (report["rejected"], report["loaded"]) == (1, 0)
+
+    assert profiles.classify_profile(dict(PROFILE), "key", cascade=False)["reason"] == "live verdict"
+    assert len(calls) == 1
+
+
+def test_profile_file_without_a_source_column_loads_nothing(scorers, tmp_path):
+    path = tmp_path / "p.csv"
+    pd.DataFrame([dict(PROFILE, llm_profile_fake_percent=80, llm_profile_reason="Old prompt.")]).to_csv(path, index=False)
+    report = cache_warmer.warm_file(str(path))
+    assert (report["kind"], report["rejected"], report["loaded"]) == ("profile", 1, 0)
+
+
+def test_unsourced_file_loads_only_when_accepted(scorers, tmp_path, monkeypatch):
+    profiles, _, calls = scorers
+    path = tmp_path / "p.csv"
+    pd.DataFrame([dict(PROFILE, llm_profile_fake_percent=80, llm_profile_reason="Old prompt.")]).to_csv(path, index=False)
+
+    monkeypatch.setattr(cache_warmer, "ACCEPT_UNSOURCED", True)
+    [report] = cache_warmer.warm_caches([str(path)])
+    assert (report["rejected"], report["unsourced"], report["loaded"]) == (0, 1, 1)
+    assert profiles.classify_profile(dict(PROFILE), "key", cascade=False)["reason"] == "Old prompt."
+    assert calls == []
+
+    # The explicit argument wins over the environment default
+    clear_caches()
+    report = cache_warmer.warm_file(str(path), accept_unsourced=False)
+    assert (report["rejected"], report["unsourced"], report["loaded"]) == (1, 0, 0)
+
+
+def test_url_verdicts_fill_only_the_exact_cache(scorers, tmp_path):
+    _, urls, calls = scorers
+    path = tmp_path / "u.csv"
+    pd.DataFrame({
+        "url": ["https://paypa1-secure.com/login?utm_source=x", "https://docs.google.com/forms/d/e/1FAI/viewform"],
+        "threat_type": ["safe", "safe"],   # a dataset label, not the verdict
+        "malicious_probability": [95, 90],
+        "llm_threat_type": ["phishing", "phishing"],
+        "reason": ["Look-alike login page.", "Credential form."],
+        "llm_url_source": [urls.VERDICT_SOURCE] * 2,
+    }).to_csv(path, index=False)
+
+    report = cache_warmer.warm_file(str(path))
+    assert (report["kind"], report["loaded"]) == ("url", 2)
+    assert len(urls.URL_VERDICT_CACHE) == 2
+    assert len(urls.DOMAIN_VERDICT_CACHE) == 0
+
+    result = urls.classify_url("https://paypa1-secure.com/login", "key", cascade=False)
+    assert (result["malicious_probability"], result["threat_type"]) == (95, "phishing")
+    # Other pages of the domain are scored live, not covered by the warmed verdict
+    assert urls.classify_url("https://paypa1-secure.com/other", "key", cascade=False)["reason"] == "live verdict"
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def warm_dir(monkeypatch, tmp_path):
+    import app
+
+    directory = tmp_path / "verdicts"
+    directory.mkdir()
+    monkeypatch.setattr(app, "WARM_CACHE_DIR", str(directory))
+    return app, directory
+
+
+@pytest.mark.parametrize("path", ["/etc/passwd", "../outside.csv", "sub/../../outside.csv"])
+def test_warm_cache_paths_outside_the_directory_are_refused(warm_dir, path):
+    app, _ = warm_dir
+    with pytest.raises(ValueError):
+        app.warm_files_from({"files": [path]})
+
+
+def test_warm_cache_paths_resolve_inside_the_directory(warm_dir, tmp_path):
+    app, directory = warm_dir
+    (tmp_path / "outside.csv").write_text("secret\n")
+    (directory / "link.csv").symlink_to(tmp_path / "outside.csv")
+    root = os.path.realpath(directory)
+    assert app.warm_files_from({"files": ["t.csv", str(directory / "u.csv")]}) == [
+        os.path.join(root, "t.csv"), os.path.join(root, "u.csv")]
+    with pytest.raises(ValueError):
+        app.warm_files_from({"files": ["link.csv"]})
+
+
+def test_warm_cache_is_off_without_a_directory(warm_dir, monkeypatch):
+    app, _ = warm_dir
+    monkeypatch.setattr(app, "WARM_CACHE_DIR", "")
+    with pytest.raises(ValueError):
+        app.warm_files_from({"files": ["t.csv"]})
+
+
+def test_failed_files_report_only_the_error_type(warm_dir):
+    app, directory = warm_dir
+    (directory / "bad.csv").write_text("root:x:0:0:root:/root:/bin/bash\n")
+    reports = app.client_warm_reports(cache_warmer.warm_caches([str(directory / "bad.csv")]))
+    assert reports == [{"file": str(directory / "bad.csv"), "error": "ValueError"}]
+
+
+@pytest.mark.parametrize("source, loaded", [("live", 1), ("llama3-8b-8192:0123456789ab", 0), (None, 0)])
+def test_tweet_rows_need_the_live_prompt(tmp_path, source, loaded):
+    import groq_llm_fake_news  # noqa: F401
+
+    from verdict_cache import get_cache, text_key
+
+    tweets = sys.modules["groq_llm_fake_news"]
+    row = {"text": "Miracle cure  found", "groq_fake_percent": 85.0, "groq_reason": "Unsupported claim."}
+    if source is not None:
+        row["groq_source"] = tweets.VERDICT_SOURCE if source == "live" else source
+    path = tmp_path / "t.csv"
+    pd.DataFrame([row]).to_csv(path, index=False)
+
+    clear_caches()
+    report = cache_warmer.warm_file(str(path))
+    assert (report["kind"], report["rejected"], report["loaded"]) == ("tweet", 1 - loaded, loaded)
+    expected = (85.0, "Unsupported claim.") if loaded else None
+    assert get_cache("tweet").get(text_key("Miracle cure found")) == expected
+    clear_caches()
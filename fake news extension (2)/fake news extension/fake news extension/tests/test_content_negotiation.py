@@ -0,0 +1,50 @@
+import sys
+
+import msgpack
+import pytest
+
+from conftest import BASE_DIR
+
+sys.path.insert(0, BASE_DIR)
+
+MSGPACK = "application/msgpack"
+
+
+@pytest.fixture(scope="module")
+def clients():
+    from fastapi.testclient import TestClient
+
+    import app
+    import asgi_app
+
+    return {"flask": app.app.test_client(), "asgi": TestClient(asgi_app.app)}
+
+
+def _get(clients, kind, path):
+    return clients[kind].get(path, headers={"Accept": MSGPACK})
+
+
+def _post_invalid_json(clients, kind, path):
+    body = {"data" if kind == "flask" else "content": b"{not json"}
+    return clients[kind].post(path, headers={"Accept": MSGPACK, "Content-Type": "application/json"}, **body)
+
+
+def _unpack(kind, response):
+    return msgpack.unpackb(response.data if kind == "flask" else response.content)
+
+
+@pytest.mark.parametrize("kind", ["flask", "asgi"])
+def test_health_negotiates(clients, kind):
+    response = _get(clients, kind, "/health")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith(MSGPACK)
+    assert _unpack(kind, response)["status"] == "healthy"
+
+
+@pytest.mark.parametrize("kind", ["flask", "asgi"])
+@pytest.mark.parametrize("path", ["/analyze", "/analyze-url", "/analyze-profile", "/analyze-complete", "/api/classify-all"])
+def test_errors_negotiate(clients, kind, path):
+    response = _post_invalid_json(clients, kind, path)
+    assert response.status_code == 500
+    assert response.headers["Content-Type"].startswith(MSGPACK)
+    assert "error" in _unpack(kind, response)
@@ -0,0 +1,115 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+
+pa = pytest.importorskip("pyarrow")
+
+import dataset_io  # noqa: E402
+
+FORMATS = ["parquet", "arrow"]
+
+
+def _text(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("name", ["tweets_extracted.csv", "fake_profile_dataset.csv", "fake_url_dataset.csv"])
+def test_csv_round_trip_is_unchanged(tmp_path, name, fmt):
+    source = os.path.join(BASE_DIR, name)
+    columnar, back = str(tmp_path / f"data.{fmt}"), str(tmp_path / "back.csv")
+    # Chunk sizes that don't line up, so chunk boundaries fall differently on each leg
+    dataset_io.convert(source, columnar, chunksize=7)
+    dataset_io.convert(columnar, back, chunksize=5)
+    assert _text(back) == _text(source)
+
+
+def test_columns_get_their_declared_types(tmp_path):
+    path = str(tmp_path / "tweets.parquet")
+    dataset_io.convert(os.path.join(BASE_DIR, "tweets_extracted.csv"), path)
+    schema = pa.parquet.read_schema(path)
+    assert schema.field("tweet_id").type == pa.int64()
+    assert schema.field("urls").type == pa.list_(pa.string())
+    assert schema.field("clickbait").type == pa.bool_()
+    assert schema.field("text").type == pa.string()
+
+
+@pytest.mark.parametrize("fmt", FORMATS + ["csv"])
+def test_header_only_input_keeps_its_columns(tmp_path, fmt):
+    source = tmp_path / "empty.csv"
+    source.write_text("tweet_id,text,urls,verified\n", encoding="utf-8")
+    columnar, back = str(tmp_path / f"empty_out.{fmt}"), str(tmp_path / "back.csv")
+
+    assert dataset_io.convert(str(source), columnar)["rows"] == 0
+    assert dataset_io.dataset_columns(columnar) == ["tweet_id", "text", "urls", "verified"]
+    # And back: a columnar file with no rows still gives a header
+    dataset_io.convert(columnar, back)
+    assert _text(back) == _text(source)
+
+    scored = str(tmp_path / f"scored.{fmt}")
+    report = dataset_io.stream_dataset(columnar, scored, lambda chunk, offset: {"score": [1.0] * len(chunk)})
+    assert report["rows"] == 0
+    assert dataset_io.dataset_columns(scored) == ["tweet_id", "text", "urls", "verified", "score"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_all_null_first_chunk(tmp_path, fmt):
+    source = tmp_path / "gaps.csv"
+    source.write_text("id,note,urls\n1,,\n2,,\n3,a note,['https://x.y']\n", encoding="utf-8")
+    columnar = str(tmp_path / f"gaps.{fmt}")
+    dataset_io.convert(str(source), columnar, chunksize=2)
+    df = dataset_io.read_dataset(columnar)
+    assert df["note"].isna().tolist() == [True, True, False]
+    assert df["urls"].map(list).tolist() == [[], [], ["https://x.y"]]
+
+    # A score column that is all None in the first chunk is typed from the schema, not "null"
+    scored = str(tmp_path / f"scored.{fmt}")
+    dataset_io.stream_dataset(columnar, scored, lambda chunk, offset: {"reason": [None if offset == 0 else "r"] * len(chunk)},
+                              chunksize=2)
+    assert dataset_io.read_dataset(scored)["reason"].tolist() == [None, None, "r"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_stream_dataset_projects_columnar_input(tmp_path, fmt):
+    source = os.path.join(BASE_DIR, "tweets_extracted.csv")
+    columnar, scored = str(tmp_path / f"tweets.{fmt}"), str(tmp_path / f"scored.{fmt}")
+    dataset_io.convert(source, columnar)
+    seen = []
+
+    def score_chunk(chunk, offset):
+        seen.append((list(chunk.columns), offset, len(chunk)))
+        return {"text_length": chunk["text"].str.len().tolist()}
+
+    report = dataset_io.stream_dataset(columnar, scored, score_chunk, chunksize=20, columns=["text", "not_there"])
+    assert [columns for columns, _, _ in seen] == [["text"]] * 3
+    assert [(offset, n) for _, offset, n in seen] == [(0, 20), (20, 20), (40, 10)]
+    assert report["rows"] == 50
+
+    original = dataset_io.read_dataset(columnar)
+    out = dataset_io.read_dataset(scored)
+    # Columns the scorer didn't read pass through untouched, the new one is appended
+    assert list(out.columns) == list(original.columns) + ["text_length"]
+    pd.testing.assert_frame_equal(out[original.columns], original)
+    assert out["text_length"].tolist() == original["text"].str.len().tolist()
+
+
+def test_failed_stage_leaves_no_output(tmp_path):
+    output = tmp_path / "out.parquet"
+
+    def fail(chunk, offset):
+        raise RuntimeError("scorer failed")
+
+    with pytest.raises(RuntimeError):
+        dataset_io.stream_dataset(os.path.join(BASE_DIR, "fake_url_dataset.csv"), str(output), fail)
+    assert os.listdir(tmp_path) == []
+
+
+def test_text_to_type_never_guesses():
+    values = pd.Series(["True", "false", "0", "maybe", None])
+    assert dataset_io.text_to_type(values, "bool").tolist() == [True, False, False, pd.NA, pd.NA]
+    numbers = pd.Series(["1790000000000000003", "12", "x", None])
+    assert dataset_io.text_to_type(numbers, "int64").tolist() == [1790000000000000003, 12, pd.NA, pd.NA]
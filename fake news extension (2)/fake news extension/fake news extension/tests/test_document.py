@@ -0,0 +1,23 @@
+from document import AnalyzedDocument
+
+
+def _counting(result):
+    calls = []
+
+    def compute(text):
+        calls.append(text)
+        return result
+
+    return compute, calls
+
+
+def test_regex_memo_is_kept_per_function():
+    doc = AnalyzedDocument("BREAKING: shocking news")
+    old, old_calls = _counting((1, 3.12, ["clickbait"]))
+    new, new_calls = _counting((2, 6.25, ["clickbait", "urgent_share"]))
+    # Two scorer versions alternating on one document (e.g. across a rule reload)
+    for _ in range(3):
+        assert doc.regex(old) == (1, 3.12, ["clickbait"])
+        assert doc.regex(new) == (2, 6.25, ["clickbait", "urgent_share"])
+    assert len(old_calls) == 1
+    assert len(new_calls) == 1
@@ -0,0 +1,63 @@
+import sys
+
+import pytest
+
+from verdict_cache import clear_caches
+
+PROFILE = {"username": "@News_Desk", "display_name": "News Desk", "bio": "Daily headlines",
+           "followers_count": 1200, "following_count": 300, "tweet_count": 5400, "account_age_days": 800}
+
+
+@pytest.fixture
+def profile_classifier(monkeypatch):
+    import profile_classifier  # noqa: F401
+
+    module = sys.modules["profile_classifier"]
+    calls = []
+
+    def fake_groq(profile, regex_score, tags, behavioral_flags, api_key):
+        calls.append(profile["username"])
+        return 40, "stub verdict"
+
+    monkeypatch.setattr(module, "classify_with_groq", fake_groq)
+    module.llm_calls = calls
+    clear_caches()
+    yield module
+    clear_caches()
+
+
+@pytest.mark.parametrize("field", ["followers_count", "following_count", "tweet_count", "account_age_days"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_counts_fingerprint(profile_classifier, field, value):
+    username, fingerprint = profile_classifier.profile_cache_key(dict(PROFILE, **{field: value}))
+    assert username == "news_desk"
+    assert fingerprint != profile_classifier.profile_cache_key(PROFILE)[1]
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_classify_profile_accepts_non_finite_counts(profile_classifier, value):
+    profile = {"username": "a", "followers_count": value}
+    first = profile_classifier.classify_profile(profile, "key", cascade=False)
+    again = profile_classifier.classify_profile(profile, "key", cascade=False)
+    assert first == again
+    assert first["reason"] == "stub verdict"
+    assert profile_classifier.llm_calls == ["a"]
+
+
+def test_fingerprint_failure_scores_uncached(profile_classifier, monkeypatch):
+    def broken(profile, cascade=None):
+        raise ValueError("cannot fingerprint")
+
+    monkeypatch.setattr(profile_classifier, "profile_cache_key", broken)
+    for _ in range(2):
+        assert profile_classifier.classify_profile(PROFILE, "key", cascade=False)["reason"] == "stub verdict"
+    assert len(profile_classifier.llm_calls) == 2
+    assert len(profile_classifier.PROFILE_VERDICT_CACHE) == 0
+
+
+def test_changed_bucket_recomputes(profile_classifier):
+    profile_classifier.classify_profile(PROFILE, "key", cascade=False)
+    profile_classifier.classify_profile(dict(PROFILE, followers_count=1250), "key", cascade=False)
+    assert len(profile_classifier.llm_calls) == 1
+    profile_classifier.classify_profile(dict(PROFILE, followers_count=90_000), "key", cascade=False)
+    assert len(profile_classifier.llm_calls) == 2
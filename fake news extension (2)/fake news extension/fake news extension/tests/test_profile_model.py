@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+import profile_model
+
+# Cells the dataset doesn't have: missing fields, text counts, flags as text or ints
+EDGE_CASES = [
+    {},
+    {"username": None, "followers": "1,200", "verified": "yes", "has_banner": float("nan")},
+    {"username": "x", "followers": "12", "following": 0, "tweets": "x", "account_age_days": 3, "has_profile_image": 0},
+    {"followers_count": 5, "followers": 900, "has_profile_image": "False", "verified": True},
+]
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return pd.read_csv(os.path.join(BASE_DIR, "fake_profile_dataset.csv")).to_dict("records") + EDGE_CASES
+
+
+def test_single_profile_features_match_the_batch_matrix(profiles):
+    matrix = profile_model.profile_feature_matrix(profiles)
+    rows = np.array([profile_model.profile_features(p) for p in profiles])
+    assert np.array_equal(rows, matrix)
+
+
+def test_single_profile_score_matches_the_batch(profiles, tmp_path, capsys):
+    model = profile_model.train(model_dir=str(tmp_path), epochs=5)
+    capsys.readouterr()
+    single = [model.predict_proba(p) for p in profiles]
+    assert single == pytest.approx(model.predict_proba_batch(profiles).tolist(), rel=1e-5)
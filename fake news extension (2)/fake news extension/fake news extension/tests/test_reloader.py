@@ -0,0 +1,125 @@
+import os
+import sys
+import shutil
+
+import pytest
+
+import reloader
+import url_batch
+import url_model
+import text_model
+import profile_model
+
+NEW_RULE = '    "reload_test_rule": r"zzqx-reload-marker",\n'
+
+
+@pytest.fixture
+def scorers():
+    """A ScorerState; the real sources are published again afterwards"""
+    state = reloader.ScorerState()
+    yield state
+    reloader.ML_MODEL_DIR = os.path.dirname(reloader.__file__)
+    ok, message = state.reload()
+    assert ok, message
+
+
+def test_watcher_stops_and_joins(tmp_path):
+    watcher = reloader.ReloadWatcher(str(tmp_path / "manifest.json"), on_change=lambda: None, interval=0.01)
+    watcher.start()
+    watcher.stop()
+    watcher.join(timeout=5)
+    assert not watcher.is_alive()
+
+
+def test_load_leaves_sys_modules_alone():
+    before = {name: sys.modules.get(name) for name in reloader.SCORER_MODULES}
+    fresh = reloader.load_scorer_set()
+    assert {name: sys.modules.get(name) for name in reloader.SCORER_MODULES} == before
+    # The fresh modules import each other, not the live ones
+    assert fresh["url_classifier"] is not before["url_classifier"]
+    assert fresh["llm_wrappers"].url_classify is fresh["url_classifier"].classify_url
+
+
+def test_reload_rebinds_rule_consumers(scorers):
+    ok, message = scorers.reload()
+    assert ok, message
+    urls = scorers.module("url_classifier")
+    regex = scorers.module("groq_llm_with_regex_percentage")
+    profiles = scorers.module("profile_classifier")
+    assert sys.modules["url_classifier"] is urls
+    assert url_batch.check_regex_patterns is urls.check_regex_patterns
+    assert url_batch.URL_REGEX_COMPILED is urls.URL_REGEX_COMPILED
+    assert url_model.URL_TAGS is urls.URL_TAGS
+    assert text_model.compute_regex_percent is regex.compute_regex_percent
+    assert profile_model.check_regex_patterns is profiles.check_regex_patterns
+    # Constants that only share a value with a scorer global are left alone
+    assert url_model.MODEL_NAME == "url_classifier"
+
+
+def test_new_rule_reaches_batch_scorers(scorers, tmp_path):
+    for name in reloader.SCORER_MODULES:
+        shutil.copy(os.path.join(reloader.ML_MODEL_DIR, f"{name}.py"), tmp_path)
+    path = tmp_path / "url_classifier.py"
+    source = path.read_text(encoding="utf-8")
+    path.write_text(source.replace("URL_PLATFORM_REGEX = {\n", "URL_PLATFORM_REGEX = {\n" + NEW_RULE, 1),
+                    encoding="utf-8")
+
+    reloader.ML_MODEL_DIR = str(tmp_path)
+    ok, message = scorers.reload()
+    assert ok, message
+
+    url = "https://example.com/zzqx-reload-marker"
+    assert "reload_test_rule" in sys.modules["url_classifier"].check_regex_patterns(url)[1]
+    assert "reload_test_rule" in url_model.ALL_URL_TAGS
+    assert len(url_batch._TAG_BLOB_RE) == len(url_batch.URL_TAGS)
+    _, tags, _ = url_batch.url_signals_batch([url, "https://example.com/"])
+    column = url_batch.URL_TAGS.index("reload_test_rule")
+    assert tags[:, column].tolist() == [True, False]
+
+
+def test_trained_profile_model_survives_a_rule_change(scorers, tmp_path, capsys):
+    model = profile_model.train(model_dir=str(tmp_path / "models"), epochs=5)
+    capsys.readouterr()
+    profile = {"username": "crypto_giveaway_2024", "followers": 10, "following": 900, "verified": False}
+    assert 0.0 <= model.predict_proba(profile) <= 1.0
+
+    rules = tmp_path / "rules"
+    rules.mkdir()
+    for name in reloader.SCORER_MODULES:
+        shutil.copy(os.path.join(reloader.ML_MODEL_DIR, f"{name}.py"), rules)
+    path = rules / "profile_classifier.py"
+    source = path.read_text(encoding="utf-8")
+    path.write_text(source.replace("USERNAME_REGEX = {\n", "USERNAME_REGEX = {\n" + NEW_RULE, 1), encoding="utf-8")
+
+    reloader.ML_MODEL_DIR = str(rules)
+    ok, message = scorers.reload()
+    assert ok, message
+    assert "reload_test_rule" in profile_model.REGEX_TAGS
+
+    # The model keeps the tag layout it was trained on, so both paths still score
+    assert "reload_test_rule" not in model.regex_tags
+    for username in ("crypto_giveaway_2024", "zzqx-reload-marker"):
+        p = dict(profile, username=username)
+        assert 0.0 <= model.predict_proba(p) <= 1.0
+        assert model.predict_proba_batch([p])[0] == pytest.approx(model.predict_proba(p), rel=1e-5)
+
+
+def test_failed_check_keeps_the_previous_rules(scorers, tmp_path):
+    previous = sys.modules["profile_classifier"]
+    for name in reloader.SCORER_MODULES:
+        shutil.copy(os.path.join(reloader.ML_MODEL_DIR, f"{name}.py"), tmp_path)
+    path = tmp_path / "profile_classifier.py"
+    source = path.read_text(encoding="utf-8")
+    path.write_text(source.replace("USERNAME_REGEX = {\n", "USERNAME_REGEX = {\n" + NEW_RULE, 1), encoding="utf-8")
+
+    def probe():
+        # Runs against the published new rules, like the model probe in app.reload_all
+        assert "reload_test_rule" in profile_model.REGEX_TAGS
+        raise ValueError("model does not score under the new rules")
+
+    reloader.ML_MODEL_DIR = str(tmp_path)
+    ok, message = scorers.reload(check=probe)
+    assert not ok and "does not score" in message
+    assert sys.modules["profile_classifier"] is previous
+    assert profile_model.check_regex_patterns is previous.check_regex_patterns
+    assert "reload_test_rule" not in profile_model.REGEX_TAGS
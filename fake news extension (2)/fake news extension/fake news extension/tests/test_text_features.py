@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+from text_features import (
+    EDGE_CASES, check_equivalence, extract_text_features, matrix_row_features, rule_score, rule_scores,
+    text_feature_matrix,
+)
+
+
+@pytest.fixture(scope="module")
+def dataset_texts():
+    return pd.read_csv(os.path.join(BASE_DIR, "tweets_extracted.csv"))["text"].fillna("").astype(str).tolist()
+
+
+def test_dataset_matches_the_reference_extractor(dataset_texts):
+    assert check_equivalence(dataset_texts) == []
+
+
+@pytest.mark.parametrize("text", EDGE_CASES, ids=range(len(EDGE_CASES)))
+def test_edge_case_matches_the_reference_extractor(text):
+    assert check_equivalence([text]) == []
+
+
+def test_matrix_rows_and_vectorized_scores_follow_input_order(dataset_texts):
+    texts = EDGE_CASES + dataset_texts[:20]
+    matrix = text_feature_matrix(texts)
+    assert matrix.shape[0] == len(texts)
+    assert [matrix_row_features(row) for row in matrix] == [extract_text_features(t) for t in texts]
+    assert rule_scores(matrix).tolist() == [rule_score(extract_text_features(t)) for t in texts]
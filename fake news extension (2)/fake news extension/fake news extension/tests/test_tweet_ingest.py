@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+from tweet_ingest import EDGE_CASES, LIST_COLUMNS, ListColumn, check_equivalence, max_per_row, parse_list_column
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return pd.read_csv(os.path.join(BASE_DIR, "tweets_extracted.csv"), dtype=str, keep_default_na=False, na_values=[""])
+
+
+@pytest.mark.parametrize("column", LIST_COLUMNS)
+def test_dataset_list_column_matches_literal_eval(dataset, column):
+    assert check_equivalence(dataset[column].tolist()) == []
+
+
+@pytest.mark.parametrize("cell", EDGE_CASES, ids=range(len(EDGE_CASES)))
+def test_edge_case_matches_literal_eval(cell):
+    assert check_equivalence([cell]) == []
+
+
+def test_mixed_plain_and_fallback_cells_keep_their_rows(dataset):
+    # Fallback cells are spliced in between plain ones
+    assert check_equivalence(dataset["urls"].tolist() + EDGE_CASES + dataset["hashtags"].tolist()) == []
+
+
+def test_max_per_row_leaves_empty_rows_empty():
+    column = ListColumn.from_lists([[], ["a", "b"], [], ["c"], []])
+    assert np.array_equal(max_per_row(column, [1, 3, 2]), [np.nan, 3, np.nan, 2, np.nan], equal_nan=True)
+    assert max_per_row(column, [1, 3, 2], empty=0).tolist() == [0, 3, 0, 2, 0]
+    assert np.isnan(max_per_row(parse_list_column(["[]", None]), [])).all()
+
+
+def test_from_arrow_turns_null_rows_into_empty_lists():
+    pa = pytest.importorskip("pyarrow")
+
+    array = pa.array([["a", "b"], None, [], ["c"]], type=pa.list_(pa.string()))
+    assert ListColumn.from_arrow(array).to_lists() == [["a", "b"], [], [], ["c"]]
+    chunked = pa.chunked_array([array[:2], array[2:]])
+    assert ListColumn.from_arrow(chunked).to_lists() == [["a", "b"], [], [], ["c"]]
+    # A null row whose offsets still span values: those values are not part of any row
+    masked = pa.ListArray.from_arrays(pa.array([0, 1, 2, 3], type=pa.int32()), pa.array(["x", "hidden", "y"]),
+                                      mask=pa.array([False, True, False]))
+    column = ListColumn.from_arrow(masked)
+    assert column.to_lists() == [["x"], [], ["y"]]
+    assert column.row_ids().tolist() == [0, 2]
+
+
+def test_arrow_round_trip(dataset):
+    pytest.importorskip("pyarrow")
+
+    column = parse_list_column(dataset["urls"])
+    back = ListColumn.from_arrow(column.to_arrow())
+    assert back.to_lists() == column.to_lists()
+    assert np.array_equal(back.offsets, column.offsets)
@@ -0,0 +1,37 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+from url_batch import EDGE_CASES, check_equivalence, url_signals_batch
+
+
+@pytest.fixture(scope="module")
+def dataset_urls():
+    return pd.read_csv(os.path.join(BASE_DIR, "fake_url_dataset.csv"))["url"].tolist()
+
+
+def test_dataset_matches_the_scalar_functions(dataset_urls):
+    assert check_equivalence(dataset_urls) == []
+
+
+@pytest.mark.parametrize("url", EDGE_CASES, ids=range(len(EDGE_CASES)))
+def test_edge_case_matches_the_scalar_functions(url):
+    assert check_equivalence([url]) == []
+
+
+def test_chunking_does_not_change_the_signals(dataset_urls):
+    # Fast and scalar-fallback rows mixed, across several chunk boundaries
+    urls = dataset_urls[:200] + EDGE_CASES
+    table, tags, red_flags = url_signals_batch(urls)
+    chunked_table, chunked_tags, chunked_red_flags = url_signals_batch(urls, chunk_size=7)
+    pd.testing.assert_frame_equal(chunked_table, table)
+    assert np.array_equal(chunked_tags, tags)
+    assert np.array_equal(chunked_red_flags, red_flags)
+
+
+def test_empty_input_gives_empty_signals():
+    table, tags, red_flags = url_signals_batch([])
+    assert len(table) == 0 and tags.shape[0] == 0 and red_flags.shape[0] == 0
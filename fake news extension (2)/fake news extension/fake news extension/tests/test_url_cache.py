@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from conftest import BASE_DIR
+import url_canonical
+from url_canonical import EDGE_CASES, canonicalize_url, check_canonicalization, registered_domain, url_cache_keys
+from verdict_cache import clear_caches
+
+PHISHING = (95, "phishing", "credential form")
+
+# publicsuffixlist is optional: without it url_canonical has no domain level
+needs_public_suffixes = pytest.mark.skipif(url_canonical.PUBLIC_SUFFIXES is None,
+                                           reason="publicsuffixlist is not installed")
+
+
+@pytest.fixture
+def url_classifier():
+    # The live scorer module: a rule reload in another test may have replaced it
+    import url_classifier  # noqa: F401
+
+    clear_caches()
+    yield sys.modules["url_classifier"]
+    clear_caches()
+
+
+def _store(module, url, verdict=PHISHING):
+    module.store_verdict(url, module.check_regex_patterns(url)[1], verdict)
+
+
+def _cached(module, url):
+    return module.cached_verdict(url, module.check_regex_patterns(url)[1])
+
+
+@pytest.mark.parametrize("url, canonical", EDGE_CASES)
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+def test_canonical_urls_are_fixed_points():
+    urls = pd.read_csv(os.path.join(BASE_DIR, "fake_url_dataset.csv"))["url"].astype(str).tolist()
+    assert check_canonicalization(urls) == []
+
+
+@needs_public_suffixes
+def test_tracking_variants_share_cache_keys():
+    keys = {url_cache_keys(u) for u in ("https://News.Example.co.uk/story?utm_source=x&page=2#top",
+                                         "https://news.example.co.uk:443/story?page=2&fbclid=abc")}
+    assert keys == {("https://news.example.co.uk/story?page=2", "example.co.uk")}
+
+
+@needs_public_suffixes
+@pytest.mark.parametrize("host, domain", [
+    ("login.secure.example.co.uk", "example.co.uk"),
+    ("docs.google.com", "google.com"),
+    ("evil-login.github.io", "evil-login.github.io"),
+    ("a.b.pytorch.github.io", "pytorch.github.io"),
+    ("shop.herokuapp.com", "shop.herokuapp.com"),
+    ("site.netlify.app", "site.netlify.app"),
+    ("github.io", None),
+    ("co.uk", None),
+    ("192.168.1.1", "192.168.1.1"),
+    ("", None),
+])
+def test_registered_domain_uses_the_public_suffix_list(host, domain):
+    assert registered_domain(host) == domain
+
+
+def test_path_level_phishing_does_not_poison_shared_hosts(url_classifier):
+    for url in ("https://docs.google.com/forms/d/e/1FAIpQLSf/viewform",
+                "https://evil-login.github.io/paypal/",
+                "https://sites.google.com/view/paypal-verify"):
+        _store(url_classifier, url)
+        assert _cached(url_classifier, url) == PHISHING
+
+    for url in ("https://www.google.com/search?q=news", "https://mail.google.com/",
+                "https://pytorch.github.io/", "https://evil-login.github.io/about"):
+        assert _cached(url_classifier, url) is None
+    assert len(url_classifier.DOMAIN_VERDICT_CACHE) == 0
+
+
+def test_path_level_phishing_stays_per_url(url_classifier):
+    _store(url_classifier, "https://example.com/paypa1-login/verify")
+    assert _cached(url_classifier, "https://example.com/") is None
+
+
+@needs_public_suffixes
+@pytest.mark.parametrize("url, sibling", [
+    ("https://paypa1-secure.com/login", "https://www.paypa1-secure.com/other"),
+    ("https://account-check.xyz", "https://mail.account-check.xyz/inbox"),
+    ("https://xn--pypal-4ve.com/signin", "https://xn--pypal-4ve.com/"),
+])
+def test_domain_level_threats_cover_the_domain(url_classifier, url, sibling):
+    _store(url_classifier, url)
+    assert _cached(url_classifier, sibling) == PHISHING
+
+
+def test_domain_entries_need_a_confident_threat(url_classifier):
+    _store(url_classifier, "https://paypa1-secure.com/login", (55, "phishing", "unsure"))
+    _store(url_classifier, "https://g00gle-support.com/", (90, "safe", "parked"))
+    assert len(url_classifier.DOMAIN_VERDICT_CACHE) == 0
+
+
+def test_shared_hosts_never_get_domain_entries(url_classifier):
+    # A typosquat in a user's path on a shared host is still not the host's doing
+    _store(url_classifier, "https://x.com/paypa1_support")
+    _store(url_classifier, "https://bit.ly/g00gle-login")
+    assert len(url_classifier.DOMAIN_VERDICT_CACHE) == 0
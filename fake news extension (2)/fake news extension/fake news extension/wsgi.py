@@ -0,0 +1,20 @@
+"""
+Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app (see gunicorn.conf.py) this module is imported once in the
+gunicorn master. Models, rule packs and the scorer modules are loaded here,
+before the workers fork, so every worker shares those pages copy-on-write
+instead of loading its own copy.
+"""
+import gc
+
+from app import app, detector, SCORERS  # noqa: F401  (import builds the detector and scorer set)
+
+# Open every registered model now rather than on each worker's first request
+detector.load_models()
+
+# Move everything loaded so far out of the GC's tracked generations: collections
+# in the workers then don't touch (and un-share) these objects' pages
+gc.freeze()
+
+application = app